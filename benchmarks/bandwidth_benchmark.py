@@ -0,0 +1,83 @@
+"""
+measures the bytes on the wire saved by conditional GETs and gzipped request bodies, against the local mock server
+
+    $ python benchmarks/bandwidth_benchmark.py [--polls 100] [--addresses 5000]
+
+the response bytes are the bodies the client received, the request bytes the bodies the server received
+"""
+from __future__ import print_function
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import blocktrail
+from blocktrail.cache import LRUCache
+from blocktrail.metrics import Metrics
+from benchmarks import fixtures
+from tests.mock_server import MockServer, conditional, paginated
+
+
+def etag(data):
+    return '"%s"' % hashlib.md5(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def poll(url, polls, **kwargs):
+    """
+    poll the price, an address and the events of a webhook, which don't change
+    """
+    metrics = Metrics()
+    with blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=url, hooks=[metrics], **kwargs) as client:
+        for i in range(polls):
+            client.price()
+            client.address(fixtures.fake_address(0))
+            client.webhook_events("my-webhook", limit=200)
+
+    return sum(metrics.snapshot()['bytes_received_total'].values())
+
+
+def subscribe(server, addresses, **kwargs):
+    del server.requests[:]
+
+    batch_data = [{'address': fixtures.fake_address(i), 'confirmations': 6} for i in range(addresses)]
+    with blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=server.url, **kwargs) as client:
+        client.batch_subscribe_address_transactions("my-webhook", batch_data)
+
+    return sum(len(request.body) for request in server.requests)
+
+
+def report(name, before, after):
+    print("%-36s %12d bytes %12d bytes %8.1f%%" % (name, before, after, 100.0 * (before - after) / before))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--polls', type=int, default=100)
+    parser.add_argument('--addresses', type=int, default=5000)
+    args = parser.parse_args()
+
+    events = [{'event_type': 'address-transactions', 'address': fixtures.fake_address(i), 'transaction': None, 'confirmations': 6}
+              for i in range(200)]
+    events_page = paginated(events)
+
+    server = MockServer().start()
+    server.route('GET', '/price', conditional({'USD': 250.0, 'EUR': 230.0}, etag))
+    server.route('GET', '/address/%s' % fixtures.fake_address(0), conditional(fixtures.address(0), etag))
+    server.route('GET', '/webhook/my-webhook/events', conditional(lambda request: events_page(request)[1], etag))
+    server.route('POST', '/webhook/my-webhook/events/batch', {'result': True})
+
+    try:
+        print("%-36s %18s %18s %9s" % ("", "plain", "optimized", "saved"))
+        report("%d polls, conditional GETs" % args.polls, poll(server.url, args.polls), poll(server.url, args.polls, validators=LRUCache()))
+        report("subscribe %d addresses, gzip" % args.addresses, subscribe(server, args.addresses),
+               subscribe(server, args.addresses, compress_min_size=1024))
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+measures the bulk BTC / Satoshi conversions against calling the scalar functions in a loop
+
+    $ python benchmarks/coin_benchmark.py [--values 1000000]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import blocktrail
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def report(name, n, scalar, bulk):
+    print("%-28s %12.0f values/s %12.0f values/s %8.2fx" % (name, n / scalar, n / bulk, scalar / bulk))
+
+
+def timed(fn):
+    return min(timeit.repeat(fn, number=1, repeat=3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--values', type=int, default=1000000)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    satoshis = [rnd.randint(0, 21 * 10 ** 14) for i in range(args.values)]
+    btcs = [satoshi / 1e8 for satoshi in satoshis]
+
+    print("%-28s %21s %21s" % ("", "scalar", "bulk"))
+
+    scalar = timed(lambda: [blocktrail.to_satoshi(btc) for btc in btcs])
+    report("to_satoshi, list", args.values, scalar, timed(lambda: blocktrail.to_satoshi_many(btcs)))
+
+    if numpy is not None:
+        array = numpy.array(btcs)
+        report("to_satoshi, numpy", args.values, scalar, timed(lambda: blocktrail.to_satoshi_many(array)))
+
+    scalar = timed(lambda: [blocktrail.to_btc(satoshi) for satoshi in satoshis])
+    report("to_btc, list", args.values, scalar, timed(lambda: blocktrail.to_btc_many(satoshis)))
+
+    if numpy is not None:
+        array = numpy.array(satoshis, dtype=numpy.int64)
+        report("to_btc, numpy", args.values, scalar, timed(lambda: blocktrail.to_btc_many(array)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+measures turning a stream of transactions into columns and aggregating them,
+ compared to aggregating over the dicts with python loops
+
+    $ python benchmarks/columnar_benchmark.py [--pages 50]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blocktrail import columnar
+from benchmarks import fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=50)
+    args = parser.parse_args()
+
+    pages = [fixtures.block_transactions_page(current_page=page)['data'] for page in range(1, args.pages + 1)]
+    records = [tx for page in pages for tx in page]
+
+    print("%d transactions, numpy %s" % (len(records), "installed" if columnar.numpy is not None else "not installed"))
+
+    arrays = columnar.to_arrays(records)
+
+    def with_dicts():
+        fees = [tx['total_fee'] for tx in records if tx['confirmations'] >= 6]
+        return sum(fees), max(tx['estimated_value'] for tx in records)
+
+    def with_arrays():
+        if columnar.numpy is None:
+            return (sum(fee for fee, confirmations in zip(arrays['fee'], arrays['confirmations']) if confirmations >= 6),
+                    max(arrays['value']))
+
+        return int(arrays['fee'][arrays['confirmations'] >= 6].sum()), int(arrays['value'].max())
+
+    assert with_dicts() == with_arrays()
+
+    build = min(timeit.repeat(lambda: columnar.to_arrays(records), number=1, repeat=3))
+    dicts = min(timeit.repeat(with_dicts, number=10, repeat=3)) / 10
+    columns = min(timeit.repeat(with_arrays, number=10, repeat=3)) / 10
+
+    print("%-24s %10.0f rows/s" % ("build columns", len(records) / build))
+    print("%-24s %10.2f ms" % ("aggregate over dicts", dicts * 1000))
+    print("%-24s %10.2f ms %8.1fx" % ("aggregate over columns", columns * 1000, dicts / columns))
+    print("%-24s %10d bytes/row" % ("column memory", sum(len(values) * 8 for values in arrays.values()) // len(records)))
+
+
+if __name__ == "__main__":
+    main()
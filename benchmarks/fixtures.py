@@ -0,0 +1,142 @@
+"""
+realistic API responses for the benchmarks, shaped like the real ones and with the same sizes
+"""
+import hashlib
+import random
+
+
+def fake_hash(*parts):
+    return hashlib.sha256(":".join(str(part) for part in parts).encode("ascii")).hexdigest()
+
+
+def fake_address(*parts):
+    return "1" + fake_hash("address", *parts)[:33]
+
+
+def transaction(seed, block_height=300000, confirmations=100, n_inputs=2, n_outputs=2):
+    rnd = random.Random(fake_hash(seed))
+
+    inputs = [{
+        'index': i,
+        'output_hash': fake_hash("prev", seed, i),
+        'output_index': rnd.randint(0, 3),
+        'value': rnd.randint(1000, 10 ** 9),
+        'address': fake_address(seed, "in", i),
+        'type': "pubkeyhash",
+        'multisig': None,
+        'script_signature': fake_hash("sig", seed, i) * 4,
+    } for i in range(n_inputs)]
+
+    outputs = [{
+        'index': i,
+        'value': rnd.randint(1000, 10 ** 9),
+        'address': fake_address(seed, "out", i),
+        'type': "pubkeyhash",
+        'multisig': None,
+        'script': "OP_DUP OP_HASH160 %s OP_EQUALVERIFY OP_CHECKSIG" % fake_hash("script", seed, i)[:40],
+        'script_hex': "76a914%s88ac" % fake_hash("script", seed, i)[:40],
+        'spent_hash': fake_hash("spent", seed, i) if rnd.random() < 0.5 else None,
+        'spent_index': 0,
+    } for i in range(n_outputs)]
+
+    total_in = sum(txin['value'] for txin in inputs)
+    total_out = min(total_in, sum(txout['value'] for txout in outputs))
+
+    return {
+        'hash': fake_hash("tx", seed),
+        'time': "2014-05-14T19:34:12+0000",
+        'confirmations': confirmations,
+        'block_height': block_height,
+        'block_hash': fake_hash("block", block_height),
+        'is_coinbase': False,
+        'estimated_value': total_out,
+        'total_input_value': total_in,
+        'total_output_value': total_out,
+        'total_fee': total_in - total_out,
+        'estimated_change': None,
+        'estimated_change_address': None,
+        'inputs': inputs,
+        'outputs': outputs,
+    }
+
+
+def block(height, confirmations=100):
+    return {
+        'hash': fake_hash("block", height),
+        'height': height,
+        'block_time': "2014-05-14T19:34:12+0000",
+        'difficulty': 8853416309.1278,
+        'merkleroot': fake_hash("merkle", height),
+        'is_orphan': False,
+        'prev_block': fake_hash("block", height - 1),
+        'next_block': fake_hash("block", height + 1),
+        'byte_size': 424612,
+        'confirmations': confirmations,
+        'transactions': 750,
+        'value': 350000000000,
+        'miningpool_name': None,
+        'miningpool_url': None,
+        'miningpool_slug': None,
+    }
+
+
+def page(records, current_page=1, per_page=None, total=None):
+    return {
+        'data': records,
+        'current_page': current_page,
+        'per_page': per_page if per_page is not None else len(records),
+        'total': total if total is not None else len(records),
+    }
+
+
+def block_transactions_page(height=300000, current_page=1, limit=200):
+    offset = (current_page - 1) * limit
+    return page([transaction((height, offset + i), block_height=height) for i in range(limit)],
+                current_page=current_page, per_page=limit, total=limit * 4)
+
+
+def address(address):
+    return {
+        'address': address,
+        'hash160': fake_hash("hash160", address)[:40],
+        'balance': 1234567890,
+        'received': 98765432100,
+        'sent': 97530864210,
+        'transactions': 5621,
+        'utxos': 37,
+        'unconfirmed_received': 0,
+        'unconfirmed_sent': 0,
+        'unconfirmed_transactions': 0,
+        'unconfirmed_utxos': 0,
+        'total_transactions_in': 2881,
+        'total_transactions_out': 2740,
+        'category': None,
+        'tag': None,
+        'first_seen': "2012-04-24T07:47:49+0000",
+        'last_seen': "2014-05-14T19:34:12+0000",
+    }
+
+
+def unspent_output(seed):
+    rnd = random.Random(fake_hash("utxo", seed))
+
+    return {
+        'hash': fake_hash("tx", seed),
+        'index': rnd.randint(0, 3),
+        'value': rnd.randint(1000, 10 ** 9),
+        'address': fake_address(seed),
+        'type': "pubkeyhash",
+        'multisig': None,
+        'script': "OP_DUP OP_HASH160 %s OP_EQUALVERIFY OP_CHECKSIG" % fake_hash("script", seed)[:40],
+        'script_hex': "76a914%s88ac" % fake_hash("script", seed)[:40],
+        'time': "2014-05-14T19:34:12+0000",
+        'confirmations': rnd.randint(1, 10000),
+    }
+
+
+def webhook(identifier):
+    return {'url': "https://example.com/hooks/%s" % identifier, 'identifier': identifier}
+
+
+def webhook_event(seed):
+    return {'event_type': "address-transactions", 'address': fake_address(seed), 'confirmations': 6}
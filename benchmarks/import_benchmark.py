@@ -0,0 +1,65 @@
+"""
+measures the time of `import blocktrail` and creating an APIClient in a fresh interpreter, and fails when it's over budget
+
+    $ python benchmarks/import_benchmark.py [--runs 10] [--budget-ms 60]
+
+requests, httpsig and friends are only imported on the first request, they're listed when they were imported anyway
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+HEAVY_MODULES = ['requests', 'urllib3', 'httpsig', 'Crypto', 'future', 'concurrent.futures', 'email.utils', 'numpy', 'aiohttp']
+
+CODE = """
+import json, sys, time
+start = time.time()
+import blocktrail
+client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET")
+seconds = time.time() - start
+print(json.dumps({'seconds': seconds, 'modules': [module for module in %r if module in sys.modules]}))
+""" % (HEAVY_MODULES, )
+
+
+def measure(runs):
+    """
+    :rtype: (list, list)    the times in seconds and the heavy modules that were imported
+    """
+    times = []
+    modules = set()
+
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", CODE], cwd=ROOT)
+        result = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+        times.append(result['seconds'])
+        modules.update(result['modules'])
+
+    return sorted(times), sorted(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=60.0)
+    args = parser.parse_args()
+
+    times, modules = measure(args.runs)
+    median = times[len(times) // 2] * 1000
+
+    print("import blocktrail + APIClient()  median %.1f ms  min %.1f ms  budget %.1f ms" % (median, times[0] * 1000, args.budget_ms))
+    if modules:
+        print("imported eagerly: %s" % ", ".join(modules))
+
+    if median > args.budget_ms or modules:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+measures how fast full block_transactions pages (200 transactions) are decoded and request bodies are encoded
+ with each of the installed JSON codecs
+
+    $ python benchmarks/json_benchmark.py [--pages 50]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blocktrail import codec
+from benchmarks import fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=50)
+    args = parser.parse_args()
+
+    page = fixtures.block_transactions_page()
+    content = json.dumps(page).encode("utf-8")
+    body = {'events': [{'event_type': 'address-transactions', 'address': fixtures.fake_address(i), 'confirmations': 6}
+                       for i in range(500)]}
+
+    print("page size %d bytes" % len(content))
+
+    results = {}
+    for name in codec.AUTO_PREFERENCE:
+        try:
+            json_codec = codec.get_codec(name)
+        except ImportError:
+            print("%-8s not installed" % name)
+            continue
+
+        assert json_codec.loads(content) == page
+
+        seconds = min(timeit.repeat(lambda: json_codec.loads(content), number=args.pages, repeat=3))
+        results[name] = args.pages / seconds
+
+        encode = min(timeit.repeat(lambda: json_codec.dumps(body), number=args.pages, repeat=3))
+
+        print("%-8s %8.1f pages/s decoded %8.1f MB/s %10.0f bodies/s encoded" %
+              (name, results[name], results[name] * len(content) / 1e6, args.pages / encode))
+
+    for name, rate in results.items():
+        if name != 'json':
+            print("%-8s %8.2fx faster than json" % (name, rate / results['json']))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+measures the memory used per transaction and the attribute access speed of the typed models compared to plain dicts,
+ for full block_transactions pages (200 transactions)
+
+    $ python benchmarks/models_benchmark.py [--pages 10]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blocktrail import models
+from benchmarks import fixtures
+
+
+def measure(fn):
+    """
+    :rtype: (object, int)   the result of :fn and the amount of bytes it still holds on to
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=10)
+    args = parser.parse_args()
+
+    contents = [json.dumps(fixtures.block_transactions_page(current_page=page)).encode("utf-8") for page in range(1, args.pages + 1)]
+    n = sum(len(json.loads(content)['data']) for content in contents)
+
+    def as_dicts():
+        return [json.loads(content)['data'] for content in contents]
+
+    def as_models():
+        return [[models.Transaction.from_dict(tx) for tx in json.loads(content)['data']] for content in contents]
+
+    def as_models_accessed():
+        pages = as_models()
+        for page in pages:
+            for tx in page:
+                tx.inputs, tx.outputs
+
+        return pages
+
+    dicts, dicts_size = measure(as_dicts)
+    typed, typed_size = measure(as_models_accessed)
+    _, lazy_size = measure(as_models)
+
+    print("%-26s %8.0f bytes/tx" % ("dicts", dicts_size / n))
+    print("%-26s %8.0f bytes/tx %6.2fx" % ("models, nested not parsed", lazy_size / n, dicts_size / float(lazy_size)))
+    print("%-26s %8.0f bytes/tx %6.2fx" % ("models, nested parsed", typed_size / n, dicts_size / float(typed_size)))
+
+    txs = [tx for page in dicts for tx in page]
+    typed_txs = [tx for page in typed for tx in page]
+
+    def dict_access():
+        return sum(tx['total_fee'] + sum(txout['value'] for txout in tx['outputs']) for tx in txs)
+
+    def model_access():
+        return sum(tx.total_fee + sum(txout.value for txout in tx.outputs) for tx in typed_txs)
+
+    assert dict_access() == model_access()
+
+    dict_seconds = min(timeit.repeat(dict_access, number=20, repeat=3))
+    model_seconds = min(timeit.repeat(model_access, number=20, repeat=3))
+
+    print("%-26s %8.0f tx/s" % ("dict access", 20 * n / dict_seconds))
+    print("%-26s %8.0f tx/s %6.2fx" % ("model access", 20 * n / model_seconds, dict_seconds / model_seconds))
+
+
+if __name__ == "__main__":
+    main()
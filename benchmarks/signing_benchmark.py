@@ -0,0 +1,60 @@
+"""
+measures how many requests per second can be prepared and signed, with and without the signing fast path
+
+    $ python benchmarks/signing_benchmark.py [--requests 20000]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blocktrail.connection import RestClient
+
+from requests.structures import CaseInsensitiveDict
+from urllib.parse import urlencode
+
+
+class SignableRequest(object):
+    """
+    the parts of a requests.PreparedRequest that the auth hooks look at
+    """
+
+    def __init__(self, method, path_url, headers):
+        self.method = method
+        self.path_url = path_url
+        self.headers = CaseInsensitiveDict(headers)
+
+
+def sign_requests(client, n):
+    for i in range(n):
+        params, headers = client.prepare('GET', "/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/transactions", params={'page': i, 'limit': 200})
+        client.auth(SignableRequest('GET', "/v1/BTC/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/transactions?" + urlencode(params), headers))
+
+        params, headers = client.prepare('POST', "/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/verify", data='{"signature": "abc"}')
+        client.auth(SignableRequest('POST', "/v1/BTC/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/verify?" + urlencode(params), headers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    results = {}
+    for fast_signing in (False, True):
+        client = RestClient("https://api.blocktrail.com/v1/BTC", "MY_APIKEY", "MY_APISECRET", fast_signing=fast_signing)
+
+        n = args.requests // 2
+        seconds = min(timeit.repeat(lambda: sign_requests(client, n), number=1, repeat=3))
+        results[fast_signing] = args.requests / seconds
+
+        print("%-12s %10.0f signed requests/s" % ("fast path" if fast_signing else "httpsig", results[fast_signing]))
+
+    print("speedup      %10.2fx" % (results[True] / results[False]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+benchmark suite for the SDK's own overhead, against a local mock of the API serving realistic fixtures for every endpoint
+
+measures per call latency percentiles, throughput at several concurrency levels, memory per page and import time
+
+    $ python benchmarks/suite.py [--json results.json] [--compare baseline.json]
+
+the mock server is a plain python HTTP server in its own process, at high concurrency it's likely to be the bottleneck,
+ so the numbers are meant to be compared between versions of the SDK on the same machine
+
+with --compare the results are checked against an earlier --json output
+ and the exit code is 1 when anything got worse by more than --tolerance
+"""
+from __future__ import print_function, division
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import blocktrail
+from benchmarks import fixtures
+from tests.mock_server import MockServer
+
+
+ADDRESS = fixtures.fake_address("benchmark")
+TXHASH = fixtures.fake_hash("tx", "benchmark")
+HEIGHT = 300000
+WEBHOOK = "benchmark-webhook"
+PAGE_SIZE = 200
+
+DEFAULT_CONCURRENCY = [1, 8, 64]
+
+now = getattr(time, 'perf_counter', time.time)
+
+
+def serve(server):
+    """
+    route every endpoint of the APIClient to a fixture, the responses are encoded once up front
+    """
+    def route(method, path, data):
+        server.route(method, path, json.dumps(data).encode("utf-8"))
+
+    transactions = fixtures.block_transactions_page(HEIGHT, limit=PAGE_SIZE)
+
+    route('GET', "/address/%s" % ADDRESS, fixtures.address(ADDRESS))
+    route('GET', "/address/%s/transactions" % ADDRESS, transactions)
+    route('GET', "/address/%s/unconfirmed-transactions" % ADDRESS,
+          fixtures.page([fixtures.transaction(("unconfirmed", i), block_height=None, confirmations=0) for i in range(20)]))
+    route('GET', "/address/%s/unspent-outputs" % ADDRESS, fixtures.page([fixtures.unspent_output(i) for i in range(PAGE_SIZE)]))
+    route('POST', "/address/%s/verify" % ADDRESS, {'result': True})
+    route('GET', "/all-blocks", fixtures.page([fixtures.block(HEIGHT - i) for i in range(PAGE_SIZE)]))
+    route('GET', "/block/latest", fixtures.block(HEIGHT, confirmations=1))
+    route('GET', "/block/%s" % HEIGHT, fixtures.block(HEIGHT))
+    route('GET', "/block/%s/transactions" % HEIGHT, transactions)
+    route('GET', "/transaction/%s" % TXHASH, fixtures.transaction("benchmark"))
+    route('GET', "/webhooks", fixtures.page([fixtures.webhook("webhook-%d" % i) for i in range(20)]))
+    route('GET', "/webhook/%s" % WEBHOOK, fixtures.webhook(WEBHOOK))
+    route('POST', "/webhook", fixtures.webhook(WEBHOOK))
+    route('PUT', "/webhook/%s" % WEBHOOK, fixtures.webhook(WEBHOOK))
+    route('DELETE', "/webhook/%s" % WEBHOOK, {'result': True})
+    route('GET', "/webhook/%s/events" % WEBHOOK, fixtures.page([fixtures.webhook_event(i) for i in range(PAGE_SIZE)]))
+    route('POST', "/webhook/%s/events" % WEBHOOK, fixtures.webhook_event(0))
+    route('POST', "/webhook/%s/events/batch" % WEBHOOK, {'result': True})
+    route('DELETE', "/webhook/%s/address-transactions/%s" % (WEBHOOK, ADDRESS), {'result': True})
+    route('DELETE', "/webhook/%s/block" % WEBHOOK, {'result': True})
+    route('DELETE', "/webhook/%s/transaction/%s" % (WEBHOOK, TXHASH), {'result': True})
+    route('GET', "/price", {'USD': 250.0, 'EUR': 220.0})
+    route('POST', "/verify_message", {'result': True})
+
+
+ENDPOINTS = [
+    ('address', lambda client: client.address(ADDRESS)),
+    ('address_transactions', lambda client: client.address_transactions(ADDRESS, limit=PAGE_SIZE)),
+    ('address_unconfirmed_transactions', lambda client: client.address_unconfirmed_transactions(ADDRESS)),
+    ('address_unspent_outputs', lambda client: client.address_unspent_outputs(ADDRESS, limit=PAGE_SIZE)),
+    ('verify_address', lambda client: client.verify_address(ADDRESS, "H1VgT9EnHf3v3ZSqHCx8/Y3uFYH3vqYjmYS5VJyf3iY=")),
+    ('all_blocks', lambda client: client.all_blocks(limit=PAGE_SIZE)),
+    ('block_latest', lambda client: client.block_latest()),
+    ('block', lambda client: client.block(HEIGHT)),
+    ('block_transactions', lambda client: client.block_transactions(HEIGHT, limit=PAGE_SIZE)),
+    ('transaction', lambda client: client.transaction(TXHASH)),
+    ('all_webhooks', lambda client: client.all_webhooks()),
+    ('webhook', lambda client: client.webhook(WEBHOOK)),
+    ('setup_webhook', lambda client: client.setup_webhook("https://example.com/hooks/%s" % WEBHOOK, WEBHOOK)),
+    ('update_webhook', lambda client: client.update_webhook(WEBHOOK, new_url="https://example.com/hooks/%s" % WEBHOOK)),
+    ('delete_webhook', lambda client: client.delete_webhook(WEBHOOK)),
+    ('webhook_events', lambda client: client.webhook_events(WEBHOOK, limit=PAGE_SIZE)),
+    ('subscribe_address_transactions', lambda client: client.subscribe_address_transactions(WEBHOOK, ADDRESS)),
+    ('batch_subscribe_address_transactions',
+     lambda client: client.batch_subscribe_address_transactions(WEBHOOK, [{'address': fixtures.fake_address(i)} for i in range(100)])),
+    ('subscribe_new_blocks', lambda client: client.subscribe_new_blocks(WEBHOOK)),
+    ('subscribe_transaction', lambda client: client.subscribe_transaction(WEBHOOK, TXHASH)),
+    ('unsubscribe_address_transactions', lambda client: client.unsubscribe_address_transactions(WEBHOOK, ADDRESS)),
+    ('unsubscribe_new_blocks', lambda client: client.unsubscribe_new_blocks(WEBHOOK)),
+    ('unsubscribe_transaction', lambda client: client.unsubscribe_transaction(WEBHOOK, TXHASH)),
+    ('price', lambda client: client.price()),
+    ('verify_message', lambda client: client.verify_message("hello", ADDRESS, "H1VgT9EnHf3v3ZSqHCx8/Y3uFYH3vqYjmYS5VJyf3iY=")),
+]
+
+
+def percentile(values, p):
+    """
+    :param list     values:     sorted values
+    :param float    p:          percentile, between 0 and 100
+    """
+    index = int(round(p / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def measure_import_time(runs=5):
+    """
+    time `import blocktrail` in a fresh interpreter
+    """
+    code = "import time; t = time.time(); import blocktrail; print(time.time() - t)"
+
+    times = []
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT)
+        times.append(float(output.decode("ascii").strip()))
+
+    times.sort()
+    return {'min_ms': times[0] * 1000, 'median_ms': percentile(times, 50) * 1000}
+
+
+def measure_latency(client, calls):
+    results = {}
+    for name, call in ENDPOINTS:
+        # warm up the connection
+        call(client)
+
+        times = []
+        for i in range(calls):
+            start = now()
+            call(client)
+            times.append(now() - start)
+
+        times.sort()
+        results[name] = {
+            'p50_ms': percentile(times, 50) * 1000,
+            'p90_ms': percentile(times, 90) * 1000,
+            'p99_ms': percentile(times, 99) * 1000,
+            'mean_ms': sum(times) / len(times) * 1000,
+        }
+
+    return results
+
+
+def measure_throughput(url, concurrency, duration):
+    """
+    requests per second of `transaction()` calls from :concurrency threads sharing one client
+    """
+    client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=url, pool_maxsize=concurrency)
+    counts = [0] * concurrency
+    stop = threading.Event()
+
+    def worker(i):
+        while not stop.is_set():
+            client.transaction(TXHASH)
+            counts[i] += 1
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        start = now()
+        futures = [executor.submit(worker, i) for i in range(concurrency)]
+        time.sleep(duration)
+        stop.set()
+        for future in futures:
+            future.result()
+        elapsed = now() - start
+    finally:
+        executor.shutdown()
+        client.close()
+
+    return sum(counts) / elapsed
+
+
+def measure_memory(url, pages=5):
+    """
+    bytes held per decoded page of 200 transactions, as dicts and as typed models
+    """
+    results = {}
+    for typed in (False, True):
+        client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=url, typed=typed)
+        client.block_transactions(HEIGHT, limit=PAGE_SIZE)
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        held = [client.block_transactions(HEIGHT, limit=PAGE_SIZE) for i in range(pages)]
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        client.close()
+        del held
+
+        results['typed' if typed else 'dicts'] = {
+            'bytes_per_page': (after - before) // pages,
+            'peak_bytes': peak - before,
+        }
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    :rtype: list    descriptions of the metrics that got worse by more than :tolerance
+    """
+    regressions = []
+
+    def check(name, value, base, higher_is_better=False):
+        if not base:
+            return
+
+        change = (value - base) / base
+        if (change < -tolerance) if higher_is_better else (change > tolerance):
+            regressions.append("%s: %.2f -> %.2f (%+.0f%%)" % (name, base, value, change * 100))
+
+    check("import_time median_ms", results['import_time']['median_ms'], baseline['import_time']['median_ms'])
+
+    for endpoint, latency in results['latency'].items():
+        if endpoint in baseline['latency']:
+            check("latency %s p50_ms" % endpoint, latency['p50_ms'], baseline['latency'][endpoint]['p50_ms'])
+
+    for concurrency, rate in results['throughput'].items():
+        if concurrency in baseline['throughput']:
+            check("throughput %s req/s" % concurrency, rate, baseline['throughput'][concurrency], higher_is_better=True)
+
+    for mode, memory in results['memory'].items():
+        if mode in baseline['memory']:
+            check("memory %s bytes_per_page" % mode, memory['bytes_per_page'], baseline['memory'][mode]['bytes_per_page'])
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=100, help="calls per endpoint for the latency percentiles")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=2.0, help="seconds per throughput run")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--compare', help="compare against the results in this file")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed relative regression for --compare")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        server = MockServer(record=False).start()
+        serve(server)
+
+        # the parent reads the url and closes stdin when it's done
+        print(server.url)
+        sys.stdout.flush()
+        sys.stdin.read()
+        server.stop()
+        return
+
+    # the mock server runs in its own process, so it doesn't compete with the client for the GIL
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        url = process.stdout.readline().decode("ascii").strip()
+        client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=url)
+
+        results = {
+            'meta': {
+                'sdk_version': blocktrail.SDK_VERSION,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'json_codec': client.client.codec.name,
+                'time': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            },
+            'import_time': measure_import_time(),
+            'latency': measure_latency(client, args.calls),
+            'throughput': dict((str(concurrency), measure_throughput(url, concurrency, args.duration))
+                               for concurrency in args.concurrency),
+            'memory': measure_memory(url),
+        }
+
+        client.close()
+    finally:
+        process.stdin.close()
+        process.wait()
+
+    print("import blocktrail      %8.1f ms (min %.1f ms)" % (results['import_time']['median_ms'], results['import_time']['min_ms']))
+    print()
+    print("%-40s %9s %9s %9s" % ("latency", "p50 ms", "p90 ms", "p99 ms"))
+    for name, _ in ENDPOINTS:
+        latency = results['latency'][name]
+        print("%-40s %9.2f %9.2f %9.2f" % (name, latency['p50_ms'], latency['p90_ms'], latency['p99_ms']))
+    print()
+    for concurrency in args.concurrency:
+        print("throughput, %3d threads %10.0f req/s" % (concurrency, results['throughput'][str(concurrency)]))
+    print()
+    for mode, memory in sorted(results['memory'].items()):
+        print("memory, %-6s %12d bytes/page %12d bytes peak" % (mode, memory['bytes_per_page'], memory['peak_bytes']))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+        print()
+        for regression in regressions:
+            print("REGRESSION %s" % regression)
+
+        if regressions:
+            sys.exit(1)
+
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
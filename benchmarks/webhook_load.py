@@ -0,0 +1,110 @@
+"""
+load test of the WebhookReceiver with a local event generator, simulating the burst of events after a new block
+
+    $ python benchmarks/webhook_load.py [--events 20000] [--concurrency 64] [--duplicates 0.05]
+"""
+from __future__ import print_function
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import aiohttp
+
+from blocktrail.webhook_receiver import WebhookReceiver
+from benchmarks import fixtures
+
+
+def percentile(values, p):
+    return values[int(round(p / 100.0 * (len(values) - 1)))]
+
+
+def generate(n, duplicates):
+    """
+    :rtype: list    encoded event bodies, with a fraction of them delivered twice
+    """
+    rnd = random.Random(0)
+    bodies = []
+    for i in range(n):
+        tx = fixtures.transaction(("webhook", i), confirmations=0)
+        body = json.dumps({
+            'network': "BTC",
+            'event_type': "address-transactions",
+            'webhook_identifier': "load-test",
+            'addresses': {tx['outputs'][0]['address']: tx['outputs'][0]['value']},
+            'data': tx,
+            'retry_count': 0,
+        }).encode("utf-8")
+
+        bodies.append(body)
+        if rnd.random() < duplicates:
+            bodies.append(body)
+
+    return bodies
+
+
+async def run(args):
+    handled = []
+
+    async def handler(events):
+        handled.append(len(events))
+
+    receiver = WebhookReceiver(handler, token="load-test", batch_size=args.batch_size, queue_size=args.queue_size)
+    await receiver.start(host="127.0.0.1", port=0)
+    url = "http://127.0.0.1:%d/webhook?token=load-test" % receiver.port
+
+    bodies = generate(args.events, args.duplicates)
+    latencies = []
+    statuses = {}
+
+    async def sender(session, bodies):
+        for body in bodies:
+            start = time.time()
+            async with session.post(url, data=body, headers={'Content-Type': "application/json"}) as response:
+                await response.read()
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+            latencies.append(time.time() - start)
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.time()
+        await asyncio.gather(*[sender(session, bodies[i::args.concurrency]) for i in range(args.concurrency)])
+        sent = time.time() - start
+
+    await receiver.stop()
+    elapsed = time.time() - start
+
+    stats = receiver.stats()
+    latencies.sort()
+
+    print("%d deliveries of %d events from %d concurrent senders" % (len(bodies), args.events, args.concurrency))
+    print("accepted             %10.0f deliveries/s" % (len(bodies) / sent))
+    print("handled              %10.0f events/s (%d batches, %.1f events per batch)" %
+          (stats['handled'] / elapsed, stats['batches'], stats['handled'] / float(max(1, stats['batches']))))
+    print("ack latency          p50 %.2f ms  p99 %.2f ms  max %.2f ms" %
+          (percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000, latencies[-1] * 1000))
+    print("receive to handled   mean %.2f ms" % (stats['latency']['mean'] * 1000))
+    print("statuses             %s" % statuses)
+    print("duplicates dropped   %d" % stats['duplicates'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duplicates', type=float, default=0.05, help="fraction of events that's delivered twice")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--queue-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    asyncio.get_event_loop().run_until_complete(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ def to_btc(satoshi):
     return COIN_FORMAT % (satoshi / float(COIN))
 
 
+from blocktrail.coin import to_satoshi_many, to_btc_many
 from blocktrail import connection
 from blocktrail import exceptions
 from blocktrail.client import APIClient
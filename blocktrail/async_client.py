@@ -0,0 +1,561 @@
+"""
+asyncio flavour of the APIClient, requires python 3.5+ and aiohttp (`pip install blocktrail-sdk[async]`)
+"""
+import asyncio
+from urllib.parse import urlparse, urlencode
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+import yarl
+
+from blocktrail import models
+from blocktrail.connection import BaseRestClient
+from blocktrail.exceptions import BlockTrailSDKException
+from blocktrail.ratelimit import monotonic
+
+
+DEFAULT_ASYNC_POOL_MAXSIZE = 100
+
+
+class AsyncRestClient(BaseRestClient):
+    def __init__(self, api_endpoint, api_key, api_secret, debug=False, pool_maxsize=DEFAULT_ASYNC_POOL_MAXSIZE, rate_limiter=None,
+                 retry_policy=None, fast_signing=True, json_codec=None):
+        """
+        :param str      api_endpoint:       the base url to use for all API requests
+        :param str      api_key:            the API_KEY to use for authentication
+        :param str      api_secret:         the API_SECRET to use for authentication
+        :param bool     debug:              print debug information when requests fail
+        :param int      pool_maxsize:       the max amount of connections to keep open
+        :param rate_limiter:                throttle the requests (eg; blocktrail.ratelimit.TokenBucket), can be shared with sync clients
+        :param RetryPolicy retry_policy:    retry failed requests (eg; blocktrail.retry.RetryPolicy), disabled by default
+        :param bool     fast_signing:       use the signing fast path, which produces the same signatures as httpsig with less work
+        :param str      json_codec:         'auto' (default) for the fastest JSON library installed, 'orjson', 'ujson' or 'json'
+        """
+        super(AsyncRestClient, self).__init__(api_endpoint=api_endpoint, api_key=api_key, api_secret=api_secret, debug=debug,
+                                              fast_signing=fast_signing, json_codec=json_codec)
+
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+
+        # the aiohttp session is created on first use, because it needs to be created inside the running event loop
+        self.session = None
+
+    async def get(self, endpoint_url, params=None, auth=None):
+        """
+        :param str      endpoint_url:   the API endpoint to request
+        :param dict     params:         query string params to add
+        :param bool     auth:           do HMAC auth
+        :rtype: requests.Response
+        """
+        return await self.request('GET', endpoint_url, params=params, auth=auth)
+
+    async def post(self, endpoint_url, data, params=None, auth=None, idempotent=False):
+        """
+        :param str      endpoint_url:   the API endpoint to request
+        :param dict     data:           the POST body
+        :param bool     auth:           do HMAC auth
+        :param bool     idempotent:     the POST can be retried safely
+        :rtype: requests.Response
+        """
+        # do the post body encoding here since we need it to get the MD5
+        return await self.request('POST', endpoint_url, data=self.encode(data), params=params, auth=auth, idempotent=idempotent)
+
+    async def put(self, endpoint_url, data, params=None, auth=None, idempotent=False):
+        """
+        :param str      endpoint_url:   the API endpoint to request
+        :param dict     data:           the PUT body
+        :param bool     auth:           do HMAC auth
+        :param bool     idempotent:     the PUT can be retried safely
+        :rtype: requests.Response
+        """
+        # do the put body encoding here since we need it to get the MD5
+        return await self.request('PUT', endpoint_url, data=self.encode(data), params=params, auth=auth, idempotent=idempotent)
+
+    async def delete(self, endpoint_url, data=None, params=None, auth=None):
+        """
+        :param str      endpoint_url:   the API endpoint to request
+        :param dict     data:           the DELETE body
+        :param bool     auth:           do HMAC auth
+        :rtype: requests.Response
+        """
+        return await self.request('DELETE', endpoint_url, data=self.encode(data), params=params, auth=auth)
+
+    async def request(self, method, endpoint_url, data=None, params=None, auth=None, idempotent=None):
+        """
+        :param str      method:         the HTTP method
+        :param str      endpoint_url:   the API endpoint to request
+        :param bytes    data:           the encoded body
+        :param dict     params:         query string params to add
+        :param bool     auth:           do HMAC auth
+        :param bool     idempotent:     if the request can be retried safely, by default only GET and DELETE are
+        :rtype: requests.Response
+        """
+        if self.retry_policy is None:
+            return await self.send(method, endpoint_url, data=data, params=params, auth=auth)
+
+        start = monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.retry_policy.on_attempt()
+
+            try:
+                # every attempt is prepared again, so it gets a fresh Date header and signature
+                return await self.send(method, endpoint_url, data=data, params=params, auth=auth)
+            except (BlockTrailSDKException, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                delay = self.retry_policy.retry_delay(method, attempt, monotonic() - start, e, idempotent=idempotent,
+                                                      connection_error=not isinstance(e, BlockTrailSDKException))
+                if delay is None:
+                    raise
+
+                await asyncio.sleep(delay)
+
+    async def send(self, method, endpoint_url, data=None, params=None, auth=None):
+        """
+        sign and send a single attempt of a request, the response is wrapped in a requests.Response
+         so it can go through the same error handling
+
+        :rtype: requests.Response
+        """
+        params, headers = self.prepare(method, endpoint_url, data=data, params=params)
+
+        url = self.api_endpoint + endpoint_url + "?" + urlencode(list(params.items()))
+
+        if auth is True:
+            parsed = urlparse(url)
+            headers = self.sign(headers, method, parsed.path + "?" + parsed.query)
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_maxsize))
+
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        # the url is already encoded, aiohttp should not touch it or the signature won't match anymore
+        async with self.session.request(method, yarl.URL(url, encoded=True), data=data, headers=dict(headers)) as r:
+            response = requests.Response()
+            response.status_code = r.status
+            response.reason = r.reason
+            response.url = url
+            response.headers = CaseInsensitiveDict(r.headers)
+            response._content = await r.read()
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_response(response.status_code, AsyncRestClient.retry_after(response))
+
+        return self.handle_response(response)
+
+    async def close(self):
+        """
+        close all pooled connections
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class AsyncAPIClient(object):
+    def __init__(self, api_key, api_secret, network='BTC', testnet=False, api_version='v1', api_endpoint=None, debug=False,
+                 pool_maxsize=DEFAULT_ASYNC_POOL_MAXSIZE, rate_limiter=None,
+                 retry_policy=None, fast_signing=True, json_codec=None, typed=False):
+        """
+        :param str      api_key:        the API_KEY to use for authentication
+        :param str      api_secret:     the API_SECRET to use for authentication
+        :param str      network:        the crypto network to consume (eg BTC, LTC, etc)
+        :param bool     testnet:        testnet network yes/no
+        :param str      api_version:    the version of the API to consume
+        :param str      api_endpoint:   overwrite the endpoint used
+                                         this will cause the :network, :testnet and :api_version to be ignored!
+        :param bool     debug:          print debug information when requests fail
+        :param int      pool_maxsize:   the max amount of connections to keep open
+        :param rate_limiter:            throttle the requests (eg; blocktrail.ratelimit.TokenBucket)
+        :param blocktrail.retry.RetryPolicy retry_policy: retry failed requests, disabled by default
+        :param bool     fast_signing:   use the signing fast path, which produces the same signatures with less work
+        :param str      json_codec:     'auto' (default) for the fastest JSON library installed, 'orjson', 'ujson' or 'json'
+        :param bool     typed:          return blocks, transactions, addresses and webhooks as compact blocktrail.models objects
+                                         instead of dicts
+        """
+        self.typed = typed
+
+        if api_endpoint is None:
+            network = ("t" if testnet else "") + network.upper()
+            api_endpoint = "https://api.blocktrail.com/%s/%s" % (api_version, network)
+
+        self.client = AsyncRestClient(api_endpoint=api_endpoint, api_key=api_key, api_secret=api_secret, debug=debug,
+                                      pool_maxsize=pool_maxsize, rate_limiter=rate_limiter,
+                                      retry_policy=retry_policy, fast_signing=fast_signing, json_codec=json_codec)
+
+    async def close(self):
+        """
+        close the connections held by this client
+        """
+        await self.client.close()
+
+    def decode(self, response, model=None, page=False):
+        """
+        decode a response, into :model when the client is typed
+
+        :param requests.Response   response:
+        :param type     model:          the blocktrail.models.Model for the result
+        :param bool     page:           the response is a page of :model records
+        """
+        data = self.client.decode(response)
+
+        if self.typed and model is not None:
+            return models.parse(model, data, page=page)
+
+        return data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def address(self, address):
+        """
+        get a single address
+
+        :param str      address:        the address hash
+        :rtype: dict
+        """
+        response = await self.client.get("/address/%s" % (address, ))
+
+        return self.decode(response, models.Address)
+
+    async def address_transactions(self, address, page=1, limit=20, sort_dir='asc'):
+        """
+        get all transactions for an address (paginated)
+
+        :param str      address:        the address hash
+        :param int      page:           pagination page, starting at 1
+        :param int      limit:          the amount of transactions per page, can be between 1 and 200
+        :param str      address:        sorted ASC or DESC (on time)
+        :rtype: dict
+        """
+
+        response = await self.client.get("/address/%s/transactions" % (address, ), params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
+
+        return self.decode(response, models.Transaction, page=True)
+
+    async def address_unconfirmed_transactions(self, address, page=1, limit=20, sort_dir='asc'):
+        """
+        get all unconfirmed transactions for an address (paginated)
+
+        :param str      address:        the address hash
+        :param int      page:           pagination page, starting at 1
+        :param int      limit:          the amount of transactions per page, can be between 1 and 200
+        :param str      sort_dir:       sorted ASC or DESC (on time)
+        :rtype: dict
+        """
+        response = await self.client.get("/address/%s/unconfirmed-transactions" % (address, ), params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
+
+        return self.decode(response, models.Transaction, page=True)
+
+    async def address_unspent_outputs(self, address, page=1, limit=20, sort_dir='asc'):
+        """
+        get all inspent outputs for an address (paginated)
+
+        :param str      address:        the address hash
+        :param int      page:           pagination page, starting at 1
+        :param int      limit:          the amount of transactions per page, can be between 1 and 200
+        :param str      sort_dir:       sorted ASC or DESC (on time)
+        :rtype: dict
+        """
+        response = await self.client.get("/address/%s/unspent-outputs" % (address, ), params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
+
+        return self.client.decode(response)
+
+    async def verify_address(self, address, signature):
+        """
+        verify ownership of an address
+
+        :param str      address:        the address hash
+        :param str      signature:      signature generated with PK with message being the :address
+        :rtype: dict
+        """
+        response = await self.client.post("/address/%s/verify" % (address, ), data={'signature': signature}, auth=True, idempotent=True)
+
+        return self.client.decode(response)
+
+    async def all_blocks(self, page=1, limit=20, sort_dir='asc'):
+        """
+        get all blocks (paginated)
+
+        :param int      page:            pagination page, starting at 1
+        :param int      limit:           the amount of transactions per page, can be between 1 and 200
+        :param str      sort_dir:        sorted ASC or DESC (on time)
+        :rtype: dict
+        """
+
+        response = await self.client.get("/all-blocks", params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
+
+        return self.decode(response, models.Block, page=True)
+
+    async def block_latest(self):
+        """
+        get the latest block
+
+        :rtype: dict
+        """
+        response = await self.client.get("/block/latest")
+
+        return self.decode(response, models.Block)
+
+    async def block(self, block):
+        """
+        get a block
+
+        :param str|int  block:           the block hash or block height
+        :rtype: dict
+        """
+
+        response = await self.client.get("/block/%s" % (block, ))
+
+        return self.decode(response, models.Block)
+
+    async def block_transactions(self, block, page=1, limit=20, sort_dir='asc'):
+        """
+        get all transactions for a block (paginated)
+
+        :param str|int  block:           the block hash or block height
+        :param int      page:            pagination page, starting at 1
+        :param int      limit:           the amount of transactions per page, can be between 1 and 200
+        :param str      sort_dir:        sorted ASC or DESC (on time)
+        :rtype: dict
+        """
+
+        response = await self.client.get("/block/%s/transactions" % (block, ), params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
+
+        return self.decode(response, models.Transaction, page=True)
+
+    async def transaction(self, txhash):
+        """
+        get a single transaction
+
+        :param str      txhash:          the transaction hash
+        :rtype: dict
+        """
+
+        response = await self.client.get("/transaction/%s" % (txhash, ))
+
+        return self.decode(response, models.Transaction)
+
+    async def all_webhooks(self, page=1, limit=20):
+        """
+        get all webhooks (paginated)
+
+        :param int      page:            pagination page, starting at 1
+        :param int      limit:           the amount of webhooks per page, can be between 1 and 200
+        :rtype: dict
+        """
+
+        response = await self.client.get("/webhooks", params={'page': page, 'limit': limit})
+
+        return self.decode(response, models.Webhook, page=True)
+
+    async def webhook(self, identifier):
+        """
+        get a webhook by it's identifier
+
+        :param str      identifier:      the webhook identifier
+        :rtype: dict
+        """
+
+        response = await self.client.get("/webhook/%s" % (identifier, ))
+
+        return self.decode(response, models.Webhook)
+
+    async def setup_webhook(self, url, identifier=None):
+        """
+        create a new webhook
+
+        :param str      url:            the url to receive the webhook events
+        :param str      identifier:     a unique identifier to associate with this webhook (optional)
+        :rtype: dict
+        """
+        response = await self.client.post("/webhook", data={'url': url, 'identifier': identifier}, auth=True)
+
+        return self.decode(response, models.Webhook)
+
+    async def update_webhook(self, identifier, new_url=None, new_identifier=None):
+        """
+        update an existing webhook
+
+        :param str      identifier:     the webhook identifier
+        :param str      new_url:        the new webhook url
+        :param str      new_identifier: the new webhook identifier
+        :rtype: dict
+        """
+        response = await self.client.put("/webhook/%s" % (identifier, ),
+                                         data={'url': new_url, 'identifier': new_identifier},
+                                         auth=True)
+
+        return self.decode(response, models.Webhook)
+
+    async def delete_webhook(self, identifier):
+        """
+        deletes an existing webhook and any event subscriptions associated with it
+
+        :param str      identifier:     the webhook identifier
+        :rtype: dict
+        """
+        response = await self.client.delete("/webhook/%s" % (identifier, ), auth=True)
+
+        return self.client.decode(response)
+
+    async def webhook_events(self, identifier, page=1, limit=20):
+        """
+        get a paginated list of all the events a webhook is subscribed to
+
+        :param str      identifier:     the webhook identifier
+        :param int      page:           pagination page, starting at 1
+        :param int      limit:          the amount of webhooks per page, can be between 1 and 200
+        :rtype: dict
+        """
+
+        response = await self.client.get("/webhook/%s/events" % (identifier, ), params={'page': page, 'limit': limit})
+
+        return self.client.decode(response)
+
+    async def subscribe_address_transactions(self, identifier, address, confirmations=6):
+        """
+        subscribes a webhook to transaction events on a particular address
+
+        :param str      identifier:     the webhook identifier
+        :param str      address:        the address hash
+        :param str      confirmations:  the amount of confirmations to send
+        :rtype: dict
+        """
+        response = await self.client.post(
+            "/webhook/%s/events" % (identifier, ),
+            data={
+                'event_type': 'address-transactions',
+                'address': address,
+                'confirmations': confirmations
+            },
+            auth=True
+        )
+
+        return self.client.decode(response)
+
+    async def batch_subscribe_address_transactions(self, identifier, batch_data):
+        """
+        batch subscribes a webhook to multiple transaction events
+
+        :param str      identifier:     the webhook identifier
+        :param list     batch_data:     dicts with the `address` and optionally the `confirmations`
+        :rtype: dict
+        """
+        # copies, the records of the caller are left as they are
+        batch_data = [dict(record, event_type='address-transactions') for record in batch_data]
+
+        response = await self.client.post("/webhook/%s/events/batch" % (identifier, ), data=batch_data, auth=True)
+
+        return self.client.decode(response)
+
+    async def subscribe_new_blocks(self, identifier):
+        """
+        subscribes a webhook to new blocks
+
+        :param str      identifier:     the webhook identifier
+        :rtype: dict
+        """
+        response = await self.client.post(
+            "/webhook/%s/events" % (identifier, ),
+            data={
+                'event_type': 'block'
+            },
+            auth=True
+        )
+
+        return self.client.decode(response)
+
+    async def subscribe_transaction(self, identifier, transaction, confirmations=6):
+        """
+        subscribes a webhook to events on a particular transaction
+
+        :param str      identifier:     the webhook identifier
+        :param str      transaction:    the transaction hash
+        :param str      confirmations:  the amount of confirmations to send
+        :rtype: dict
+        """
+        response = await self.client.post(
+            "/webhook/%s/events" % (identifier, ),
+            data={
+                'event_type': 'transaction',
+                'transaction': transaction,
+                'confirmations': confirmations
+            },
+            auth=True
+        )
+
+        return self.client.decode(response)
+
+    async def unsubscribe_address_transactions(self, identifier, address):
+        """
+        unsubscribes a webhook to transaction events from a particular address
+
+        :param str      identifier:     the webhook identifier
+        :param str      address:        the address hash
+        :rtype: dict
+        """
+        response = await self.client.delete("/webhook/%s/address-transactions/%s" % (identifier, address), auth=True)
+
+        return self.client.decode(response)
+
+    async def unsubscribe_new_blocks(self, identifier):
+        """
+        unsubscribes a webhook from new blocks
+
+        :param str      identifier:     the webhook identifier
+        :rtype: dict
+        """
+        response = await self.client.delete("/webhook/%s/block" % (identifier, ), auth=True)
+
+        return self.client.decode(response)
+
+    async def unsubscribe_transaction(self, identifier, transaction):
+        """
+        unsubscribes a webhook to to events on a particular transaction
+
+        :param str      identifier:     the webhook identifier
+        :param str      transaction:        the address hash
+        :rtype: dict
+        """
+        response = await self.client.delete("/webhook/%s/transaction/%s" % (identifier, transaction), auth=True)
+
+        return self.client.decode(response)
+
+    async def price(self):
+        """
+        get the current price index
+
+        :rtype: dict
+        """
+
+        response = await self.client.get("/price")
+
+        return self.client.decode(response)
+
+    async def verify_message(self, message, address, signature):
+        """
+        verify message signed bitcoin-core style
+
+        :param str      message:
+        :param str      address:
+        :param str      signature:
+        :rtype: dict
+        """
+
+        response = await self.client.post("/verify_message", dict(
+            message=message,
+            address=address,
+            signature=signature
+        ), idempotent=True)
+
+        return self.client.decode(response)['result']
@@ -0,0 +1,37 @@
+"""
+helpers to do many lookups at once
+"""
+from collections import OrderedDict
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def batch_lookup(lookup, keys, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    call :lookup for every unique key with bounded concurrency
+
+    a failing lookup doesn't abort the batch, the exception it raised is returned in place of its result
+
+    :param callable lookup:         function taking a single key and returning its result
+    :param list     keys:           the keys to lookup, duplicates are only looked up once
+    :param int      max_workers:    the amount of lookups to do concurrently
+    :rtype: OrderedDict     the result or exception for each key, in input order
+    """
+    results = OrderedDict.fromkeys(keys)
+    if not results:
+        return results
+
+    # imported here, it's slow to import and not needed by every user of the SDK
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(key, executor.submit(lookup, key)) for key in results]
+
+        for key, future in futures:
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                results[key] = e
+
+    return results
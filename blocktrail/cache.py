@@ -0,0 +1,330 @@
+"""
+caching of API responses, see :RestClient(cache=)
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from six.moves.urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+
+# TTL to cache a response for ever, for data that's buried deep enough in the chain to never change again
+FOREVER = -1
+
+DEFAULT_MIN_CONFIRMATIONS = 6
+DEFAULT_SHORT_TTL = 5
+
+
+class CachePolicy(object):
+    """
+    decides for how long a response may be cached, based on the endpoint and the response itself
+    """
+
+    CONFIRMED_OBJECT = re.compile(r"^/(block|transaction)/[^/]+$")
+    BLOCK_TRANSACTIONS = re.compile(r"^/block/[^/]+/transactions$")
+    VOLATILE = re.compile(r"^/(block/latest|price|address/[^/]+/unconfirmed-transactions)$")
+    NEVER = re.compile(r"^/webhooks?(/|$)")
+
+    def __init__(self, min_confirmations=DEFAULT_MIN_CONFIRMATIONS, short_ttl=DEFAULT_SHORT_TTL, default_ttl=0):
+        """
+        :param int      min_confirmations:  the amount of confirmations after which a block or transaction is cached forever
+        :param int      short_ttl:          TTL for data that changes all the time (latest block, price, unconfirmed transactions)
+        :param int      default_ttl:        TTL for everything else (addresses, address transactions, etc), 0 to not cache
+        """
+        self.min_confirmations = min_confirmations
+        self.short_ttl = short_ttl
+        self.default_ttl = default_ttl
+
+    def ttl(self, endpoint_url, response, decode=None):
+        """
+        :param str                  endpoint_url:   the API endpoint that was requested
+        :param requests.Response    response:       the (successful) response
+        :param callable             decode:         returns the decoded body, so it's only decoded once
+                                                     (by the client's codec), `response.json()` by default
+        :rtype: int     seconds to cache the response for, 0 to not cache it or FOREVER
+        """
+        decode = decode if decode is not None else response.json
+
+        if self.NEVER.match(endpoint_url):
+            return 0
+
+        if self.VOLATILE.match(endpoint_url):
+            return self.short_ttl
+
+        if self.CONFIRMED_OBJECT.match(endpoint_url):
+            if decode().get('confirmations', 0) >= self.min_confirmations:
+                return FOREVER
+
+            return self.short_ttl
+
+        if self.BLOCK_TRANSACTIONS.match(endpoint_url):
+            txs = decode().get('data') or []
+            if txs and min(tx.get('confirmations', 0) for tx in txs) >= self.min_confirmations:
+                return FOREVER
+
+            return self.short_ttl
+
+        return self.default_ttl
+
+
+class LRUCache(object):
+    """
+    in memory cache, bounded by the amount of entries and the total size of the responses,
+     the least recently used entries are evicted first
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024):
+        """
+        :param int      max_entries:    the max amount of responses to keep
+        :param int      max_bytes:      the max total size of the response bodies to keep
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        :param str      key:
+        :rtype: requests.Response|None
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            response, size, expires = entry
+            if expires is not None and expires < time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            # mark as most recently used
+            del self.entries[key]
+            self.entries[key] = entry
+
+            self.hits += 1
+            return response
+
+    def set(self, key, response, ttl):
+        """
+        :param str                  key:
+        :param requests.Response    response:
+        :param int                  ttl:        seconds to keep the response or FOREVER
+        """
+        size = len(key) + len(response.content)
+        if size > self.max_bytes:
+            return
+
+        expires = None if ttl == FOREVER else time.time() + ttl
+
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+
+            self.entries[key] = (response, size, expires)
+            self.size += size
+
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.size -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        :rtype: dict
+        """
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class SQLiteCache(object):
+    """
+    persistent cache in an SQLite database, only responses that are cached FOREVER are stored
+
+    the database is opened in WAL mode so several processes on one host can share the same file,
+     the api_key is stripped from the urls that are stored
+    """
+
+    def __init__(self, path, timeout=30):
+        """
+        :param str      path:           the database file
+        :param int      timeout:        seconds to wait for another process to release its lock
+        """
+        self.path = path
+        self.timeout = timeout
+
+        # sqlite connections can't be shared between threads
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                   " key TEXT PRIMARY KEY,"
+                   " status INTEGER NOT NULL,"
+                   " reason TEXT,"
+                   " url TEXT,"
+                   " headers TEXT NOT NULL,"
+                   " content BLOB NOT NULL"
+                   ")")
+        db.commit()
+
+    def _db(self):
+        db = getattr(self.local, 'db', None)
+        if db is None:
+            db = self.local.db = sqlite3.connect(self.path, timeout=self.timeout)
+            db.execute("PRAGMA synchronous=NORMAL")
+
+        return db
+
+    def get(self, key):
+        """
+        :param str      key:
+        :rtype: requests.Response|None
+        """
+        row = self._db().execute("SELECT status, reason, url, headers, content FROM responses WHERE key = ?", (key, )).fetchone()
+
+        with self.lock:
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        response = requests.Response()
+        response.status_code, response.reason, response.url = row[0], row[1], row[2]
+        response.headers = CaseInsensitiveDict(json.loads(row[3]))
+        response._content = bytes(row[4])
+
+        return response
+
+    def set(self, key, response, ttl):
+        """
+        :param str                  key:
+        :param requests.Response    response:
+        :param int                  ttl:        only FOREVER responses are stored
+        """
+        if ttl != FOREVER:
+            return
+
+        db = self._db()
+        with db:
+            db.execute("INSERT OR REPLACE INTO responses (key, status, reason, url, headers, content) VALUES (?, ?, ?, ?, ?, ?)",
+                       (key, response.status_code, response.reason, strip_api_key(response.url),
+                        json.dumps(dict(response.headers)), sqlite3.Binary(response.content)))
+
+        with self.lock:
+            self.writes += 1
+
+    def clear(self):
+        db = self._db()
+        with db:
+            db.execute("DELETE FROM responses")
+
+    def close(self):
+        db = getattr(self.local, 'db', None)
+        if db is not None:
+            db.close()
+            self.local.db = None
+
+    def stats(self):
+        """
+        :rtype: dict
+        """
+        entries = self._db().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+        with self.lock:
+            return {
+                'entries': entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+            }
+
+
+class TieredCache(object):
+    """
+    an in memory cache in front of a persistent cache, responses found in the persistent cache are promoted to memory
+    """
+
+    def __init__(self, memory, persistent):
+        """
+        :param LRUCache     memory:
+        :param SQLiteCache  persistent:     a cache that only holds FOREVER responses
+        """
+        self.memory = memory
+        self.persistent = persistent
+
+    def get(self, key):
+        response = self.memory.get(key)
+        if response is not None:
+            return response
+
+        response = self.persistent.get(key)
+        if response is not None:
+            self.memory.set(key, response, FOREVER)
+
+        return response
+
+    def set(self, key, response, ttl):
+        self.memory.set(key, response, ttl)
+        self.persistent.set(key, response, ttl)
+
+    def clear(self):
+        self.memory.clear()
+        self.persistent.clear()
+
+    def stats(self):
+        return {
+            'memory': self.memory.stats(),
+            'persistent': self.persistent.stats(),
+        }
+
+
+def strip_api_key(url):
+    """
+    :param str      url:
+    :rtype: str     :url without the api_key in the query string
+    """
+    if not url:
+        return url
+
+    url = urlparse(url)
+    params = [(k, v) for k, v in parse_qsl(url.query, keep_blank_values=True) if k != 'api_key']
+
+    return urlunparse(url._replace(query=urlencode(params)))
@@ -0,0 +1,209 @@
+"""
+record and replay of API responses, see :RestClient(cassette=)
+
+    cassette = Cassette("responses.json.gz", mode=Cassette.RECORD)
+    with APIClient(API_KEY, API_SECRET, cassette=cassette) as client:
+        client.block_latest()
+
+requests are matched on method, path, query params (without the api_key) and body,
+ the Date and Authorization headers change on every request and are ignored
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+from six.moves.urllib.parse import urlparse, parse_qsl, urlencode
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from blocktrail.exceptions import CassetteMiss
+
+
+EXCEPTION_CASSETTE_MISS = "No recorded response for this request in the cassette."
+
+# response headers that only describe the original connection
+IGNORED_RESPONSE_HEADERS = frozenset(['date', 'server', 'connection', 'keep-alive', 'transfer-encoding',
+                                      'content-length', 'content-encoding', 'set-cookie'])
+
+replace = getattr(os, 'replace', os.rename)
+
+
+class Cassette(object):
+    """
+    a file with recorded responses, gzipped JSON
+    """
+
+    # only serve recorded responses, requests that weren't recorded raise CassetteMiss
+    REPLAY = 'replay'
+    # do all requests and record the responses
+    RECORD = 'record'
+    # serve recorded responses and do and record the requests that weren't recorded
+    AUTO = 'auto'
+
+    VERSION = 1
+
+    def __init__(self, path, mode=AUTO):
+        """
+        :param str      path:       the cassette file, it's created when it doesn't exist yet
+        :param str      mode:       REPLAY, RECORD or AUTO
+        """
+        if mode not in (self.REPLAY, self.RECORD, self.AUTO):
+            raise ValueError("unknown cassette mode %r" % (mode, ))
+
+        self.path = path
+        self.mode = mode
+
+        self.lock = threading.Lock()
+        self.interactions = {}
+        self.dirty = False
+
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        if os.path.exists(path):
+            self.load()
+
+    @classmethod
+    def request_key(cls, method, url, body=None):
+        """
+        :param str      method:     the HTTP method
+        :param str      url:        the full url, including the query string
+        :param bytes    body:       the request body
+        :rtype: str
+        """
+        url = urlparse(url)
+        params = sorted((k, v) for k, v in parse_qsl(url.query, keep_blank_values=True) if k != 'api_key')
+
+        key = "%s %s?%s" % (method.upper(), url.path, urlencode(params))
+
+        if body:
+            if not isinstance(body, bytes):
+                body = body.encode("utf-8")
+            key += " " + hashlib.md5(body).hexdigest()
+
+        return key
+
+    def play(self, key):
+        """
+        :rtype: dict|None   the recorded interaction
+        """
+        with self.lock:
+            interaction = self.interactions.get(key)
+            if interaction is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+            return interaction
+
+    def record(self, key, response):
+        """
+        :param str                  key:
+        :param requests.Response    response:
+        """
+        interaction = {
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': dict((name, value) for name, value in response.headers.items() if name.lower() not in IGNORED_RESPONSE_HEADERS),
+        }
+
+        try:
+            interaction['body'] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction['body_base64'] = base64.b64encode(response.content).decode("ascii")
+
+        with self.lock:
+            self.interactions[key] = interaction
+            self.recorded += 1
+            self.dirty = True
+
+    def load(self):
+        with gzip.open(self.path, 'rb') as f:
+            data = json.loads(f.read().decode("utf-8"))
+
+        with self.lock:
+            self.interactions = data['interactions']
+
+    def save(self):
+        """
+        write the cassette when anything was recorded, replacing the file at once so readers never see half of it
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+
+            content = json.dumps({'version': self.VERSION, 'interactions': self.interactions}, sort_keys=True).encode("utf-8")
+            self.dirty = False
+
+        tmp = "%s.%d.tmp" % (self.path, os.getpid())
+        with gzip.open(tmp, 'wb') as f:
+            f.write(content)
+        replace(tmp, self.path)
+
+    def stats(self):
+        """
+        :rtype: dict
+        """
+        with self.lock:
+            return {
+                'interactions': len(self.interactions),
+                'hits': self.hits,
+                'misses': self.misses,
+                'recorded': self.recorded,
+            }
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    requests transport adapter that serves responses from a Cassette and records through another adapter
+    """
+
+    def __init__(self, cassette, adapter):
+        """
+        :param Cassette     cassette:
+        :param BaseAdapter  adapter:    the adapter that does the real requests
+        """
+        super(CassetteAdapter, self).__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        key = Cassette.request_key(request.method, request.url, request.body)
+
+        if self.cassette.mode != Cassette.RECORD:
+            interaction = self.cassette.play(key)
+            if interaction is not None:
+                return self.build_response(request, interaction)
+
+            if self.cassette.mode == Cassette.REPLAY:
+                raise CassetteMiss("%s [%s]" % (EXCEPTION_CASSETTE_MISS, key))
+
+        response = self.adapter.send(request, **kwargs)
+        self.cassette.record(key, response)
+
+        return response
+
+    def build_response(self, request, interaction):
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.reason = interaction['reason']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+
+        if 'body_base64' in interaction:
+            response._content = base64.b64decode(interaction['body_base64'])
+        else:
+            response._content = interaction['body'].encode("utf-8")
+
+        return response
+
+    def close(self):
+        self.cassette.save()
+        self.adapter.close()
@@ -0,0 +1,263 @@
+"""
+follow the chain as new blocks are found, see :ChainFollower
+
+    follower = ChainFollower(client, checkpoint=(400000, "000000000000000004ec466ce4732fe6f1ed1cddc2ed4b328fff5224276e3f6f"))
+    for event in follower.follow(interval=30):
+        if event.type == ChainEvent.BLOCK:
+            for tx in event.transactions():
+                ...
+        else:
+            # the block was orphaned by a reorg, undo whatever was done for it
+            ...
+
+when nothing changed a poll is a single request for the latest block, new blocks are fetched by height concurrently
+ and linked to the known chain through their `prev_block`, a block that doesn't link to it is a reorg;
+ the chain is walked back by hash until it does and the orphaned blocks are rolled back before the new ones are added
+"""
+import binascii
+import time
+
+from blocktrail import batch
+from blocktrail.exceptions import ReorgTooDeep
+from blocktrail.models import field
+
+
+DEFAULT_INDEX_SIZE = 10000
+DEFAULT_MAX_REORG_DEPTH = 100
+DEFAULT_WINDOW = 100
+
+EXCEPTION_REORG_TOO_DEEP = "The chain was reorganized deeper than the known blocks, the follower has to be restarted."
+
+
+class BlockIndex(object):
+    """
+    the hashes of the most recent blocks by height, stored as 32 bytes per block
+    """
+
+    def __init__(self, max_blocks=DEFAULT_INDEX_SIZE):
+        """
+        :param int      max_blocks:     the amount of blocks to remember, older ones are forgotten
+        """
+        self.max_blocks = max_blocks
+        self.start = None
+        self.hashes = bytearray()
+
+    def __len__(self):
+        return len(self.hashes) // 32
+
+    @property
+    def tip(self):
+        """
+        :rtype: int|None    the height of the last block
+        """
+        return self.start + len(self) - 1 if self.start is not None else None
+
+    def get(self, height):
+        """
+        :rtype: str|None    the hash of the block at :height, if it's known
+        """
+        if self.start is None or not self.start <= height <= self.tip:
+            return None
+
+        offset = (height - self.start) * 32
+        return binascii.hexlify(bytes(self.hashes[offset:offset + 32])).decode("ascii")
+
+    def append(self, height, block_hash):
+        """
+        :param int      height:         must be the height after the tip
+        :param str      block_hash:
+        """
+        if self.start is None:
+            self.start = height
+        elif height != self.tip + 1:
+            raise ValueError("block %d doesn't follow the tip %d" % (height, self.tip))
+
+        self.hashes += binascii.unhexlify(block_hash)
+
+        if len(self) > self.max_blocks:
+            forget = len(self) - self.max_blocks
+            del self.hashes[:forget * 32]
+            self.start += forget
+
+    def snapshot(self):
+        """
+        :rtype: tuple   the state to :restore
+        """
+        return (self.start, bytearray(self.hashes))
+
+    def restore(self, snapshot):
+        self.start, self.hashes = snapshot[0], bytearray(snapshot[1])
+
+    def truncate(self, height):
+        """
+        forget the block at :height and all blocks after it
+        """
+        if self.start is None or height > self.tip:
+            return
+
+        if height <= self.start:
+            self.start = None
+            self.hashes = bytearray()
+        else:
+            del self.hashes[(height - self.start) * 32:]
+
+
+class ChainEvent(object):
+    """
+    a block that was added to the chain, or that was rolled back because it was orphaned
+    """
+
+    BLOCK = 'block'
+    ROLLBACK = 'rollback'
+
+    __slots__ = ('type', 'height', 'hash', 'block', 'client')
+
+    def __init__(self, type, height, hash, block=None, client=None):
+        self.type = type
+        self.height = height
+        self.hash = hash
+        self.block = block
+        self.client = client
+
+    def transactions(self, limit=200, prefetch=True, max_workers=1):
+        """
+        iterate over the transactions of the block, by hash so they can't be those of another block at the same height
+
+        :rtype: generator
+        """
+        return self.client.iter_block_transactions(self.hash, limit=limit, prefetch=prefetch, max_workers=max_workers)
+
+    def __repr__(self):
+        return "ChainEvent(%s, %d, %s)" % (self.type, self.height, self.hash)
+
+
+class ChainFollower(object):
+    def __init__(self, client, checkpoint=None, start_height=None, max_reorg_depth=DEFAULT_MAX_REORG_DEPTH,
+                 window=DEFAULT_WINDOW, max_workers=batch.DEFAULT_MAX_WORKERS, index_size=DEFAULT_INDEX_SIZE):
+        """
+        :param APIClient    client:
+        :param tuple        checkpoint:         (height, hash) of the last block that was handled, see :checkpoint
+        :param int          start_height:       without a checkpoint, the first block to emit, by default the latest block
+        :param int          max_reorg_depth:    the amount of blocks a reorg may roll back before ReorgTooDeep is raised
+        :param int          window:             the max amount of blocks to fetch concurrently when catching up
+        :param int          max_workers:        the amount of blocks to fetch concurrently
+        :param int          index_size:         the amount of block hashes to remember
+        """
+        self.client = client
+        self.start_height = start_height
+        self.max_reorg_depth = max_reorg_depth
+        self.window = window
+        self.max_workers = max_workers
+
+        self.index = BlockIndex(max(index_size, max_reorg_depth + 1))
+        if checkpoint is not None:
+            self.index.append(*checkpoint)
+
+    @property
+    def checkpoint(self):
+        """
+        :rtype: tuple|None  (height, hash) of the last block, to continue from after a restart
+        """
+        tip = self.index.tip
+        return (tip, self.index.get(tip)) if tip is not None else None
+
+    def poll(self):
+        """
+        fetch the blocks that were found since the last poll
+
+        when fetching a block fails the index is restored to what it was before the poll,
+         so the next poll (or a restart from the :checkpoint) emits the same blocks again
+
+        :rtype: list    ChainEvents, rollbacks (highest first) come before the blocks replacing them (lowest first)
+        """
+        latest = self.client.block_latest()
+        latest_height = field(latest, 'height')
+        events = []
+
+        tip = self.index.tip
+        if tip is not None and field(latest, 'hash') == self.index.get(latest_height):
+            # nothing new, or the API is behind on what we've already seen
+            return events
+
+        snapshot = self.index.snapshot()
+        try:
+            if tip is None:
+                start = self.start_height if self.start_height is not None else latest_height
+                self.catch_up(start, latest_height, events)
+            else:
+                self.catch_up(tip + 1, latest_height, events)
+
+            # the chain can be reorganized while catching up
+            if self.index.tip is None:
+                self.add(latest, events)
+            else:
+                self.connect(latest, events)
+        except Exception:
+            # none of the events are emitted, so none of the blocks are known yet
+            self.index.restore(snapshot)
+            raise
+
+        return events
+
+    def follow(self, interval=30):
+        """
+        poll for new blocks forever
+
+        :param float    interval:   seconds to wait between polls
+        :rtype: generator   ChainEvents
+        """
+        while True:
+            for event in self.poll():
+                yield event
+
+            time.sleep(interval)
+
+    def catch_up(self, start, end, events):
+        """
+        fetch and connect the blocks from :start up to (not including) :end, :window at a time
+        """
+        for window_start in range(start, end, self.window):
+            heights = list(range(window_start, min(window_start + self.window, end)))
+
+            for block in self.client.blocks(heights, max_workers=self.max_workers).values():
+                if isinstance(block, Exception):
+                    raise block
+
+                if self.index.tip is None:
+                    self.add(block, events)
+                else:
+                    self.connect(block, events)
+
+    def add(self, block, events):
+        block_hash = field(block, 'hash')
+        height = field(block, 'height')
+
+        self.index.append(height, block_hash)
+        events.append(ChainEvent(ChainEvent.BLOCK, height, block_hash, block, self.client))
+
+    def connect(self, block, events):
+        """
+        add :block when it links to the tip, otherwise roll back to where it does link
+        """
+        height = field(block, 'height')
+
+        if height == self.index.tip + 1 and field(block, 'prev_block') == self.index.get(height - 1):
+            self.add(block, events)
+            return
+
+        # walk back by hash until the branch links to a block we know
+        branch = [block]
+        while field(branch[-1], 'prev_block') != self.index.get(field(branch[-1], 'height') - 1):
+            fork = field(branch[-1], 'height') - 1
+            if fork < self.index.start or self.index.tip - fork >= self.max_reorg_depth:
+                raise ReorgTooDeep(EXCEPTION_REORG_TOO_DEEP)
+
+            branch.append(self.client.block(field(branch[-1], 'prev_block')))
+
+        fork = field(branch[-1], 'height') - 1
+        for height in range(self.index.tip, fork, -1):
+            events.append(ChainEvent(ChainEvent.ROLLBACK, height, self.index.get(height), client=self.client))
+        self.index.truncate(fork + 1)
+
+        for block in reversed(branch):
+            self.add(block, events)
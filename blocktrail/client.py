@@ -1,8 +1,14 @@
+from blocktrail import batch
 from blocktrail import connection
+from blocktrail import models
+from blocktrail import pagination
 
 
 class APIClient(object):
-    def __init__(self, api_key, api_secret, network='BTC', testnet=False, api_version='v1', api_endpoint=None, debug=False):
+    def __init__(self, api_key, api_secret, network='BTC', testnet=False, api_version='v1', api_endpoint=None, debug=False,
+                 pool_connections=connection.DEFAULT_POOL_CONNECTIONS, pool_maxsize=connection.DEFAULT_POOL_MAXSIZE,
+                 cache=None, cache_policy=None, coalesce=False, rate_limiter=None, retry_policy=None, fast_signing=True,
+                 json_codec=None, typed=False, cassette=None, hooks=None, validators=None, compress_min_size=None):
         """
         :param str      api_key:        the API_KEY to use for authentication
         :param str      api_secret:     the API_SECRET to use for authentication
@@ -12,13 +18,63 @@ class APIClient(object):
         :param str      api_endpoint:   overwrite the endpoint used
                                          this will cause the :network, :testnet and :api_version to be ignored!
         :param bool     debug:          print debug information when requests fail
-        """
+        :param int      pool_connections: the amount of hosts to keep a connection pool for
+        :param int      pool_maxsize:   the max amount of keep-alive connections to keep open per host
+        :param cache:                   cache for GET responses (eg; blocktrail.cache.LRUCache), disabled by default
+        :param blocktrail.cache.CachePolicy cache_policy: decides what to cache for how long
+        :param bool     coalesce:       let concurrent identical GETs (eg; from several threads) share a single request
+        :param rate_limiter:            throttle the requests (eg; blocktrail.ratelimit.AdaptiveRateLimiter),
+                                         share the same limiter between clients to throttle them together
+        :param blocktrail.retry.RetryPolicy retry_policy: retry failed requests, disabled by default
+        :param bool     fast_signing:   use the signing fast path, which produces the same signatures with less work
+        :param str      json_codec:     'auto' (default) for the fastest JSON library installed, 'orjson', 'ujson' or 'json'
+        :param bool     typed:          return blocks, transactions, addresses and webhooks as compact blocktrail.models objects
+                                         instead of dicts
+        :param blocktrail.cassette.Cassette cassette: record responses to / replay them from a cassette file
+        :param list     hooks:          instrumentation hooks (eg; blocktrail.metrics.Metrics), see blocktrail.metrics
+        :param validators:              store for responses that can be revalidated with a conditional GET (eg; blocktrail.cache.LRUCache),
+                                         unchanged responses then come back as an empty 304 and are served from the store
+        :param int      compress_min_size: gzip request bodies (eg; batch subscriptions) of at least this many bytes, disabled by default
+        """
+        self.typed = typed
 
         if api_endpoint is None:
             network = ("t" if testnet else "") + network.upper()
             api_endpoint = "https://api.blocktrail.com/%s/%s" % (api_version, network)
 
-        self.client = connection.RestClient(api_endpoint=api_endpoint, api_key=api_key, api_secret=api_secret, debug=debug)
+        self.client = connection.RestClient(api_endpoint=api_endpoint, api_key=api_key, api_secret=api_secret, debug=debug,
+                                            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                            cache=cache, cache_policy=cache_policy, coalesce=coalesce,
+                                            rate_limiter=rate_limiter, retry_policy=retry_policy, fast_signing=fast_signing,
+                                            json_codec=json_codec, cassette=cassette, hooks=hooks,
+                                            validators=validators, compress_min_size=compress_min_size)
+
+    def close(self):
+        """
+        close the connections held by this client
+        """
+        self.client.close()
+
+    def decode(self, response, model=None, page=False):
+        """
+        decode a response, into :model when the client is typed
+
+        :param requests.Response   response:
+        :param type     model:          the blocktrail.models.Model for the result
+        :param bool     page:           the response is a page of :model records
+        """
+        data = self.client.decode(response)
+
+        if self.typed and model is not None:
+            return models.parse(model, data, page=page)
+
+        return data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def address(self, address):
         """
@@ -29,7 +85,17 @@ class APIClient(object):
         """
         response = self.client.get("/address/%s" % (address, ))
 
-        return response.json()
+        return self.decode(response, models.Address)
+
+    def addresses(self, addresses, max_workers=batch.DEFAULT_MAX_WORKERS):
+        """
+        get many addresses concurrently
+
+        :param list     addresses:      the address hashes, duplicates are only fetched once
+        :param int      max_workers:    the amount of addresses to fetch concurrently (should be <= pool_maxsize)
+        :rtype: OrderedDict     the address for each hash in input order, or the exception that was raised fetching it
+        """
+        return batch.batch_lookup(self.address, addresses, max_workers=max_workers)
 
     def address_transactions(self, address, page=1, limit=20, sort_dir='asc'):
         """
@@ -44,7 +110,22 @@ class APIClient(object):
 
         response = self.client.get("/address/%s/transactions" % (address, ), params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
 
-        return response.json()
+        return self.decode(response, models.Transaction, page=True)
+
+    def iter_address_transactions(self, address, limit=200, sort_dir='asc', prefetch=True, max_workers=1, ordered=True):
+        """
+        iterate over all transactions for an address, the next page is fetched while the current one is consumed
+
+        :param str      address:        the address hash
+        :param int      limit:          the amount of transactions per page, can be between 1 and 200
+        :param str      sort_dir:       sorted ASC or DESC (on time)
+        :param bool     prefetch:       fetch the next page in the background
+        :param int      max_workers:    fetch this many pages concurrently, using the `total` of the first page
+        :param bool     ordered:        when fetching concurrently, keep the records in order or yield them as they arrive
+        :rtype: generator
+        """
+        return pagination.iter_records(lambda page: self.address_transactions(address, page=page, limit=limit, sort_dir=sort_dir),
+                                       limit, prefetch=prefetch, max_workers=max_workers, ordered=ordered)
 
     def address_unconfirmed_transactions(self, address, page=1, limit=20, sort_dir='asc'):
         """
@@ -58,7 +139,22 @@ class APIClient(object):
         """
         response = self.client.get("/address/%s/unconfirmed-transactions" % (address, ), params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
 
-        return response.json()
+        return self.decode(response, models.Transaction, page=True)
+
+    def iter_address_unconfirmed_transactions(self, address, limit=200, sort_dir='asc', prefetch=True, max_workers=1, ordered=True):
+        """
+        iterate over all unconfirmed transactions for an address, the next page is fetched while the current one is consumed
+
+        :param str      address:        the address hash
+        :param int      limit:          the amount of transactions per page, can be between 1 and 200
+        :param str      sort_dir:       sorted ASC or DESC (on time)
+        :param bool     prefetch:       fetch the next page in the background
+        :param int      max_workers:    fetch this many pages concurrently, using the `total` of the first page
+        :param bool     ordered:        when fetching concurrently, keep the records in order or yield them as they arrive
+        :rtype: generator
+        """
+        return pagination.iter_records(lambda page: self.address_unconfirmed_transactions(address, page=page, limit=limit, sort_dir=sort_dir),
+                                       limit, prefetch=prefetch, max_workers=max_workers, ordered=ordered)
 
     def address_unspent_outputs(self, address, page=1, limit=20, sort_dir='asc'):
         """
@@ -72,7 +168,22 @@ class APIClient(object):
         """
         response = self.client.get("/address/%s/unspent-outputs" % (address, ), params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
 
-        return response.json()
+        return self.client.decode(response)
+
+    def iter_address_unspent_outputs(self, address, limit=200, sort_dir='asc', prefetch=True, max_workers=1, ordered=True):
+        """
+        iterate over all unspent outputs for an address, the next page is fetched while the current one is consumed
+
+        :param str      address:        the address hash
+        :param int      limit:          the amount of outputs per page, can be between 1 and 200
+        :param str      sort_dir:       sorted ASC or DESC (on time)
+        :param bool     prefetch:       fetch the next page in the background
+        :param int      max_workers:    fetch this many pages concurrently, using the `total` of the first page
+        :param bool     ordered:        when fetching concurrently, keep the records in order or yield them as they arrive
+        :rtype: generator
+        """
+        return pagination.iter_records(lambda page: self.address_unspent_outputs(address, page=page, limit=limit, sort_dir=sort_dir),
+                                       limit, prefetch=prefetch, max_workers=max_workers, ordered=ordered)
 
     def verify_address(self, address, signature):
         """
@@ -82,9 +193,9 @@ class APIClient(object):
         :param str      signature:      signature generated with PK with message being the :address
         :rtype: dict
         """
-        response = self.client.post("/address/%s/verify" % (address, ), data={'signature': signature}, auth=True)
+        response = self.client.post("/address/%s/verify" % (address, ), data={'signature': signature}, auth=True, idempotent=True)
 
-        return response.json()
+        return self.client.decode(response)
 
     def all_blocks(self, page=1, limit=20, sort_dir='asc'):
         """
@@ -98,7 +209,21 @@ class APIClient(object):
 
         response = self.client.get("/all-blocks", params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
 
-        return response.json()
+        return self.decode(response, models.Block, page=True)
+
+    def iter_all_blocks(self, limit=200, sort_dir='asc', prefetch=True, max_workers=1, ordered=True):
+        """
+        iterate over all blocks, the next page is fetched while the current one is consumed
+
+        :param int      limit:           the amount of blocks per page, can be between 1 and 200
+        :param str      sort_dir:        sorted ASC or DESC (on time)
+        :param bool     prefetch:        fetch the next page in the background
+        :param int      max_workers:     fetch this many pages concurrently, using the `total` of the first page
+        :param bool     ordered:         when fetching concurrently, keep the records in order or yield them as they arrive
+        :rtype: generator
+        """
+        return pagination.iter_records(lambda page: self.all_blocks(page=page, limit=limit, sort_dir=sort_dir),
+                                       limit, prefetch=prefetch, max_workers=max_workers, ordered=ordered)
 
     def block_latest(self):
         """
@@ -108,7 +233,7 @@ class APIClient(object):
         """
         response = self.client.get("/block/latest")
 
-        return response.json()
+        return self.decode(response, models.Block)
 
     def block(self, block):
         """
@@ -120,7 +245,17 @@ class APIClient(object):
 
         response = self.client.get("/block/%s" % (block, ))
 
-        return response.json()
+        return self.decode(response, models.Block)
+
+    def blocks(self, blocks, max_workers=batch.DEFAULT_MAX_WORKERS):
+        """
+        get many blocks concurrently
+
+        :param list     blocks:          the block hashes or block heights, duplicates are only fetched once
+        :param int      max_workers:     the amount of blocks to fetch concurrently (should be <= pool_maxsize)
+        :rtype: OrderedDict     the block for each hash or height in input order, or the exception that was raised fetching it
+        """
+        return batch.batch_lookup(self.block, blocks, max_workers=max_workers)
 
     def block_transactions(self, block, page=1, limit=20, sort_dir='asc'):
         """
@@ -135,7 +270,22 @@ class APIClient(object):
 
         response = self.client.get("/block/%s/transactions" % (block, ), params={'page': page, 'limit': limit, 'sort_dir': sort_dir})
 
-        return response.json()
+        return self.decode(response, models.Transaction, page=True)
+
+    def iter_block_transactions(self, block, limit=200, sort_dir='asc', prefetch=True, max_workers=1, ordered=True):
+        """
+        iterate over all transactions for a block, the next page is fetched while the current one is consumed
+
+        :param str|int  block:           the block hash or block height
+        :param int      limit:           the amount of transactions per page, can be between 1 and 200
+        :param str      sort_dir:        sorted ASC or DESC (on time)
+        :param bool     prefetch:        fetch the next page in the background
+        :param int      max_workers:     fetch this many pages concurrently, using the `total` of the first page
+        :param bool     ordered:         when fetching concurrently, keep the records in order or yield them as they arrive
+        :rtype: generator
+        """
+        return pagination.iter_records(lambda page: self.block_transactions(block, page=page, limit=limit, sort_dir=sort_dir),
+                                       limit, prefetch=prefetch, max_workers=max_workers, ordered=ordered)
 
     def transaction(self, txhash):
         """
@@ -147,7 +297,17 @@ class APIClient(object):
 
         response = self.client.get("/transaction/%s" % (txhash, ))
 
-        return response.json()
+        return self.decode(response, models.Transaction)
+
+    def transactions(self, txhashes, max_workers=batch.DEFAULT_MAX_WORKERS):
+        """
+        get many transactions concurrently
+
+        :param list     txhashes:        the transaction hashes, duplicates are only fetched once
+        :param int      max_workers:     the amount of transactions to fetch concurrently (should be <= pool_maxsize)
+        :rtype: OrderedDict     the transaction for each hash in input order, or the exception that was raised fetching it
+        """
+        return batch.batch_lookup(self.transaction, txhashes, max_workers=max_workers)
 
     def all_webhooks(self, page=1, limit=20):
         """
@@ -160,7 +320,20 @@ class APIClient(object):
 
         response = self.client.get("/webhooks", params={'page': page, 'limit': limit})
 
-        return response.json()
+        return self.decode(response, models.Webhook, page=True)
+
+    def iter_all_webhooks(self, limit=200, prefetch=True, max_workers=1, ordered=True):
+        """
+        iterate over all webhooks, the next page is fetched while the current one is consumed
+
+        :param int      limit:           the amount of webhooks per page, can be between 1 and 200
+        :param bool     prefetch:        fetch the next page in the background
+        :param int      max_workers:     fetch this many pages concurrently, using the `total` of the first page
+        :param bool     ordered:         when fetching concurrently, keep the records in order or yield them as they arrive
+        :rtype: generator
+        """
+        return pagination.iter_records(lambda page: self.all_webhooks(page=page, limit=limit),
+                                       limit, prefetch=prefetch, max_workers=max_workers, ordered=ordered)
 
     def webhook(self, identifier):
         """
@@ -172,7 +345,7 @@ class APIClient(object):
 
         response = self.client.get("/webhook/%s" % (identifier, ))
 
-        return response.json()
+        return self.decode(response, models.Webhook)
 
     def setup_webhook(self, url, identifier=None):
         """
@@ -184,7 +357,7 @@ class APIClient(object):
         """
         response = self.client.post("/webhook", data={'url': url, 'identifier': identifier}, auth=True)
 
-        return response.json()
+        return self.decode(response, models.Webhook)
 
     def update_webhook(self, identifier, new_url=None, new_identifier=None):
         """
@@ -199,7 +372,7 @@ class APIClient(object):
                                    data={'url': new_url, 'identifier': new_identifier},
                                    auth=True)
 
-        return response.json()
+        return self.decode(response, models.Webhook)
 
     def delete_webhook(self, identifier):
         """
@@ -210,7 +383,7 @@ class APIClient(object):
         """
         response = self.client.delete("/webhook/%s" % (identifier, ), auth=True)
 
-        return response.json()
+        return self.client.decode(response)
 
     def webhook_events(self, identifier, page=1, limit=20):
         """
@@ -224,7 +397,21 @@ class APIClient(object):
 
         response = self.client.get("/webhook/%s/events" % (identifier, ), params={'page': page, 'limit': limit})
 
-        return response.json()
+        return self.client.decode(response)
+
+    def iter_webhook_events(self, identifier, limit=200, prefetch=True, max_workers=1, ordered=True):
+        """
+        iterate over all the events a webhook is subscribed to, the next page is fetched while the current one is consumed
+
+        :param str      identifier:     the webhook identifier
+        :param int      limit:          the amount of events per page, can be between 1 and 200
+        :param bool     prefetch:       fetch the next page in the background
+        :param int      max_workers:    fetch this many pages concurrently, using the `total` of the first page
+        :param bool     ordered:        when fetching concurrently, keep the records in order or yield them as they arrive
+        :rtype: generator
+        """
+        return pagination.iter_records(lambda page: self.webhook_events(identifier, page=page, limit=limit),
+                                       limit, prefetch=prefetch, max_workers=max_workers, ordered=ordered)
 
     def subscribe_address_transactions(self, identifier, address, confirmations=6):
         """
@@ -245,22 +432,22 @@ class APIClient(object):
             auth=True
         )
 
-        return response.json()
+        return self.client.decode(response)
 
     def batch_subscribe_address_transactions(self, identifier, batch_data):
         """
         batch subscribes a webhook to multiple transaction events
 
         :param str      identifier:     the webhook identifier
-        :param list     batch_data:
+        :param list     batch_data:     dicts with the `address` and optionally the `confirmations`
         :rtype: dict
         """
-        for record in batch_data:
-            record['event_type'] = 'address-transactions'
+        # copies, the records of the caller are left as they are
+        batch_data = [dict(record, event_type='address-transactions') for record in batch_data]
 
         response = self.client.post("/webhook/%s/events/batch" % (identifier, ), data=batch_data, auth=True)
 
-        return response.json()
+        return self.client.decode(response)
 
     def subscribe_new_blocks(self, identifier):
         """
@@ -277,7 +464,7 @@ class APIClient(object):
             auth=True
         )
 
-        return response.json()
+        return self.client.decode(response)
 
     def subscribe_transaction(self, identifier, transaction, confirmations=6):
         """
@@ -298,7 +485,7 @@ class APIClient(object):
             auth=True
         )
 
-        return response.json()
+        return self.client.decode(response)
 
     def unsubscribe_address_transactions(self, identifier, address):
         """
@@ -310,7 +497,7 @@ class APIClient(object):
         """
         response = self.client.delete("/webhook/%s/address-transactions/%s" % (identifier, address), auth=True)
 
-        return response.json()
+        return self.client.decode(response)
 
     def unsubscribe_new_blocks(self, identifier):
         """
@@ -321,7 +508,7 @@ class APIClient(object):
         """
         response = self.client.delete("/webhook/%s/block" % (identifier, ), auth=True)
 
-        return response.json()
+        return self.client.decode(response)
 
     def unsubscribe_transaction(self, identifier, transaction):
         """
@@ -333,7 +520,7 @@ class APIClient(object):
         """
         response = self.client.delete("/webhook/%s/transaction/%s" % (identifier, transaction), auth=True)
 
-        return response.json()
+        return self.client.decode(response)
 
     def price(self):
         """
@@ -344,7 +531,7 @@ class APIClient(object):
 
         response = self.client.get("/price")
 
-        return response.json()
+        return self.client.decode(response)
 
     def verify_message(self, message, address, signature):
         """
@@ -360,6 +547,6 @@ class APIClient(object):
             message=message,
             address=address,
             signature=signature
-        ))
+        ), idempotent=True)
 
-        return response.json()['result']
+        return self.client.decode(response)['result']
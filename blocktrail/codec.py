@@ -0,0 +1,87 @@
+"""
+JSON encoding and decoding of request and response bodies, see :RestClient(json_codec=)
+
+orjson or ujson are used when they're installed, they're a lot faster than the stdlib json for large pages
+"""
+import json
+
+import six
+
+
+class StdlibCodec(object):
+    name = 'json'
+
+    def dumps(self, data):
+        """
+        :rtype: bytes
+        """
+        return json.dumps(data).encode("utf-8")
+
+    def loads(self, content):
+        """
+        :param bytes    content:
+        """
+        return json.loads(content.decode("utf-8"))
+
+
+class UJSONCodec(object):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self.ujson = ujson
+
+    def dumps(self, data):
+        return self.ujson.dumps(data).encode("utf-8")
+
+    def loads(self, content):
+        return self.ujson.loads(content)
+
+
+class ORJSONCodec(object):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def dumps(self, data):
+        return self.orjson.dumps(data)
+
+    def loads(self, content):
+        return self.orjson.loads(content)
+
+
+CODECS = {
+    'orjson': ORJSONCodec,
+    'ujson': UJSONCodec,
+    'json': StdlibCodec,
+}
+
+AUTO_PREFERENCE = ['orjson', 'ujson', 'json']
+
+
+def get_codec(codec=None):
+    """
+    :param str|object   codec:      'auto' (or None) for the fastest one installed, 'orjson', 'ujson' or 'json',
+                                     or an object with `dumps` (returning bytes) and `loads` (taking bytes)
+    :rtype: object
+    :raises ValueError: for an unknown name or an object without `dumps` and `loads`
+    """
+    if codec is None or codec == 'auto':
+        for name in AUTO_PREFERENCE:
+            try:
+                return CODECS[name]()
+            except ImportError:
+                pass
+
+    if isinstance(codec, six.string_types):
+        if codec not in CODECS:
+            raise ValueError("unknown json_codec %r, expected 'auto', %s" % (codec, ", ".join(repr(name) for name in AUTO_PREFERENCE)))
+
+        return CODECS[codec]()
+
+    if not (callable(getattr(codec, 'dumps', None)) and callable(getattr(codec, 'loads', None))):
+        raise ValueError("json_codec %r should have dumps and loads" % (codec, ))
+
+    return codec
@@ -0,0 +1,95 @@
+"""
+bulk conversion between BTC and Satoshi, see :blocktrail.to_satoshi_many and :blocktrail.to_btc_many
+
+unlike :to_satoshi and :to_btc these are exact for any amount; floats are split in their whole and fractional part
+ so the multiplication by COIN never loses precision, strings and Decimals are converted with Decimal arithmetic
+ and Satoshi are formatted with integer arithmetic
+"""
+import math
+from decimal import Decimal, ROUND_HALF_EVEN
+
+from blocktrail import COIN
+
+DECIMAL_COIN = Decimal(COIN)
+
+
+def is_numpy_array(values):
+    # checked without importing numpy, which is slow to import
+    return type(values).__module__ == 'numpy' and hasattr(values, 'dtype')
+
+
+def exact_to_satoshi(btc):
+    """
+    :param float|str|Decimal|int btc:
+    :rtype: int
+    """
+    if isinstance(btc, float):
+        whole = math.floor(btc)
+        return int(whole) * COIN + int(round((btc - whole) * COIN))
+
+    return int((Decimal(btc) * DECIMAL_COIN).quantize(1, rounding=ROUND_HALF_EVEN))
+
+
+def to_satoshi_many(values):
+    """
+    convert BTC amounts to Satoshi
+
+    :param iterable values:     floats, strings, Decimals or a numpy array
+    :rtype: list|numpy.ndarray  list of ints, or an int64 array when :values is a numpy array
+    """
+    if is_numpy_array(values):
+        return numpy_to_satoshi(values)
+
+    result = []
+    append = result.append
+    floor = math.floor
+
+    for value in values:
+        # the common case inline, it's called millions of times
+        if type(value) is float:
+            whole = floor(value)
+            append(int(whole) * COIN + int(round((value - whole) * COIN)))
+        else:
+            append(exact_to_satoshi(value))
+
+    return result
+
+
+def numpy_to_satoshi(values):
+    import numpy
+
+    if values.dtype.kind == 'f':
+        whole = numpy.floor(values)
+        return whole.astype(numpy.int64) * COIN + numpy.rint((values - whole) * COIN).astype(numpy.int64)
+
+    if values.dtype.kind in 'iu':
+        return values.astype(numpy.int64) * COIN
+
+    return numpy.array(to_satoshi_many(values.tolist()), dtype=numpy.int64)
+
+
+def to_btc_many(values):
+    """
+    format Satoshi amounts as BTC, the same way :to_btc does
+
+    :param iterable values:     ints or a numpy array
+    :rtype: list    the amounts as strings
+    """
+    if is_numpy_array(values):
+        import numpy
+
+        values = numpy.asarray(values, dtype=numpy.int64)
+        whole, fraction = numpy.divmod(numpy.abs(values), COIN)
+
+        return ["%s%d.%08d" % ("-" if negative else "", w, f)
+                for negative, w, f in zip((values < 0).tolist(), whole.tolist(), fraction.tolist())]
+
+    result = []
+    append = result.append
+
+    for value in values:
+        value = int(value)
+        whole, fraction = divmod(-value if value < 0 else value, COIN)
+        append("%s%d.%08d" % ("-" if value < 0 else "", whole, fraction))
+
+    return result
@@ -0,0 +1,188 @@
+"""
+columnar export of transactions and unspent outputs, for analytics over many pages
+
+    columns = columnar.to_columns(client.iter_address_transactions(address))
+    arrays = columns.to_arrays()
+    arrays['fee'].sum()
+
+the records are appended to compact int64 arrays a chunk at a time, so no per-row dicts are kept around;
+ :to_arrays returns numpy arrays when numpy is installed, or else the `array.array`s
+"""
+import array
+import calendar
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+try:
+    array.array('q')
+    INT64 = 'q'
+except ValueError:
+    # python 2 has no 'q', 'l' is 64 bit on the platforms that matter
+    INT64 = 'l'
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def parse_time(value):
+    """
+    :param str      value:      a timestamp as the API formats them, eg; 2014-05-14T19:34:12+0000
+    :rtype: int     unix timestamp
+    """
+    timestamp = calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                                 int(value[11:13]), int(value[14:16]), int(value[17:19])))
+
+    offset = value[19:].replace(":", "")
+    if offset and offset not in ("Z", "+0000"):
+        sign = -1 if offset[0] == "-" else 1
+        timestamp -= sign * (int(offset[1:3]) * 3600 + int(offset[3:5]) * 60)
+
+    return timestamp
+
+
+class Column(object):
+    """
+    a column to extract from the records
+    """
+
+    def __init__(self, name, field, missing=0, parse=None):
+        """
+        :param str      name:           the name of the column
+        :param str      field:          the field of the record to take the values from
+        :param int      missing:        the value to use when the field is missing or null
+        :param callable parse:          convert the value to an int
+        """
+        self.name = name
+        self.field = field
+        self.missing = missing
+        self.parse = parse
+
+
+TRANSACTION_COLUMNS = (
+    Column('value', 'estimated_value'),
+    Column('fee', 'total_fee'),
+    # unconfirmed transactions have no block yet
+    Column('block_height', 'block_height', missing=-1),
+    Column('time', 'time', parse=parse_time),
+    Column('confirmations', 'confirmations'),
+)
+
+UTXO_COLUMNS = (
+    Column('value', 'value'),
+    Column('index', 'index'),
+    Column('block_height', 'block_height', missing=-1),
+    Column('time', 'time', parse=parse_time),
+    Column('confirmations', 'confirmations'),
+)
+
+
+class Columns(object):
+    """
+    int64 columns that records can be appended to
+    """
+
+    def __init__(self, columns=TRANSACTION_COLUMNS):
+        """
+        :param list     columns:        the Columns to extract, eg; TRANSACTION_COLUMNS or UTXO_COLUMNS
+        """
+        self.columns = columns
+        self.arrays = dict((column.name, array.array(INT64)) for column in columns)
+
+        # a page of transactions mostly shares a handful of timestamps
+        self.parsed = {}
+
+    def __len__(self):
+        return len(self.arrays[self.columns[0].name]) if self.columns else 0
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def extend(self, records):
+        """
+        append a list of records, dicts as returned by the API or blocktrail.models objects
+
+        :param list     records:
+        """
+        if not records:
+            return
+
+        is_dict = isinstance(records[0], dict)
+
+        for column in self.columns:
+            field = column.field
+            if is_dict:
+                column_values = [record.get(field) for record in records]
+            else:
+                column_values = [getattr(record, field, None) for record in records]
+
+            if column.parse is not None:
+                column_values = [self._parse(column, value) for value in column_values]
+
+            missing = column.missing
+            self.arrays[column.name].extend([missing if value is None else value for value in column_values])
+
+    def _parse(self, column, value):
+        if value is None:
+            return None
+
+        key = (column.name, value)
+        parsed = self.parsed.get(key)
+        if parsed is None:
+            if len(self.parsed) > 10000:
+                self.parsed.clear()
+
+            parsed = self.parsed[key] = column.parse(value)
+
+        return parsed
+
+    def to_arrays(self, copy=True):
+        """
+        :param bool     copy:           copy the columns, without copying the numpy arrays share the memory of the columns
+                                         and the columns can't be extended while the arrays are in use
+        :rtype: dict    numpy int64 arrays when numpy is installed, or else the array.arrays
+        """
+        if numpy is None:
+            return dict((name, array.array(INT64, values) if copy else values) for name, values in self.arrays.items())
+
+        arrays = {}
+        for name, values in self.arrays.items():
+            values = numpy.frombuffer(values, dtype=numpy.int64) if len(values) else numpy.zeros(0, dtype=numpy.int64)
+            arrays[name] = values.copy() if copy else values
+
+        return arrays
+
+
+def to_columns(records, columns=TRANSACTION_COLUMNS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    consume a stream of records (eg; APIClient.iter_block_transactions) into columns, a chunk at a time
+
+    :param iterable records:        the records, dicts as returned by the API or blocktrail.models objects
+    :param list     columns:        the Columns to extract, eg; TRANSACTION_COLUMNS or UTXO_COLUMNS
+    :param int      chunk_size:     the amount of records to convert at once
+    :rtype: Columns
+    """
+    result = Columns(columns)
+
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return result
+
+        result.extend(chunk)
+
+
+def to_arrays(records, columns=TRANSACTION_COLUMNS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    consume a stream of records into numpy arrays, or array.arrays when numpy isn't installed
+
+    :param iterable records:        the records, dicts as returned by the API or blocktrail.models objects
+    :param list     columns:        the Columns to extract, eg; TRANSACTION_COLUMNS or UTXO_COLUMNS
+    :param int      chunk_size:     the amount of records to convert at once
+    :rtype: dict    the array for each column name
+    """
+    return to_columns(records, columns=columns, chunk_size=chunk_size).to_arrays(copy=False)
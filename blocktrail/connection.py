@@ -1,17 +1,21 @@
 from __future__ import print_function
-from future.standard_library import install_aliases
-install_aliases()
 
 import datetime
-from urllib.parse import urlparse, urlencode
-import requests
-import json
+import threading
+import time
+import zlib
 import hashlib
-
-from httpsig.requests_auth import HTTPSignatureAuth
-from requests.models import RequestEncodingMixin
+import six
+from six.moves.urllib.parse import urlparse, urlencode
 
 import blocktrail
+from blocktrail.cache import CachePolicy, FOREVER
+from blocktrail.metrics import EndpointTemplates, RequestInfo, TimedAuth, UNKNOWN_ENDPOINT
+from blocktrail import signing
+from blocktrail.codec import get_codec
+from blocktrail.ratelimit import monotonic
+from blocktrail.signing import DateCache, HMACSignatureAuth, EMPTY_CONTENT_MD5
+from blocktrail.singleflight import SingleFlight
 from blocktrail.exceptions import *
 
 
@@ -22,18 +26,43 @@ EXCEPTION_EMPTY_RESPONSE = "The HTTP Response was empty."
 EXCEPTION_UNKNOWN_ENDPOINT_SPECIFIC_ERROR = "The endpoint returned an unknown error."
 EXCEPTION_MISSING_ENDPOINT = "The endpoint you've tried to access does not exist. Check your URL."
 EXCEPTION_OBJECT_NOT_FOUND = "The object you've tried to access does not exist."
+EXCEPTION_RATE_LIMITED = "You've exceeded the rate limit, slow down."
+
+
+SIGNED_HEADERS = ['(request-target)', 'Date', 'Content-MD5']
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+# marks a response that wasn't decoded yet by the cache policy
+UNDECODED = object()
+
 
+class BaseRestClient(object):
+    """
+    the transport independent parts of talking to the API; default headers and params, HMAC signing and error handling
+    """
 
-class RestClient(object):
-    def __init__(self, api_endpoint, api_key, api_secret, debug=False):
+    def __init__(self, api_endpoint, api_key, api_secret, debug=False, fast_signing=True, json_codec=None, hooks=None):
         """
-        :param str      api_endpoint:   the base url to use for all API requests
-        :param str      api_key:        the API_KEY to use for authentication
-        :param str      api_secret:     the API_SECRET to use for authentication
-        :param bool     debug:          print debug information when requests fail
+        :param str      api_endpoint:       the base url to use for all API requests
+        :param str      api_key:            the API_KEY to use for authentication
+        :param str      api_secret:         the API_SECRET to use for authentication
+        :param bool     debug:              print debug information when requests fail
+        :param bool     fast_signing:       use the signing fast path, which produces the same signatures as httpsig with less work
+        :param str      json_codec:         'auto' (default) for the fastest JSON library installed, 'orjson', 'ujson' or 'json'
+        :param list     hooks:              instrumentation hooks (eg; blocktrail.metrics.Metrics), see blocktrail.metrics
         """
         self.api_endpoint = api_endpoint
         self.debug = debug
+        self.fast_signing = fast_signing
+        self.codec = get_codec(json_codec)
+
+        self.hooks = list(hooks or [])
+        self.before_hooks = [hook.before_request for hook in self.hooks if hasattr(hook, 'before_request')]
+        self.after_hooks = [hook.after_request for hook in self.hooks if hasattr(hook, 'after_request')]
+        self.decode_hooks = [hook.after_decode for hook in self.hooks if hasattr(hook, 'after_decode')]
+        self.endpoint_templates = EndpointTemplates() if self.hooks else None
 
         # create a default User-Agent
         self.default_headers = {
@@ -46,101 +75,103 @@ class RestClient(object):
         }
 
         # prepare HTTP-Signature Auth signer
-        self.auth = HTTPSignatureAuth(key_id=api_key, secret=api_secret, algorithm='hmac-sha256',
-                                      headers=['(request-target)', 'Date', 'Content-MD5'])
+        if fast_signing:
+            self.auth = HMACSignatureAuth(key_id=api_key, secret=api_secret, headers=SIGNED_HEADERS)
+        else:
+            from httpsig.requests_auth import HTTPSignatureAuth
+            self.auth = HTTPSignatureAuth(key_id=api_key, secret=api_secret, algorithm='hmac-sha256', headers=SIGNED_HEADERS)
+
+        # for the fast path the headers that are the same for every request are prepared once,
+        #  for requests without and with a body
+        self.date_cache = DateCache()
+        self.header_templates = {
+            False: dict_merge(self.default_headers, {'Content-MD5': EMPTY_CONTENT_MD5}),
+            True: dict_merge(self.default_headers, {'Content-Type': 'application/json'}),
+        }
 
-    def get(self, endpoint_url, params=None, auth=None):
+    def prepare(self, method, endpoint_url, data=None, params=None):
         """
+        merge the default params and headers with the request specific ones, including a fresh Date and the Content-MD5
+
+        :param str      method:         the HTTP method
         :param str      endpoint_url:   the API endpoint to request
+        :param bytes    data:           the encoded body
         :param dict     params:         query string params to add
-        :param bool     auth:           do HMAC auth
-        :rtype: requests.Response
+        :rtype: (dict, dict)    the params and headers
         """
-        if auth is True:
-            auth = self.auth
-
-        headers = dict_merge(self.default_headers, {
-            'Date': RestClient.httpdate(datetime.datetime.utcnow()),
-            'Content-MD5': RestClient.content_md5("")
-        })
-
         params = dict_merge(self.default_params, params)
 
-        response = requests.get(self.api_endpoint + endpoint_url, params=params, headers=headers, auth=auth)
+        if self.fast_signing:
+            headers = self.header_templates[data is not None].copy()
+            headers['Date'] = self.date_cache.now()
 
-        return self.handle_response(response)
+            if method == 'DELETE':
+                headers['Content-MD5'] = BaseRestClient.content_md5(urlparse(self.api_endpoint + endpoint_url).path + "?" + urlencode(params))
+            elif data is not None:
+                headers['Content-MD5'] = BaseRestClient.content_md5(data)
 
-    def post(self, endpoint_url, data, params=None, auth=None):
-        """
-        :param str      endpoint_url:   the API endpoint to request
-        :param dict     data:           the POST body
-        :param bool     auth:           do HMAC auth
-        :rtype: requests.Response
-        """
-        if auth is True:
-            auth = self.auth
+            return params, headers
 
-        # do the post body encoding here since we need it to get the MD5
-        data = json.dumps(data)
+        if method == 'DELETE':
+            # DELETE bodies aren't reliably sent along, so the MD5 is of the path and query string instead
+            content_md5 = BaseRestClient.content_md5(urlparse(self.api_endpoint + endpoint_url).path + "?" + urlencode(params))
+        else:
+            content_md5 = BaseRestClient.content_md5(data if data is not None else "")
 
         headers = dict_merge(self.default_headers, {
-            'Date': RestClient.httpdate(datetime.datetime.utcnow()),
-            'Content-MD5': RestClient.content_md5(data),
-            'Content-Type': 'application/json'
+            'Date': BaseRestClient.httpdate(datetime.datetime.utcnow()),
+            'Content-MD5': content_md5
         })
 
-        params = dict_merge(self.default_params, params)
-        response = requests.post(self.api_endpoint + endpoint_url, data=data, params=params, headers=headers, auth=auth)
+        if data is not None:
+            headers['Content-Type'] = 'application/json'
 
-        return self.handle_response(response)
+        return params, headers
 
-    def put(self, endpoint_url, data, params=None, auth=None):
+    def sign(self, headers, method, path):
         """
-        :param str      endpoint_url:   the API endpoint to request
-        :param dict     data:           the POST body
-        :param bool     auth:           do HMAC auth
-        :rtype: requests.Response
-        """
-        if auth is True:
-            auth = self.auth
-
-        # do the post body encoding here since we need it to get the MD5
-        data = json.dumps(data)
+        add the Authorization header, for transports that don't use requests' auth hook
 
-        headers = dict_merge(self.default_headers, {
-            'Date': RestClient.httpdate(datetime.datetime.utcnow()),
-            'Content-MD5': RestClient.content_md5(data),
-            'Content-Type': 'application/json'
-        })
+        :param dict     headers:        the request headers
+        :param str      method:         the HTTP method
+        :param str      path:           the path, including the query string
+        :rtype: dict
+        """
+        if self.fast_signing:
+            return self.auth.sign(headers, method, path)
 
-        params = dict_merge(self.default_params, params)
-        response = requests.put(self.api_endpoint + endpoint_url, data=data, params=params, headers=headers, auth=auth)
+        return self.auth.header_signer.sign(headers, method=method, path=path)
 
-        return self.handle_response(response)
+    def encode(self, data):
+        """
+        encode a request body, the Content-MD5 is calculated over the exact bytes returned
 
-    def delete(self, endpoint_url, data=None, params=None, auth=None):
+        :rtype: bytes
         """
-        :param str      endpoint_url:   the API endpoint to request
-        :param dict     data:           the POST body
-        :param bool     auth:           do HMAC auth
-        :rtype: requests.Response
+        return self.codec.dumps(data)
+
+    def decode(self, response):
         """
-        if auth is True:
-            auth = self.auth
+        decode the JSON body of a response
 
-        data = json.dumps(data)
+        :param requests.Response   response:
+        """
+        data = response.__dict__.pop('_decoded', UNDECODED)
+        if data is not UNDECODED:
+            return data
 
-        params = dict_merge(self.default_params, params)
+        if not self.decode_hooks:
+            return self.codec.loads(response.content)
 
-        headers = dict_merge(self.default_headers, {
-            'Date': RestClient.httpdate(datetime.datetime.utcnow()),
-            'Content-MD5': RestClient.content_md5(urlparse(self.api_endpoint + endpoint_url).path + "?" + urlencode(params)),
-            'Content-Type': 'application/json'
-        })
+        start = monotonic()
+        data = self.codec.loads(response.content)
+        seconds = monotonic() - start
 
-        response = requests.delete(self.api_endpoint + endpoint_url, data=data, params=params, headers=headers, auth=auth)
+        endpoint = getattr(response, 'endpoint', UNKNOWN_ENDPOINT)
+        for hook in self.decode_hooks:
+            hook(endpoint, seconds)
 
-        return self.handle_response(response)
+        return data
 
     def handle_response(self, response):
         """
@@ -171,14 +202,51 @@ class RestClient(object):
                 raise MissingEndpoint(msg=EXCEPTION_MISSING_ENDPOINT, code=404)
             else:
                 raise ObjectNotFound(msg=EXCEPTION_OBJECT_NOT_FOUND, code=404)
+        elif response.status_code == 429:
+            raise RateLimited(msg=EXCEPTION_RATE_LIMITED, code=429, retry_after=BaseRestClient.retry_after(response))
         elif response.status_code == 500:
             raise GenericServerError(msg=EXCEPTION_GENERIC_SERVER_ERROR, code=response.status_code)
         else:
             raise GenericHTTPError(msg=EXCEPTION_GENERIC_HTTP_ERROR, code=response.status_code)
 
+    @classmethod
+    def retry_after(cls, response):
+        """
+        parse the Retry-After header, which is either an amount of seconds or an HTTP-date
+
+        :param requests.Response   response:
+        :rtype: float|None
+        """
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        from email.utils import parsedate_tz, mktime_tz
+
+        date = parsedate_tz(value)
+        if date is None:
+            return None
+
+        return max(0.0, mktime_tz(date) - time.time())
+
+    @classmethod
+    def cache_key(cls, endpoint_url, params=None):
+        if not params:
+            return endpoint_url
+
+        return endpoint_url + "?" + urlencode(sorted(params.items()))
+
     @classmethod
     def content_md5(cls, content=""):
-        return hashlib.md5(content.encode("utf-8")).hexdigest()
+        if isinstance(content, six.text_type):
+            content = content.encode("utf-8")
+
+        return hashlib.md5(content).hexdigest()
 
     @classmethod
     def httpdate(cls, dt):
@@ -187,10 +255,339 @@ class RestClient(object):
 
         The supplied date must be in UTC.
         """
-        weekday = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"][dt.weekday()]
-        month = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep",
-                 "Oct", "Nov", "Dec"][dt.month - 1]
-        return "%s, %02d %s %04d %02d:%02d:%02d GMT" % (weekday, dt.day, month, dt.year, dt.hour, dt.minute, dt.second)
+        return signing.httpdate(dt)
+
+
+class RestClient(BaseRestClient):
+    def __init__(self, api_endpoint, api_key, api_secret, debug=False,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 cache=None, cache_policy=None, coalesce=False, rate_limiter=None, retry_policy=None, fast_signing=True,
+                 json_codec=None, cassette=None, hooks=None, validators=None, compress_min_size=None):
+        """
+        :param str      api_endpoint:       the base url to use for all API requests
+        :param str      api_key:            the API_KEY to use for authentication
+        :param str      api_secret:         the API_SECRET to use for authentication
+        :param bool     debug:              print debug information when requests fail
+        :param int      pool_connections:   the amount of hosts to keep a connection pool for
+        :param int      pool_maxsize:       the max amount of keep-alive connections to keep open per host
+        :param cache:                       cache for GET responses (eg; blocktrail.cache.LRUCache), disabled by default
+        :param CachePolicy cache_policy:    decides what to cache for how long, defaults to CachePolicy()
+        :param bool     coalesce:           let concurrent identical GETs share a single request
+        :param rate_limiter:                throttle the requests (eg; blocktrail.ratelimit.TokenBucket), share it to throttle several clients together
+        :param RetryPolicy retry_policy:    retry failed requests (eg; blocktrail.retry.RetryPolicy), disabled by default
+        :param bool     fast_signing:       use the signing fast path, which produces the same signatures as httpsig with less work
+        :param str      json_codec:         'auto' (default) for the fastest JSON library installed, 'orjson', 'ujson' or 'json'
+        :param Cassette cassette:           record responses to / replay them from a blocktrail.cassette.Cassette
+        :param list     hooks:              instrumentation hooks (eg; blocktrail.metrics.Metrics), see blocktrail.metrics
+        :param validators:                  store for the last response with an ETag or Last-Modified per GET (eg; blocktrail.cache.LRUCache),
+                                             the response is revalidated with a conditional GET and reused when it's unchanged
+        :param int      compress_min_size:  gzip request bodies of at least this many bytes, disabled by default
+        """
+        super(RestClient, self).__init__(api_endpoint=api_endpoint, api_key=api_key, api_secret=api_secret, debug=debug,
+                                         fast_signing=fast_signing, json_codec=json_codec, hooks=hooks)
+
+        self.cache = cache
+        self.cache_policy = cache_policy if cache_policy is not None else CachePolicy()
+        self.single_flight = SingleFlight() if coalesce else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.validators = validators
+        self.compress_min_size = compress_min_size
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.cassette = cassette
+
+        # requests is only imported when the session is created for the first request,
+        #  so importing the SDK and creating a client stay cheap
+        self._session = None
+        self.session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """
+        a single session keeps connections alive between requests,
+         the underlying pool is thread safe so the session can be shared between threads
+
+        :rtype: requests.Session
+        """
+        if self._session is None:
+            with self.session_lock:
+                if self._session is None:
+                    self._session = self.create_session()
+
+        return self._session
+
+    def create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        if self.cassette is not None:
+            from blocktrail.cassette import CassetteAdapter
+            adapter = CassetteAdapter(self.cassette, adapter)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+    def get(self, endpoint_url, params=None, auth=None):
+        """
+        :param str      endpoint_url:   the API endpoint to request
+        :param dict     params:         query string params to add
+        :param bool     auth:           do HMAC auth
+        :rtype: requests.Response
+        """
+        # only anonymous GETs are cached and coalesced
+        if not auth and (self.cache is not None or self.single_flight is not None):
+            cache_key = RestClient.cache_key(self.api_endpoint + endpoint_url, params)
+
+            if self.cache is not None:
+                response = self.cache.get(cache_key)
+                if response is not None:
+                    if self.hooks:
+                        self.on_cache_hit(endpoint_url)
+                    return response
+
+            if self.single_flight is not None:
+                return self.single_flight.do(cache_key, lambda: self._get(endpoint_url, params, cache_key=cache_key))
+
+            return self._get(endpoint_url, params, cache_key=cache_key)
+
+        return self.request('GET', endpoint_url, params=params, auth=auth)
+
+    def on_cache_hit(self, endpoint_url):
+        info = RequestInfo('GET', endpoint_url, self.endpoint_templates.match(endpoint_url), cached=True)
+
+        for hook in self.before_hooks:
+            hook(info)
+        for hook in self.after_hooks:
+            hook(info)
+
+    def _get(self, endpoint_url, params=None, cache_key=None):
+        response = self.request('GET', endpoint_url, params=params)
+
+        if cache_key is not None and self.cache is not None:
+            decoded = []
+
+            def decode():
+                if not decoded:
+                    decoded.append(self.decode(response))
+                return decoded[0]
+
+            ttl = self.cache_policy.ttl(endpoint_url, response, decode=decode)
+            if decoded:
+                # handed to the first :decode of the response, later ones (eg; from the cache) decode it again
+                response._decoded = decoded[0]
+            if ttl:
+                self.cache.set(cache_key, response, ttl)
+
+        return response
+
+    def post(self, endpoint_url, data, params=None, auth=None, idempotent=False):
+        """
+        :param str      endpoint_url:   the API endpoint to request
+        :param dict     data:           the POST body
+        :param bool     auth:           do HMAC auth
+        :param bool     idempotent:     the POST can be retried safely
+        :rtype: requests.Response
+        """
+        # do the post body encoding here since we need it to get the MD5
+        data, headers = self.compress(self.encode(data))
+        return self.request('POST', endpoint_url, data=data, params=params, auth=auth, idempotent=idempotent, headers=headers)
+
+    def put(self, endpoint_url, data, params=None, auth=None, idempotent=False):
+        """
+        :param str      endpoint_url:   the API endpoint to request
+        :param dict     data:           the PUT body
+        :param bool     auth:           do HMAC auth
+        :param bool     idempotent:     the PUT can be retried safely
+        :rtype: requests.Response
+        """
+        # do the put body encoding here since we need it to get the MD5
+        data, headers = self.compress(self.encode(data))
+        return self.request('PUT', endpoint_url, data=data, params=params, auth=auth, idempotent=idempotent, headers=headers)
+
+    def delete(self, endpoint_url, data=None, params=None, auth=None):
+        """
+        :param str      endpoint_url:   the API endpoint to request
+        :param dict     data:           the DELETE body
+        :param bool     auth:           do HMAC auth
+        :rtype: requests.Response
+        """
+        return self.request('DELETE', endpoint_url, data=self.encode(data), params=params, auth=auth)
+
+    def compress(self, body):
+        """
+        gzip an encoded body when it's at least :compress_min_size bytes, the Content-MD5 is calculated over the gzipped bytes
+
+        :param bytes    body:
+        :rtype: (bytes, dict)   the body and the headers to send along
+        """
+        if self.compress_min_size is None or len(body) < self.compress_min_size:
+            return body, None
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush(), {'Content-Encoding': 'gzip'}
+
+    def request(self, method, endpoint_url, data=None, params=None, auth=None, idempotent=None, headers=None):
+        """
+        :param str      method:         the HTTP method
+        :param str      endpoint_url:   the API endpoint to request
+        :param bytes    data:           the encoded body
+        :param dict     params:         query string params to add
+        :param bool     auth:           do HMAC auth
+        :param bool     idempotent:     if the request can be retried safely, by default only GET and DELETE are
+        :param dict     headers:        headers to add, that aren't signed
+        :rtype: requests.Response
+        """
+        if auth is True:
+            auth = self.auth
+
+        if self.retry_policy is None:
+            return self.send(method, endpoint_url, data=data, params=params, auth=auth, headers=headers)
+
+        import requests
+
+        start = monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.retry_policy.on_attempt()
+
+            try:
+                # every attempt is prepared again, so it gets a fresh Date header and signature
+                return self.send(method, endpoint_url, data=data, params=params, auth=auth, attempt=attempt, headers=headers)
+            except (BlockTrailSDKException, requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                delay = self.retry_policy.retry_delay(method, attempt, monotonic() - start, e, idempotent=idempotent,
+                                                      connection_error=not isinstance(e, BlockTrailSDKException))
+                if delay is None:
+                    raise
+
+                time.sleep(delay)
+
+    def send(self, method, endpoint_url, data=None, params=None, auth=None, attempt=1, headers=None):
+        """
+        do a single attempt of a request
+
+        :rtype: requests.Response
+        """
+        if self.hooks:
+            return self.send_instrumented(method, endpoint_url, data=data, params=params, auth=auth, attempt=attempt, headers=headers)
+
+        return self._send(method, endpoint_url, data=data, params=params, auth=auth, headers=headers)
+
+    def _send(self, method, endpoint_url, data=None, params=None, auth=None, headers=None, info=None):
+        """
+        :param RequestInfo  info:   when given, the time spent signing and on the network, the status and the bytes are recorded on it
+        :rtype: requests.Response
+        """
+        validator_key = stored = None
+        if method == 'GET' and self.validators is not None:
+            validator_key = RestClient.cache_key(self.api_endpoint + endpoint_url, params)
+            stored = self.validators.get(validator_key)
+
+        if info is not None:
+            start = monotonic()
+
+        extra_headers = headers
+        params, headers = self.prepare(method, endpoint_url, data=data, params=params)
+        if extra_headers:
+            headers.update(extra_headers)
+        if stored is not None:
+            headers.update(RestClient.conditional_headers(stored))
+
+        if info is not None:
+            info.sign_seconds = monotonic() - start
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        if info is None:
+            response = self.session.request(method, self.api_endpoint + endpoint_url, data=data, params=params, headers=headers,
+                                            auth=auth)
+        else:
+            timed_auth = TimedAuth(auth) if auth is not None else None
+
+            start = monotonic()
+            response = self.session.request(method, self.api_endpoint + endpoint_url, data=data, params=params, headers=headers,
+                                            auth=timed_auth)
+            signing = timed_auth.seconds if timed_auth is not None else 0.0
+            info.network_seconds = monotonic() - start - signing
+            info.sign_seconds += signing
+
+            info.status = response.status_code
+            info.bytes_received = len(response.content)
+            response.endpoint = info.endpoint
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_response(response.status_code, RestClient.retry_after(response))
+
+        if validator_key is not None:
+            return self.revalidate(validator_key, stored, response)
+
+        return self.handle_response(response)
+
+    @classmethod
+    def conditional_headers(cls, stored):
+        """
+        :param requests.Response    stored:     the last response
+        :rtype: dict    the headers to only get the response when it changed
+        """
+        headers = {}
+        if 'ETag' in stored.headers:
+            headers['If-None-Match'] = stored.headers['ETag']
+        if 'Last-Modified' in stored.headers:
+            headers['If-Modified-Since'] = stored.headers['Last-Modified']
+
+        return headers
+
+    def revalidate(self, validator_key, stored, response):
+        """
+        reuse :stored when the API answered 304 Not Modified, otherwise remember :response when it can be revalidated later
+
+        :rtype: requests.Response
+        """
+        if response.status_code == 304 and stored is not None:
+            return stored
+
+        response = self.handle_response(response)
+        if 'ETag' in response.headers or 'Last-Modified' in response.headers:
+            self.validators.set(validator_key, response, FOREVER)
+
+        return response
+
+    def send_instrumented(self, method, endpoint_url, data=None, params=None, auth=None, attempt=1, headers=None):
+        """
+        :send, measuring the time spent signing and on the network and passing it to the hooks
+
+        :rtype: requests.Response
+        """
+        info = RequestInfo(method, endpoint_url, self.endpoint_templates.match(endpoint_url), attempt=attempt)
+        info.bytes_sent = len(data) if data else 0
+
+        for hook in self.before_hooks:
+            hook(info)
+
+        try:
+            return self._send(method, endpoint_url, data=data, params=params, auth=auth, headers=headers, info=info)
+        except Exception as e:
+            info.error = e
+            raise
+        finally:
+            info.seconds = monotonic() - info.start
+
+            for hook in self.after_hooks:
+                hook(info)
+
+    def close(self):
+        """
+        close all pooled connections
+        """
+        if self._session is not None:
+            self._session.close()
 
 
 def dict_merge(dict1, dict2):
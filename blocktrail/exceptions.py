@@ -45,3 +45,18 @@ class GenericHTTPError(BlockTrailSDKException):
 
 class GenericServerError(BlockTrailSDKException):
     pass
+
+
+class RateLimited(GenericHTTPError):
+
+    def __init__(self, msg, code=None, retry_after=None):
+        super(RateLimited, self).__init__(msg, code)
+        self.retry_after = retry_after
+
+
+class CassetteMiss(BlockTrailSDKException):
+    pass
+
+
+class ReorgTooDeep(BlockTrailSDKException):
+    pass
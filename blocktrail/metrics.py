@@ -0,0 +1,298 @@
+"""
+instrumentation of the requests a RestClient does, see :RestClient(hooks=)
+
+a hook is any object with one or more of these methods, they're called from the thread doing the request:
+ - before_request(info)             before every attempt of a request
+ - after_request(info)              after every attempt, including failed ones and responses served from the cache
+ - after_decode(endpoint, seconds)  after a response body was decoded
+
+:Metrics is a hook that keeps counters and latency histograms per endpoint template and exports them for Prometheus;
+ when no hooks are configured the client skips all of it
+"""
+import re
+import threading
+
+from blocktrail.ratelimit import monotonic
+
+
+ENDPOINT_TEMPLATES = [
+    "/address/{address}",
+    "/address/{address}/transactions",
+    "/address/{address}/unconfirmed-transactions",
+    "/address/{address}/unspent-outputs",
+    "/address/{address}/verify",
+    "/all-blocks",
+    "/block/latest",
+    "/block/{block}",
+    "/block/{block}/transactions",
+    "/transaction/{txhash}",
+    "/webhooks",
+    "/webhook",
+    "/webhook/{identifier}",
+    "/webhook/{identifier}/events",
+    "/webhook/{identifier}/events/batch",
+    "/webhook/{identifier}/block",
+    "/webhook/{identifier}/address-transactions/{address}",
+    "/webhook/{identifier}/transaction/{txhash}",
+    "/price",
+    "/verify_message",
+]
+
+UNKNOWN_ENDPOINT = "other"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def compile_template(template):
+    return re.compile("^" + re.sub(r"\\{[a-z]+\\}", "[^/]+", re.escape(template)) + "$")
+
+
+class EndpointTemplates(object):
+    """
+    maps endpoint urls to their template, so metrics aren't keyed by every address or transaction hash
+    """
+
+    def __init__(self, templates=None, max_cached=10000):
+        """
+        :param list     templates:      the templates, eg; /address/{address}/transactions
+        :param int      max_cached:     the amount of urls to remember the template of
+        """
+        templates = templates if templates is not None else ENDPOINT_TEMPLATES
+
+        # templates without placeholders are matched first, so /block/latest isn't taken for /block/{block}
+        self.templates = sorted(((compile_template(template), template) for template in templates),
+                                key=lambda item: "{" in item[1])
+        self.max_cached = max_cached
+        self.cached = {}
+
+    def match(self, endpoint_url):
+        """
+        :param str      endpoint_url:   eg; /address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/transactions
+        :rtype: str     the template, or UNKNOWN_ENDPOINT
+        """
+        template = self.cached.get(endpoint_url)
+        if template is not None:
+            return template
+
+        template = UNKNOWN_ENDPOINT
+        for regex, candidate in self.templates:
+            if regex.match(endpoint_url):
+                template = candidate
+                break
+
+        if len(self.cached) >= self.max_cached:
+            self.cached.clear()
+        self.cached[endpoint_url] = template
+
+        return template
+
+
+class RequestInfo(object):
+    """
+    what is known about an attempt of a request, passed to the hooks
+    """
+
+    __slots__ = ('method', 'endpoint_url', 'endpoint', 'attempt', 'cached', 'status', 'error',
+                 'bytes_sent', 'bytes_received', 'sign_seconds', 'network_seconds', 'seconds', 'start')
+
+    def __init__(self, method, endpoint_url, endpoint, attempt=1, cached=False):
+        self.method = method
+        self.endpoint_url = endpoint_url
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.cached = cached
+        self.status = None
+        self.error = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.sign_seconds = 0.0
+        self.network_seconds = 0.0
+        self.seconds = 0.0
+        self.start = monotonic()
+
+
+class TimedAuth(object):
+    """
+    wraps a requests auth hook to measure the time spent signing
+    """
+
+    def __init__(self, auth):
+        self.auth = auth
+        self.seconds = 0.0
+
+    def __call__(self, r):
+        start = monotonic()
+        r = self.auth(r)
+        self.seconds += monotonic() - start
+
+        return r
+
+
+class Histogram(object):
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class Metrics(object):
+    """
+    counters and latency histograms of the requests, per endpoint template
+    """
+
+    COUNTERS = {
+        'requests_total': "Requests done, per attempt, by status code",
+        'request_errors_total': "Attempts that failed without a response",
+        'retries_total': "Attempts that were retries",
+        'cache_hits_total': "Requests served from the cache",
+        'bytes_sent_total': "Request body bytes sent",
+        'bytes_received_total': "Response body bytes received",
+    }
+
+    HISTOGRAMS = {
+        'request_duration_seconds': "Time per attempt, from preparing the request to receiving the response",
+        'sign_duration_seconds': "Time spent preparing and signing requests",
+        'network_duration_seconds': "Time spent sending requests and receiving responses",
+        'decode_duration_seconds': "Time spent decoding response bodies",
+    }
+
+    def __init__(self, namespace="blocktrail", buckets=DEFAULT_BUCKETS):
+        """
+        :param str      namespace:      prefix of the exported metric names
+        :param tuple    buckets:        upper bounds of the latency histogram buckets, in seconds
+        """
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.in_flight = 0
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+
+        histogram.observe(value)
+
+    def before_request(self, info):
+        with self.lock:
+            self.in_flight += 1
+
+    def after_request(self, info):
+        endpoint = (('endpoint', info.endpoint), )
+
+        with self.lock:
+            self.in_flight -= 1
+
+            if info.cached:
+                self.inc('cache_hits_total', endpoint)
+                return
+
+            if info.status is not None:
+                # the API answered, even when it was with an error
+                self.inc('requests_total', (('endpoint', info.endpoint), ('method', info.method), ('status', str(info.status))))
+            else:
+                self.inc('request_errors_total', (('endpoint', info.endpoint), ('method', info.method),
+                                                  ('error', info.error.__class__.__name__)))
+
+            if info.attempt > 1:
+                self.inc('retries_total', endpoint)
+
+            if info.bytes_sent:
+                self.inc('bytes_sent_total', endpoint, info.bytes_sent)
+            self.inc('bytes_received_total', endpoint, info.bytes_received)
+
+            self.observe('request_duration_seconds', endpoint, info.seconds)
+            self.observe('sign_duration_seconds', endpoint, info.sign_seconds)
+            self.observe('network_duration_seconds', endpoint, info.network_seconds)
+
+    def after_decode(self, endpoint, seconds):
+        with self.lock:
+            self.observe('decode_duration_seconds', (('endpoint', endpoint), ), seconds)
+
+    def snapshot(self):
+        """
+        :rtype: dict    the counters and histograms, keyed by name and then by label values
+        """
+        with self.lock:
+            result = {'in_flight': self.in_flight}
+
+            for (name, labels), value in self.counters.items():
+                result.setdefault(name, {})[tuple(value for _, value in labels)] = value
+
+            for (name, labels), histogram in self.histograms.items():
+                result.setdefault(name, {})[tuple(value for _, value in labels)] = {
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                }
+
+            return result
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_prometheus(self):
+        """
+        :rtype: str     the metrics in the Prometheus text exposition format
+        """
+        lines = []
+
+        with self.lock:
+            name = "%s_requests_in_flight" % self.namespace
+            lines.append("# HELP %s Requests currently being done" % name)
+            lines.append("# TYPE %s gauge" % name)
+            lines.append("%s %d" % (name, self.in_flight))
+
+            for metric in sorted(self.COUNTERS):
+                name = "%s_%s" % (self.namespace, metric)
+                lines.append("# HELP %s %s" % (name, self.COUNTERS[metric]))
+                lines.append("# TYPE %s counter" % name)
+
+                for (key, labels), value in sorted(self.counters.items()):
+                    if key == metric:
+                        lines.append("%s%s %s" % (name, format_labels(labels), value))
+
+            for metric in sorted(self.HISTOGRAMS):
+                name = "%s_%s" % (self.namespace, metric)
+                lines.append("# HELP %s %s" % (name, self.HISTOGRAMS[metric]))
+                lines.append("# TYPE %s histogram" % name)
+
+                for (key, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                    if key != metric:
+                        continue
+
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append("%s_bucket%s %d" % (name, format_labels(labels + (('le', repr(bound)), )), cumulative))
+                    lines.append("%s_bucket%s %d" % (name, format_labels(labels + (('le', "+Inf"), )), histogram.count))
+                    lines.append("%s_sum%s %r" % (name, format_labels(labels), histogram.sum))
+                    lines.append("%s_count%s %d" % (name, format_labels(labels), histogram.count))
+
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+
+    return "{%s}" % ",".join('%s="%s"' % (name, value.replace("\\", "\\\\").replace('"', '\\"')) for name, value in labels)
@@ -0,0 +1,185 @@
+"""
+compact typed results, see :APIClient(typed=True)
+
+the models use __slots__ instead of a __dict__ so they're a lot smaller than the dicts the API responses decode to,
+ the inputs and outputs of a transaction are only parsed into models when they're accessed
+
+values in satoshi are always ints, anything the models don't know about is kept and can be found in :raw
+"""
+
+
+class Model(object):
+    """
+    base for the models, subclasses list their attributes in FIELDS, and the slots they're stored in as __slots__
+    """
+
+    __slots__ = ('_missing', '_extra')
+
+    FIELDS = ()
+    SATOSHI_FIELDS = ()
+    # fields that are stored in another slot than their name
+    STORAGE = {}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        :param dict     data:       a record as returned by the API
+        :rtype: Model
+        """
+        self = cls.__new__(cls)
+
+        missing = None
+        for field in cls.FIELDS:
+            value = data.get(field)
+            if value is None and field not in data:
+                missing = (missing or ()) + (field, )
+            elif value is not None and field in cls.SATOSHI_FIELDS:
+                value = int(value)
+
+            setattr(self, field, value)
+
+        self._missing = missing or ()
+
+        if len(data) + len(self._missing) > len(cls.FIELDS):
+            self._extra = dict((k, v) for k, v in data.items() if k not in cls.FIELDS)
+        else:
+            self._extra = None
+
+        return self
+
+    @property
+    def raw(self):
+        """
+        the record as a dict like the API returned it, with the satoshi values as ints
+
+        :rtype: dict
+        """
+        raw = dict(self._extra) if self._extra else {}
+        for field in self.FIELDS:
+            if field not in self._missing:
+                raw[field] = getattr(self, self.STORAGE.get(field, field))
+
+        return raw
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.raw == other.raw
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, ", ".join("%s=%r" % (field, getattr(self, field)) for field in self.FIELDS[:2]))
+
+
+class TxInput(Model):
+    FIELDS = ('index', 'output_hash', 'output_index', 'value', 'address', 'type', 'multisig', 'script_signature')
+    SATOSHI_FIELDS = ('value', )
+
+    __slots__ = FIELDS
+
+
+class TxOutput(Model):
+    FIELDS = ('index', 'value', 'address', 'type', 'multisig', 'script', 'script_hex', 'spent_hash', 'spent_index')
+    SATOSHI_FIELDS = ('value', )
+
+    __slots__ = FIELDS
+
+
+class Transaction(Model):
+    FIELDS = ('hash', 'time', 'confirmations', 'block_height', 'block_hash', 'is_coinbase',
+              'estimated_value', 'total_input_value', 'total_output_value', 'total_fee',
+              'estimated_change', 'estimated_change_address', 'inputs', 'outputs')
+    SATOSHI_FIELDS = ('estimated_value', 'total_input_value', 'total_output_value', 'total_fee', 'estimated_change')
+
+    # inputs and outputs are stored as the raw list of dicts until they're accessed
+    STORAGE = {'inputs': '_inputs', 'outputs': '_outputs'}
+
+    __slots__ = ('hash', 'time', 'confirmations', 'block_height', 'block_hash', 'is_coinbase',
+                 'estimated_value', 'total_input_value', 'total_output_value', 'total_fee',
+                 'estimated_change', 'estimated_change_address', '_inputs', '_outputs')
+
+    @property
+    def inputs(self):
+        """
+        :rtype: list[TxInput]
+        """
+        if self._inputs and not isinstance(self._inputs[0], TxInput):
+            self._inputs = [TxInput.from_dict(txin) for txin in self._inputs]
+
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, inputs):
+        self._inputs = inputs
+
+    @property
+    def outputs(self):
+        """
+        :rtype: list[TxOutput]
+        """
+        if self._outputs and not isinstance(self._outputs[0], TxOutput):
+            self._outputs = [TxOutput.from_dict(txout) for txout in self._outputs]
+
+        return self._outputs
+
+    @outputs.setter
+    def outputs(self, outputs):
+        self._outputs = outputs
+
+    @property
+    def raw(self):
+        raw = super(Transaction, self).raw
+        for field in ('inputs', 'outputs'):
+            if raw.get(field):
+                raw[field] = [item.raw if isinstance(item, Model) else item for item in raw[field]]
+
+        return raw
+
+
+class Block(Model):
+    FIELDS = ('hash', 'height', 'block_time', 'difficulty', 'merkleroot', 'is_orphan', 'prev_block', 'next_block',
+              'byte_size', 'confirmations', 'transactions', 'value', 'miningpool_name', 'miningpool_url', 'miningpool_slug')
+    SATOSHI_FIELDS = ('value', )
+
+    __slots__ = FIELDS
+
+
+class Address(Model):
+    FIELDS = ('address', 'hash160', 'balance', 'received', 'sent', 'transactions', 'utxos',
+              'unconfirmed_received', 'unconfirmed_sent', 'unconfirmed_transactions', 'unconfirmed_utxos',
+              'total_transactions_in', 'total_transactions_out', 'category', 'tag')
+    SATOSHI_FIELDS = ('balance', 'received', 'sent', 'unconfirmed_received', 'unconfirmed_sent')
+
+    __slots__ = FIELDS
+
+
+class Webhook(Model):
+    FIELDS = ('url', 'identifier')
+
+    __slots__ = FIELDS
+
+
+def field(record, name):
+    """
+    :param dict|Model   record:     a record, as a dict or as a model when the client is typed
+    :param str          name:
+    """
+    return record[name] if isinstance(record, dict) else getattr(record, name)
+
+
+def parse(model, data, page=False):
+    """
+    :param type     model:      the Model subclass to parse into
+    :param dict     data:       the decoded response
+    :param bool     page:       :data is a page, parse the records in its `data`
+    :rtype: Model|dict  the model, or a page with its `data` parsed
+    """
+    if not page:
+        return model.from_dict(data)
+
+    data = dict(data)
+    data['data'] = [model.from_dict(record) for record in data.get('data') or []]
+
+    return data
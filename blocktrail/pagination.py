@@ -0,0 +1,146 @@
+"""
+helpers to walk the paginated endpoints
+"""
+from collections import deque
+
+
+def is_last_page(result, page, limit):
+    """
+    :param dict     result:         the decoded page
+    :param int      page:           the page number of :result
+    :param int      limit:          the page size that was requested
+    :rtype: bool
+    """
+    data = result.get('data') or []
+
+    if len(data) < limit:
+        return True
+
+    if result.get('total') is not None and page * limit >= result['total']:
+        return True
+
+    return False
+
+
+def iter_pages(fetch_page, limit, start_page=1, prefetch=True):
+    """
+    yield all pages, starting at :start_page, while the next page is already being fetched in the background
+
+    at most 2 pages are held at any time; the one being consumed and the one being fetched
+
+    :param callable fetch_page:     function taking the page number and returning the decoded page
+    :param int      limit:          the page size that :fetch_page requests
+    :param int      start_page:     the page to start at
+    :param bool     prefetch:       fetch the next page while the current one is being consumed
+    :rtype: generator
+    """
+    if not prefetch:
+        page = start_page
+        while True:
+            result = fetch_page(page)
+            yield result
+
+            if is_last_page(result, page, limit):
+                return
+            page += 1
+
+    # imported here, it's slow to import and not needed by every user of the SDK
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        page = start_page
+        future = executor.submit(fetch_page, page)
+        while True:
+            result = future.result()
+            last = is_last_page(result, page, limit)
+
+            if not last:
+                future = executor.submit(fetch_page, page + 1)
+
+            yield result
+
+            if last:
+                return
+            page += 1
+    finally:
+        # when the consumer stops early the pending prefetch is left to finish on its own
+        executor.shutdown(wait=False)
+
+
+def fan_out_pages(fetch_page, limit, max_workers=8, ordered=True):
+    """
+    fetch page 1 and use its `total` to fetch all remaining pages concurrently,
+     when page 1 has no `total` the remaining pages are fetched sequentially, see :iter_pages
+
+    the amount of pages being fetched or waiting to be consumed is bounded to twice :max_workers,
+    since the `total` is taken from page 1 any records added while fetching can cause records to be skipped or repeated
+
+    :param callable fetch_page:     function taking the page number and returning the decoded page
+    :param int      limit:          the page size that :fetch_page requests
+    :param int      max_workers:    the amount of pages to fetch concurrently
+    :param bool     ordered:        yield the pages in order, otherwise they're yielded as soon as they arrive
+    :rtype: generator
+    """
+    first = fetch_page(1)
+    yield first
+
+    if is_last_page(first, 1, limit):
+        return
+
+    if first.get('total') is None:
+        # without a `total` the amount of pages isn't known, walk them one after another instead
+        for result in iter_pages(fetch_page, limit, start_page=2, prefetch=True):
+            yield result
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    pages = iter(range(2, (first['total'] + limit - 1) // limit + 1))
+    window = max_workers * 2
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    try:
+        for page in pages:
+            pending.append(executor.submit(fetch_page, page))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done = wait(pending, return_when=FIRST_COMPLETED).done
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                result = future.result()
+
+                for page in pages:
+                    pending.append(executor.submit(fetch_page, page))
+                    break
+
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_records(fetch_page, limit, start_page=1, prefetch=True, max_workers=1, ordered=True):
+    """
+    yield all records of all pages, see :iter_pages
+    when :max_workers is > 1 the pages are fetched concurrently, see :fan_out_pages
+
+    :rtype: generator
+    """
+    if max_workers > 1:
+        results = fan_out_pages(fetch_page, limit, max_workers=max_workers, ordered=ordered)
+    else:
+        results = iter_pages(fetch_page, limit, start_page=start_page, prefetch=prefetch)
+
+    for result in results:
+        for record in result.get('data') or []:
+            yield record
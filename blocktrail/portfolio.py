@@ -0,0 +1,244 @@
+"""
+balances of many addresses, kept up to date with as few requests as possible
+
+    portfolio = Portfolio(client, addresses)
+    portfolio.refresh()                     # fetches all addresses, concurrently
+    print(portfolio.totals())
+
+    # later; only the addresses the hints point at are fetched again
+    portfolio.on_webhook_event(event)       # from blocktrail.webhook_receiver, or the decoded webhook payload
+    portfolio.on_block(chain_event)         # from blocktrail.chain.ChainFollower
+    portfolio.refresh()
+
+the summary of `address()` has the confirmed balance and the unconfirmed received and sent, so it's a single request per address;
+ an address only changes when a transaction touches it (a webhook event or a transaction in a new block)
+ or when its unconfirmed transactions are confirmed (any new block)
+"""
+import threading
+
+from blocktrail import batch
+from blocktrail.chain import ChainEvent
+from blocktrail.exceptions import ObjectNotFound
+from blocktrail.models import field
+from blocktrail.ratelimit import monotonic
+
+
+class AddressBalance(object):
+    """
+    the balance of an address in satoshi
+    """
+
+    __slots__ = ('address', 'balance', 'unconfirmed', 'unconfirmed_transactions', 'updated')
+
+    def __init__(self, address, balance=0, unconfirmed=0, unconfirmed_transactions=0, updated=None):
+        """
+        :param str      address:
+        :param int      balance:                    the confirmed balance
+        :param int      unconfirmed:                unconfirmed received minus unconfirmed sent
+        :param int      unconfirmed_transactions:
+        :param float    updated:                    monotonic() time of the last refresh
+        """
+        self.address = address
+        self.balance = balance
+        self.unconfirmed = unconfirmed
+        self.unconfirmed_transactions = unconfirmed_transactions
+        self.updated = updated
+
+    @classmethod
+    def from_summary(cls, address, summary, updated):
+        """
+        :param str          address:
+        :param dict|Model   summary:    the result of `address()`
+        :param float        updated:
+        """
+        return cls(address,
+                   balance=int(field(summary, 'balance') or 0),
+                   unconfirmed=int(field(summary, 'unconfirmed_received') or 0) - int(field(summary, 'unconfirmed_sent') or 0),
+                   unconfirmed_transactions=int(field(summary, 'unconfirmed_transactions') or 0),
+                   updated=updated)
+
+    def __repr__(self):
+        return "AddressBalance(%s, %d, %d)" % (self.address, self.balance, self.unconfirmed)
+
+
+class Portfolio(object):
+    def __init__(self, client, addresses=(), max_workers=batch.DEFAULT_MAX_WORKERS, stale_after=None):
+        """
+        :param APIClient    client:
+        :param iterable     addresses:      the addresses to track
+        :param int          max_workers:    the amount of addresses to fetch concurrently (should be <= pool_maxsize)
+        :param float        stale_after:    seconds after which an address is fetched again without a hint, never by default
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.stale_after = stale_after
+
+        self.lock = threading.Lock()
+        self.balances = {}
+        self.dirty = set()
+        self.balance = 0
+        self.unconfirmed = 0
+
+        self.add(addresses)
+
+    def __len__(self):
+        return len(self.balances)
+
+    def __contains__(self, address):
+        return address in self.balances
+
+    def get(self, address):
+        """
+        :rtype: AddressBalance|None
+        """
+        return self.balances.get(address)
+
+    def add(self, addresses):
+        """
+        track :addresses, they're fetched with the next refresh
+        """
+        with self.lock:
+            for address in addresses:
+                if address not in self.balances:
+                    self.balances[address] = AddressBalance(address)
+                    self.dirty.add(address)
+
+    def remove(self, addresses):
+        with self.lock:
+            for address in addresses:
+                state = self.balances.pop(address, None)
+                if state is not None:
+                    self.balance -= state.balance
+                    self.unconfirmed -= state.unconfirmed
+                self.dirty.discard(address)
+
+    def mark_dirty(self, addresses):
+        """
+        fetch :addresses again with the next refresh, addresses that aren't tracked are ignored
+
+        :rtype: int     the amount of tracked addresses that were marked
+        """
+        marked = 0
+        with self.lock:
+            for address in addresses:
+                if address in self.balances:
+                    self.dirty.add(address)
+                    marked += 1
+
+        return marked
+
+    def on_webhook_event(self, event):
+        """
+        hint from an address-transactions webhook event, the addresses of the transaction are fetched again
+
+        :param WebhookEvent|dict    event:  a blocktrail.webhook_receiver.WebhookEvent or the decoded payload
+        :rtype: int     the amount of tracked addresses that were marked
+        """
+        addresses = event.addresses if hasattr(event, 'addresses') else event.get('addresses')
+        if addresses:
+            return self.mark_dirty(addresses)
+
+        data = event.data if hasattr(event, 'data') else event.get('data')
+        return self.mark_dirty(transaction_addresses(data)) if data else 0
+
+    def on_block(self, event, transactions=None):
+        """
+        hint from a new block; the addresses with unconfirmed transactions are fetched again,
+         and the addresses :transactions touch (eg; `event.transactions()` of a ChainEvent)
+
+        a rolled back block can change any address, so all addresses are fetched again
+
+        :param ChainEvent|dict  event:          a blocktrail.chain.ChainEvent or a block
+        :param iterable         transactions:   the transactions of the block
+        :rtype: int     the amount of tracked addresses that were marked
+        """
+        if getattr(event, 'type', None) == ChainEvent.ROLLBACK:
+            return self.mark_dirty(list(self.balances))
+
+        marked = self.mark_dirty([state.address for state in list(self.balances.values()) if state.unconfirmed_transactions])
+
+        for transaction in transactions or []:
+            marked += self.mark_dirty(transaction_addresses(transaction))
+
+        return marked
+
+    def refresh(self, full=False):
+        """
+        fetch the addresses that could have changed, concurrently
+
+        an address that fails to be fetched stays dirty and is fetched again with the next refresh
+
+        :param bool     full:   fetch all addresses
+        :rtype: dict    the addresses that were fetched, the ones of which the balance changed and the ones that failed
+        """
+        now = monotonic()
+
+        with self.lock:
+            if full:
+                self.dirty.update(self.balances)
+            elif self.stale_after is not None:
+                self.dirty.update(address for address, state in self.balances.items()
+                                  if state.updated is None or now - state.updated >= self.stale_after)
+
+            addresses = sorted(self.dirty)
+            self.dirty.clear()
+
+        result = {'fetched': 0, 'changed': [], 'failed': []}
+        if not addresses:
+            return result
+
+        summaries = self.client.addresses(addresses, max_workers=self.max_workers)
+
+        with self.lock:
+            for address, summary in summaries.items():
+                if address not in self.balances:
+                    # removed while it was being fetched
+                    continue
+
+                if isinstance(summary, ObjectNotFound):
+                    # an address that was never used
+                    state = AddressBalance(address, updated=now)
+                elif isinstance(summary, Exception):
+                    self.dirty.add(address)
+                    result['failed'].append(address)
+                    continue
+                else:
+                    state = AddressBalance.from_summary(address, summary, now)
+
+                previous = self.balances[address]
+                self.balances[address] = state
+                self.balance += state.balance - previous.balance
+                self.unconfirmed += state.unconfirmed - previous.unconfirmed
+
+                result['fetched'] += 1
+                if (state.balance, state.unconfirmed) != (previous.balance, previous.unconfirmed):
+                    result['changed'].append(address)
+
+        return result
+
+    def totals(self):
+        """
+        :rtype: dict    the confirmed and unconfirmed balance of all addresses in satoshi
+        """
+        with self.lock:
+            return {
+                'addresses': len(self.balances),
+                'balance': self.balance,
+                'unconfirmed': self.unconfirmed,
+                'dirty': len(self.dirty),
+            }
+
+
+def transaction_addresses(transaction):
+    """
+    :param dict|Transaction transaction:
+    :rtype: set     the addresses of the inputs and outputs
+    """
+    addresses = set()
+    for name in ('inputs', 'outputs'):
+        for item in field(transaction, name) or []:
+            address = field(item, 'address')
+            if address:
+                addresses.add(address)
+
+    return addresses
@@ -0,0 +1,149 @@
+"""
+client side rate limiting, see :RestClient(rate_limiter=)
+
+a limiter can be shared by any amount of clients, threads and coroutines in a process;
+threads call :acquire, coroutines sleep for the delay returned by :reserve
+"""
+import threading
+import time
+
+monotonic = getattr(time, 'monotonic', time.time)
+
+
+class TokenBucket(object):
+    """
+    allows :rate requests per second on average, with bursts of up to :burst requests
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param float    rate:           requests per second
+        :param int      burst:          the max amount of requests that can be done at once, defaults to :rate
+        """
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else max(1, int(rate))
+
+        self.tokens = float(self.burst)
+        self.updated = monotonic()
+        self.lock = threading.Lock()
+
+        self.waited = 0.0
+
+    def reserve(self):
+        """
+        take a token, when there's none available one is reserved from the future
+
+        :rtype: float   the amount of seconds to wait before doing the request
+        """
+        with self.lock:
+            now = monotonic()
+            self._refill(now)
+
+            self.tokens -= 1
+            delay = self._delay(now)
+            self.waited += delay
+
+            return delay
+
+    def acquire(self):
+        """
+        block until a request can be done
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_response(self, status_code, retry_after=None):
+        """
+        called with the status of every response, the plain bucket doesn't adapt
+        """
+        pass
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _delay(self, now):
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def stats(self):
+        """
+        :rtype: dict
+        """
+        with self.lock:
+            return {
+                'rate': self.rate,
+                'waited': self.waited,
+            }
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    a token bucket that halves its rate when the API responds with 429 and pauses for the Retry-After,
+     after which the rate is raised again step by step as long as requests succeed
+    """
+
+    def __init__(self, max_rate, min_rate=1.0, burst=None, decrease_factor=0.5, increase_step=None, increase_interval=1.0,
+                 cooldown=1.0):
+        """
+        :param float    max_rate:           the rate to start at and to never exceed, in requests per second
+        :param float    min_rate:           the rate to never go below
+        :param int      burst:              the max amount of requests that can be done at once, defaults to :max_rate
+        :param float    decrease_factor:    multiply the rate by this on a 429
+        :param float    increase_step:      add this to the rate after :increase_interval of successful requests,
+                                             defaults to 5% of :max_rate
+        :param float    increase_interval:  seconds between increases
+        :param float    cooldown:           seconds after a decrease (or the Retry-After, when it's longer) during which
+                                             more 429s don't decrease the rate again, they're for requests that were in flight
+        """
+        super(AdaptiveRateLimiter, self).__init__(max_rate, burst=burst)
+
+        self.max_rate = float(max_rate)
+        self.min_rate = float(min_rate)
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step if increase_step is not None else self.max_rate * 0.05
+        self.increase_interval = increase_interval
+        self.cooldown = cooldown
+
+        self.paused_until = 0.0
+        self.cooldown_until = float('-inf')
+        self.last_change = float('-inf')
+
+        self.rate_limited = 0
+
+    def on_response(self, status_code, retry_after=None):
+        with self.lock:
+            now = monotonic()
+
+            if status_code == 429:
+                self.rate_limited += 1
+                self._refill(now)
+
+                # several requests that were in flight at the same rate will all get a 429, only back off once for them
+                if now >= self.cooldown_until:
+                    self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                    self.last_change = now
+                    self.cooldown_until = now + max(self.cooldown, retry_after or 0.0)
+
+                # don't let the requests that were held back go all at once
+                self.tokens = min(self.tokens, 0.0)
+
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+
+            elif status_code < 500 and self.rate < self.max_rate and now - self.last_change >= self.increase_interval:
+                self._refill(now)
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                self.last_change = now
+
+    def _delay(self, now):
+        delay = super(AdaptiveRateLimiter, self)._delay(now)
+
+        # requests reserved during a pause are spread out at the current rate after it
+        return max(0.0, self.paused_until - now) + delay
+
+    def stats(self):
+        stats = super(AdaptiveRateLimiter, self).stats()
+        stats['rate_limited'] = self.rate_limited
+
+        return stats
@@ -0,0 +1,119 @@
+"""
+retrying of failed requests, see :RestClient(retry_policy=)
+"""
+import random
+import threading
+
+from blocktrail.exceptions import BlockTrailSDKException, RateLimited
+
+
+class RetryPolicy(object):
+    """
+    exponential backoff with full jitter; the n-th retry waits a random time between 0 and min(:max_backoff, :backoff * 2^(n-1))
+
+    GET and DELETE requests are always retried, POST and PUT only when they're marked idempotent
+    """
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'DELETE'])
+    RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+    def __init__(self, max_attempts=5, backoff=0.5, max_backoff=30.0, timeout=120.0, jitter=True, retry_statuses=None):
+        """
+        :param int      max_attempts:   the max amount of times to try a request, including the first time
+        :param float    backoff:        the base delay in seconds
+        :param float    max_backoff:    the max delay between attempts in seconds
+        :param float    timeout:        the total time budget in seconds, no retry is done when it would exceed this (None for no limit)
+        :param bool     jitter:         randomize the delays, so clients that failed together don't retry together
+        :param set      retry_statuses: the HTTP status codes to retry
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses) if retry_statuses is not None else self.RETRY_STATUSES
+
+        self.lock = threading.Lock()
+        self.attempts = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.retries_by_reason = {}
+
+    def delay(self, attempt, error=None):
+        """
+        :param int      attempt:        the attempt that failed, starting at 1
+        :param error:                   the error it failed with
+        :rtype: float
+        """
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        # never retry earlier than the API asked us to
+        if isinstance(error, RateLimited) and error.retry_after:
+            delay = max(delay, error.retry_after)
+
+        return delay
+
+    def is_retryable(self, method, error, idempotent=None, connection_error=False):
+        """
+        :param str      method:             the HTTP method
+        :param error:                       the error the request failed with
+        :param bool     idempotent:         if the request can safely be repeated, defaults to based on :method
+        :param bool     connection_error:   if :error is a connection error / timeout of the transport
+        :rtype: bool
+        """
+        if idempotent is None:
+            idempotent = method in self.IDEMPOTENT_METHODS
+
+        if not idempotent:
+            return False
+
+        if connection_error:
+            return True
+
+        return isinstance(error, BlockTrailSDKException) and error.code in self.retry_statuses
+
+    def on_attempt(self):
+        with self.lock:
+            self.attempts += 1
+
+    def retry_delay(self, method, attempt, elapsed, error, idempotent=None, connection_error=False):
+        """
+        decide if and when a failed request should be retried
+
+        :param str      method:             the HTTP method
+        :param int      attempt:            the attempt that failed, starting at 1
+        :param float    elapsed:            seconds since the first attempt was started
+        :param error:                       the error the attempt failed with
+        :param bool     idempotent:         if the request can safely be repeated, defaults to based on :method
+        :param bool     connection_error:   if :error is a connection error / timeout of the transport
+        :rtype: float|None      seconds to wait before retrying, None to give up
+        """
+        if not self.is_retryable(method, error, idempotent=idempotent, connection_error=connection_error):
+            return None
+
+        delay = self.delay(attempt, error)
+
+        with self.lock:
+            if attempt >= self.max_attempts or (self.timeout is not None and elapsed + delay > self.timeout):
+                self.gave_up += 1
+                return None
+
+            reason = error.__class__.__name__
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+
+        return delay
+
+    def stats(self):
+        """
+        :rtype: dict
+        """
+        with self.lock:
+            return {
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'gave_up': self.gave_up,
+                'retries_by_reason': dict(self.retries_by_reason),
+            }
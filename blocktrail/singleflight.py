@@ -0,0 +1,69 @@
+"""
+coalescing of identical concurrent calls
+"""
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    while a call for a key is in flight, other callers for the same key wait for it and share its result or exception
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+        self.calls_made = 0
+        self.calls_shared = 0
+
+    def do(self, key, fn):
+        """
+        :param str      key:            the key identifying the call
+        :param callable fn:             the call to make when there's none in flight for :key
+        :return: the result of :fn
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                self.calls_shared += 1
+                leader = False
+            else:
+                call = self.calls[key] = _Call()
+                self.calls_made += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+    def stats(self):
+        """
+        :rtype: dict
+        """
+        with self.lock:
+            return {
+                'in_flight': len(self.calls),
+                'calls_made': self.calls_made,
+                'calls_shared': self.calls_shared,
+            }
@@ -0,0 +1,303 @@
+"""
+keep the address-transactions subscriptions of a webhook in sync with a (large) set of addresses
+
+    manager = SubscriptionManager(client, "my-webhook", journal="my-webhook.journal")
+    manager.sync({"1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp": 6, "1NcXPMRaanz43b1kokpPuYDdk6GGDvxT2T": 1})
+
+only the difference between the desired addresses and the subscriptions is sent, in chunks and concurrently;
+ with a journal the subscriptions are remembered locally, so a re-sync doesn't have to list all subscriptions again
+ and a sync that was interrupted continues where it stopped
+"""
+import json
+import os
+import threading
+
+from blocktrail import batch
+from blocktrail.exceptions import ObjectNotFound
+
+
+EVENT_TYPE = 'address-transactions'
+
+DEFAULT_CONFIRMATIONS = 6
+DEFAULT_CHUNK_SIZE = 500
+
+replace = getattr(os, 'replace', os.rename)
+
+
+class SubscriptionDiff(object):
+    """
+    the changes needed to go from the current subscriptions to the desired ones
+    """
+
+    def __init__(self, add, remove):
+        """
+        :param dict     add:        address => confirmations, to subscribe
+        :param list     remove:     addresses to unsubscribe
+        """
+        self.add = add
+        self.remove = remove
+
+    def __len__(self):
+        return len(self.add) + len(self.remove)
+
+    def __repr__(self):
+        return "SubscriptionDiff(add=%d, remove=%d)" % (len(self.add), len(self.remove))
+
+
+class Journal(object):
+    """
+    append-only file with the subscriptions a webhook has, one JSON line per applied chunk
+
+    the file is compacted into a single snapshot when it's loaded and holds more changes than subscriptions
+    """
+
+    def __init__(self, path):
+        """
+        :param str      path:       the journal file, it's created when it doesn't exist yet
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.repaired = False
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """
+        :rtype: dict    address => confirmations
+        """
+        subscriptions = {}
+        changes = 0
+
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # a line cut off when the process was killed while writing it, it's truncated by the next append
+                    continue
+
+                if 'snapshot' in entry:
+                    subscriptions = entry['snapshot']
+                for address, confirmations in (entry.get('add') or {}).items():
+                    subscriptions[address] = confirmations
+                    changes += 1
+                for address in entry.get('remove') or []:
+                    subscriptions.pop(address, None)
+                    changes += 1
+
+        if changes > len(subscriptions):
+            self.snapshot(subscriptions)
+
+        return subscriptions
+
+    def snapshot(self, subscriptions):
+        """
+        replace the journal with a single line holding :subscriptions
+        """
+        tmp = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp, 'w') as f:
+            f.write(json.dumps({'snapshot': subscriptions}) + "\n")
+
+        with self.lock:
+            replace(tmp, self.path)
+
+    def append(self, add=None, remove=None):
+        """
+        :param dict     add:        address => confirmations that were subscribed
+        :param list     remove:     addresses that were unsubscribed
+        """
+        entry = {}
+        if add:
+            entry['add'] = add
+        if remove:
+            entry['remove'] = remove
+
+        with self.lock:
+            if not self.repaired:
+                self.repair()
+                self.repaired = True
+
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+
+    def repair(self):
+        """
+        truncate a line that was cut off, so the next entry doesn't end up on the same line
+        """
+        if not self.exists():
+            return
+
+        with open(self.path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+
+            f.seek(0)
+            f.truncate(f.read().rfind(b"\n") + 1)
+
+
+class SubscriptionManager(object):
+    def __init__(self, client, identifier, journal=None, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=4,
+                 confirmations=DEFAULT_CONFIRMATIONS):
+        """
+        :param APIClient    client:
+        :param str          identifier:     the webhook identifier
+        :param str          journal:        file to remember the subscriptions in, see :Journal
+        :param int          chunk_size:     the max amount of addresses to subscribe with a single request
+        :param int          max_workers:    the amount of requests to do concurrently
+        :param int          confirmations:  the confirmations of addresses that are desired without a specific amount
+        """
+        self.client = client
+        self.identifier = identifier
+        self.journal = Journal(journal) if journal is not None else None
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.confirmations = confirmations
+
+    def fetch(self):
+        """
+        list the address-transactions subscriptions of the webhook
+
+        :rtype: dict    address => confirmations
+        """
+        subscriptions = {}
+
+        for event in self.client.iter_webhook_events(self.identifier, limit=200, max_workers=self.max_workers):
+            if event['event_type'] == EVENT_TYPE:
+                subscriptions[event['address']] = event.get('confirmations')
+
+        return subscriptions
+
+    def current(self, refresh=False):
+        """
+        the subscriptions from the journal, or from the API when there's no journal yet or :refresh is set
+
+        :param bool     refresh:    ignore the journal and list the subscriptions
+        :rtype: dict    address => confirmations
+        """
+        if self.journal is not None and self.journal.exists() and not refresh:
+            return self.journal.load()
+
+        subscriptions = self.fetch()
+        if self.journal is not None:
+            self.journal.snapshot(subscriptions)
+
+        return subscriptions
+
+    def diff(self, desired, current):
+        """
+        :param dict|iterable    desired:    address => confirmations, or addresses
+        :param dict             current:    address => confirmations
+        :rtype: SubscriptionDiff
+        """
+        if not isinstance(desired, dict):
+            desired = dict.fromkeys(desired, self.confirmations)
+
+        add = {}
+        remove = []
+
+        for address, confirmations in desired.items():
+            if confirmations is None:
+                confirmations = self.confirmations
+
+            if address not in current:
+                add[address] = confirmations
+            elif current[address] != confirmations:
+                # the confirmations of a subscription can't be changed, it has to be subscribed again
+                remove.append(address)
+                add[address] = confirmations
+
+        for address in current:
+            if address not in desired:
+                remove.append(address)
+
+        return SubscriptionDiff(add, sorted(remove))
+
+    def chunks(self, items):
+        return [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+
+    def unsubscribe_chunk(self, addresses):
+        removed = []
+        try:
+            for address in addresses:
+                try:
+                    self.client.unsubscribe_address_transactions(self.identifier, address)
+                except ObjectNotFound:
+                    # already gone
+                    pass
+                removed.append(address)
+        finally:
+            # remember what was done, even when the chunk failed halfway
+            if removed and self.journal is not None:
+                self.journal.append(remove=removed)
+
+        return len(removed)
+
+    def subscribe_chunk(self, records):
+        self.client.batch_subscribe_address_transactions(self.identifier, records)
+
+        if self.journal is not None:
+            self.journal.append(add=dict((record['address'], record['confirmations']) for record in records))
+
+        return len(records)
+
+    def apply(self, diff):
+        """
+        unsubscribe and then subscribe the addresses of :diff, in chunks with bounded concurrency
+
+        a failing chunk doesn't abort the others, its addresses are reported in the result and can be retried with another sync
+
+        :param SubscriptionDiff     diff:
+        :rtype: dict    the amount of addresses added and removed, and the addresses that failed
+        """
+        result = {'added': 0, 'removed': 0, 'failed': []}
+
+        # removes first, an address of which the confirmations change is subscribed again afterwards
+        remove_chunks = self.chunks(diff.remove)
+        results = batch.batch_lookup(lambda i: self.unsubscribe_chunk(remove_chunks[i]), range(len(remove_chunks)),
+                                     max_workers=self.max_workers)
+        failed_removes = set()
+        for i, removed in results.items():
+            if isinstance(removed, Exception):
+                failed_removes.update(remove_chunks[i])
+                result['failed'].extend(remove_chunks[i])
+            else:
+                result['removed'] += removed
+
+        records = [{'address': address, 'confirmations': confirmations}
+                   for address, confirmations in sorted(diff.add.items()) if address not in failed_removes]
+        add_chunks = self.chunks(records)
+        results = batch.batch_lookup(lambda i: self.subscribe_chunk(add_chunks[i]), range(len(add_chunks)),
+                                     max_workers=self.max_workers)
+        for i, added in results.items():
+            if isinstance(added, Exception):
+                result['failed'].extend(record['address'] for record in add_chunks[i])
+            else:
+                result['added'] += added
+
+        return result
+
+    def sync(self, desired, refresh=False, dry_run=False):
+        """
+        make the address-transactions subscriptions of the webhook match :desired
+
+        :param dict|iterable    desired:    address => confirmations, or addresses
+        :param bool             refresh:    list the subscriptions from the API instead of trusting the journal
+        :param bool             dry_run:    only compute the changes
+        :rtype: dict    the amount of addresses added and removed, the addresses that failed and the diff
+        """
+        diff = self.diff(desired, self.current(refresh=refresh))
+
+        if dry_run:
+            result = {'added': 0, 'removed': 0, 'failed': []}
+        else:
+            result = self.apply(diff)
+
+        result['diff'] = diff
+        return result
@@ -0,0 +1,360 @@
+"""
+local index of unspent outputs with coin selection, so a spend doesn't need to download all unspent outputs again
+
+    index = UTXOIndex()
+    index.load(client, addresses)           # streams the unspent outputs of every address
+    inputs = index.select(150000000, min_confirmations=6)
+
+    # later; keep it up to date
+    index.apply_transaction(tx)             # spends its inputs and adds its outputs to the tracked addresses
+    index.set_tip(height)                   # a new block, for the confirmations
+
+outputs are keyed by outpoint (hash, index) and also kept sorted by value and by block height, so selecting coins
+ is a binary search plus a walk over the outputs that are selected, instead of a scan over all of them;
+ the heights are derived from the confirmations and the tip, so the confirmations don't go stale as blocks are found
+"""
+import bisect
+import threading
+from collections import OrderedDict
+
+from blocktrail import batch
+from blocktrail.exceptions import BlockTrailSDKException
+from blocktrail.models import field
+
+
+# sorts after any block height, for unconfirmed outputs
+UNCONFIRMED = float('inf')
+
+# the sorted lists are sorted (or filtered) again instead of updated one output at a time
+#  when at least 1 / BULK_RATIO of the outputs change at once, every single update moves the tail of the lists
+BULK_RATIO = 64
+
+EXCEPTION_INSUFFICIENT_FUNDS = "There are not enough confirmed unspent outputs to cover the amount."
+
+
+class InsufficientFunds(BlockTrailSDKException):
+    pass
+
+
+class Output(object):
+    """
+    an unspent output
+    """
+
+    __slots__ = ('hash', 'index', 'value', 'address', 'height', 'script_hex')
+
+    def __init__(self, hash, index, value, address=None, height=UNCONFIRMED, script_hex=None):
+        """
+        :param str      hash:           the hash of the transaction that created the output
+        :param int      index:          the index of the output in the transaction
+        :param int      value:          in satoshi
+        :param str      address:
+        :param int      height:         the height of the block the transaction is in, or UNCONFIRMED
+        :param str      script_hex:
+        """
+        self.hash = hash
+        self.index = index
+        self.value = value
+        self.address = address
+        self.height = height
+        self.script_hex = script_hex
+
+    @property
+    def outpoint(self):
+        return (self.hash, self.index)
+
+    def __repr__(self):
+        return "Output(%s:%d, %d)" % (self.hash, self.index, self.value)
+
+
+class UTXOIndex(object):
+    def __init__(self, tip=None):
+        """
+        :param int      tip:        the height of the latest block, it's fetched by :load when it's not known yet
+        """
+        self.tip = tip
+
+        self.lock = threading.RLock()
+        self.outputs = {}
+        self.by_address = {}
+        # (value, hash, index) and (height, value, hash, index), kept sorted
+        self.by_value = []
+        self.by_height = []
+
+    def __len__(self):
+        return len(self.outputs)
+
+    def __contains__(self, outpoint):
+        return outpoint in self.outputs
+
+    def get(self, outpoint):
+        """
+        :param tuple    outpoint:   (hash, index)
+        :rtype: Output|None
+        """
+        return self.outputs.get(outpoint)
+
+    def confirmations(self, output):
+        """
+        :rtype: int
+        """
+        if output.height == UNCONFIRMED or self.tip is None:
+            return 0
+
+        return max(0, self.tip - output.height + 1)
+
+    def set_tip(self, height):
+        """
+        :param int      height:     the height of the latest block
+        """
+        self.tip = height
+
+    def add(self, output):
+        """
+        :param Output   output:     replaces the output with the same outpoint, if any
+        """
+        self.add_many([output])
+
+    def add_many(self, outputs):
+        """
+        :param list     outputs:    Outputs, they replace the outputs with the same outpoint, if any
+        """
+        # the same outpoint twice (eg; pages that shifted while they were walked) is stored once, the last one wins
+        outputs = list(OrderedDict((output.outpoint, output) for output in outputs).values())
+
+        with self.lock:
+            self.spend_many([output.outpoint for output in outputs])
+
+            for output in outputs:
+                self.outputs[output.outpoint] = output
+                self.by_address.setdefault(output.address, set()).add(output.outpoint)
+
+            insert_sorted(self.by_value, [(output.value, output.hash, output.index) for output in outputs])
+            insert_sorted(self.by_height, [(output.height, output.value, output.hash, output.index) for output in outputs])
+
+    def from_record(self, record):
+        """
+        :param dict     record:     an unspent output as returned by `address_unspent_outputs`
+        :rtype: Output
+        """
+        confirmations = field(record, 'confirmations') or 0
+        if confirmations > 0 and self.tip is not None:
+            height = self.tip - confirmations + 1
+        else:
+            height = UNCONFIRMED
+
+        return Output(field(record, 'hash'), field(record, 'index'), int(field(record, 'value')), field(record, 'address'),
+                      height=height, script_hex=record.get('script_hex'))
+
+    def spend(self, outpoint):
+        """
+        :param tuple    outpoint:   (hash, index)
+        :rtype: Output|None     the output that was removed
+        """
+        spent = self.spend_many([outpoint])
+        return spent[0] if spent else None
+
+    def spend_many(self, outpoints):
+        """
+        :param list     outpoints:  (hash, index) tuples, the ones that aren't in the index are ignored
+        :rtype: list    the Outputs that were removed
+        """
+        with self.lock:
+            spent = []
+            for outpoint in outpoints:
+                output = self.outputs.pop(outpoint, None)
+                if output is not None:
+                    # the address stays tracked, even without outputs
+                    self.by_address[output.address].discard(outpoint)
+                    spent.append(output)
+
+            if len(spent) * BULK_RATIO >= len(self.by_value):
+                self.by_value = [key for key in self.by_value if (key[1], key[2]) in self.outputs]
+                self.by_height = [key for key in self.by_height if (key[2], key[3]) in self.outputs]
+            else:
+                for output in spent:
+                    remove_sorted(self.by_value, (output.value, output.hash, output.index))
+                    remove_sorted(self.by_height, (output.height, output.value, output.hash, output.index))
+
+            return spent
+
+    def apply_transaction(self, transaction, height=UNCONFIRMED):
+        """
+        spend the outputs the inputs of :transaction spend, and add its outputs that are to a tracked address
+
+        :param dict|Transaction transaction:    a transaction as returned by the API
+        :param int              height:         the height of the block the transaction is in
+        :rtype: (list, list)    the Outputs that were spent and added
+        """
+        added = []
+
+        with self.lock:
+            spent = self.spend_many([(field(item, 'output_hash'), field(item, 'output_index'))
+                                     for item in field(transaction, 'inputs') or []])
+
+            for item in field(transaction, 'outputs') or []:
+                address = field(item, 'address')
+                if address in self.by_address and not field(item, 'spent_hash'):
+                    added.append(Output(field(transaction, 'hash'), field(item, 'index'), int(field(item, 'value')), address,
+                                        height=height, script_hex=field(item, 'script_hex')))
+
+            self.add_many(added)
+
+        return spent, added
+
+    def replace(self, outputs_by_address):
+        """
+        replace the outputs of the addresses with :outputs_by_address, in one go so the sorted lists are sorted once
+
+        :param dict     outputs_by_address:     {address: [Output, ...]}
+        """
+        with self.lock:
+            self.spend_many([outpoint for address in outputs_by_address for outpoint in self.by_address.get(address, ())])
+            self.add_many([output for outputs in outputs_by_address.values() for output in outputs])
+
+            # tracked from now on, even without outputs
+            for address in outputs_by_address:
+                self.by_address.setdefault(address, set())
+
+    def fetch_address(self, client, address):
+        """
+        :rtype: list    the current unspent outputs of :address, the next page is fetched while one is being parsed
+        """
+        return [self.from_record(record) for record in client.iter_address_unspent_outputs(address)]
+
+    def load_address(self, client, address):
+        """
+        replace the outputs of :address with its current unspent outputs
+
+        :rtype: int     the amount of outputs
+        """
+        outputs = self.fetch_address(client, address)
+        self.replace({address: outputs})
+
+        return len(outputs)
+
+    def load(self, client, addresses, max_workers=batch.DEFAULT_MAX_WORKERS):
+        """
+        load the unspent outputs of :addresses concurrently, the outputs of an address that failed are kept as they were
+
+        :param APIClient    client:
+        :param list         addresses:
+        :param int          max_workers:    the amount of addresses to fetch concurrently
+        :rtype: OrderedDict     the amount of outputs for each address, or the exception that was raised fetching them
+        """
+        if self.tip is None:
+            self.tip = field(client.block_latest(), 'height')
+
+        results = batch.batch_lookup(lambda address: self.fetch_address(client, address), addresses, max_workers=max_workers)
+
+        self.replace(dict((address, outputs) for address, outputs in results.items() if not isinstance(outputs, Exception)))
+
+        for address, outputs in results.items():
+            if not isinstance(outputs, Exception):
+                results[address] = len(outputs)
+
+        return results
+
+    def iter_outputs(self, min_confirmations=0, order='value', reverse=False):
+        """
+        :param int      min_confirmations:
+        :param str      order:              'value' or 'confirmations' (the most confirmed first)
+        :param bool     reverse:
+        :rtype: generator   Outputs
+        """
+        with self.lock:
+            if order == 'confirmations':
+                # the outputs with enough confirmations are a prefix of the outputs sorted by height
+                end = len(self.by_height)
+                if min_confirmations > 0:
+                    end = bisect.bisect_right(self.by_height, (self.max_height(min_confirmations), UNCONFIRMED))
+                keys = self.by_height[:end]
+                outputs = [self.outputs[(h, i)] for _, _, h, i in (reversed(keys) if reverse else keys)]
+            else:
+                keys = reversed(self.by_value) if reverse else self.by_value
+                outputs = [output for output in (self.outputs[(h, i)] for _, h, i in keys)
+                           if self.confirmations(output) >= min_confirmations]
+
+        return iter(outputs)
+
+    def balance(self, min_confirmations=0):
+        """
+        :rtype: int     the total value of the outputs with at least :min_confirmations
+        """
+        return sum(output.value for output in self.iter_outputs(min_confirmations, order='confirmations'))
+
+    def max_height(self, min_confirmations):
+        if self.tip is None:
+            return -1
+
+        return self.tip - min_confirmations + 1
+
+    def eligible(self, key, max_height, exclude):
+        output = self.outputs[key[1:]]
+        return output.height <= max_height and (not exclude or output.outpoint not in exclude)
+
+    def select(self, amount, min_confirmations=0, exclude=None):
+        """
+        select the fewest outputs with at least :min_confirmations that cover :amount, with the least change
+
+        a single output is used when one is large enough (the smallest of those), otherwise the largest outputs are taken
+         until :amount is covered and the last one is swapped for the smallest output that still covers the rest
+
+        :param int      amount:             in satoshi
+        :param int      min_confirmations:
+        :param set      exclude:            outpoints not to select, eg; the ones reserved for another spend
+        :rtype: list    Outputs
+        :raises InsufficientFunds:
+        """
+        with self.lock:
+            max_height = self.max_height(min_confirmations) if min_confirmations > 0 else UNCONFIRMED
+
+            # the smallest single output that covers the amount
+            for i in range(bisect.bisect_left(self.by_value, (amount, )), len(self.by_value)):
+                if self.eligible(self.by_value[i], max_height, exclude):
+                    return [self.outputs[self.by_value[i][1:]]]
+
+            # the largest outputs until the amount is covered
+            selected = []
+            total = 0
+            for key in reversed(self.by_value):
+                if not self.eligible(key, max_height, exclude):
+                    continue
+
+                selected.append(key)
+                total += key[0]
+                if total >= amount:
+                    break
+            else:
+                raise InsufficientFunds(EXCEPTION_INSUFFICIENT_FUNDS)
+
+            # the last one can be any output that covers what the others don't, take the smallest
+            remaining = amount - (total - selected[-1][0])
+            taken = set(selected[:-1])
+            for i in range(bisect.bisect_left(self.by_value, (remaining, )), len(self.by_value)):
+                key = self.by_value[i]
+                if key not in taken and self.eligible(key, max_height, exclude):
+                    selected[-1] = key
+                    break
+
+            return [self.outputs[key[1:]] for key in selected]
+
+
+def insert_sorted(items, keys):
+    """
+    insert :keys into the sorted list :items
+    """
+    if len(keys) * BULK_RATIO >= len(items):
+        # sorting two sorted runs is a merge
+        keys.sort()
+        items.extend(keys)
+        items.sort()
+    else:
+        for key in keys:
+            bisect.insort(items, key)
+
+
+def remove_sorted(items, item):
+    i = bisect.bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
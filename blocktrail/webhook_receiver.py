@@ -0,0 +1,341 @@
+"""
+asyncio server receiving the webhook events of the API, requires python 3.5+ and aiohttp (`pip install blocktrail-sdk[async]`)
+
+    async def handle(events):
+        for event in events:
+            print(event.event_type, event.data['hash'])
+
+    receiver = WebhookReceiver(handle, token="a long random string")
+    await receiver.start(port=8080)
+    client.setup_webhook("https://example.com:8080/webhook?token=a+long+random+string", "my-webhook")
+
+events are acknowledged as soon as they're queued and handed to the handler in batches;
+ when the queue is full the receiver answers 503 so the API delivers the event again later,
+ events that are delivered again after they were accepted are dropped
+
+so delivery is at-most-once: when the handler raises the API won't deliver the batch again,
+ the exception is logged and the batch is passed to :on_error, to store it or retry it somewhere else
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+from collections import OrderedDict
+
+from aiohttp import web
+from httpsig.utils import parse_authorization_header
+
+from blocktrail.codec import get_codec
+from blocktrail.metrics import Histogram, DEFAULT_BUCKETS
+from blocktrail.ratelimit import monotonic
+from blocktrail.signing import HMACSignatureAuth
+
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_DELAY = 0.01
+DEFAULT_DEDUP_SIZE = 100000
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookEvent(object):
+    """
+    a single delivery of a webhook
+    """
+
+    __slots__ = ('event_type', 'network', 'identifier', 'data', 'addresses', 'retry_count', 'received', 'raw')
+
+    def __init__(self, payload, received=None):
+        """
+        :param dict     payload:        the decoded body of the webhook request
+        :param float    received:       monotonic() time the event was received
+        """
+        self.event_type = payload.get('event_type')
+        self.network = payload.get('network')
+        self.identifier = payload.get('webhook_identifier') or payload.get('identifier')
+        self.data = payload.get('data') or {}
+        self.addresses = payload.get('addresses') or {}
+        self.retry_count = payload.get('retry_count', 0)
+        self.received = received if received is not None else monotonic()
+        self.raw = payload
+
+    @property
+    def key(self):
+        """
+        identifies the event across deliveries, a transaction getting another confirmation is a new event
+
+        :rtype: tuple
+        """
+        return (self.identifier, self.event_type, self.data.get('hash'), self.data.get('confirmations'))
+
+    def __repr__(self):
+        return "WebhookEvent(%s, %s)" % (self.event_type, self.data.get('hash'))
+
+
+class Deduplicator(object):
+    """
+    remembers the keys of the most recent :max_entries events
+    """
+
+    def __init__(self, max_entries=DEFAULT_DEDUP_SIZE):
+        self.max_entries = max_entries
+        self.keys = OrderedDict()
+
+    def seen(self, key):
+        """
+        :rtype: bool    if :key was seen before, it's remembered when it wasn't
+        """
+        if key in self.keys:
+            return True
+
+        self.keys[key] = True
+        if len(self.keys) > self.max_entries:
+            self.keys.popitem(last=False)
+
+        return False
+
+    def forget(self, key):
+        self.keys.pop(key, None)
+
+
+class WebhookReceiver(object):
+    def __init__(self, handler, token=None, api_key=None, api_secret=None, path="/webhook", queue_size=DEFAULT_QUEUE_SIZE,
+                 batch_size=DEFAULT_BATCH_SIZE, batch_delay=DEFAULT_BATCH_DELAY, workers=1, dedup_size=DEFAULT_DEDUP_SIZE,
+                 enqueue_timeout=1.0, retry_after=5, drain_timeout=10, on_error=None, json_codec=None):
+        """
+        :param callable handler:        called with a list of WebhookEvents, a coroutine function or a function
+                                         (which is run in the default executor)
+        :param str      token:          only accept requests with this ?token= in the url
+        :param str      api_key:        only accept requests that are HMAC signed with this API_KEY / API_SECRET
+        :param str      api_secret:
+        :param str      path:           the path to receive the webhooks on
+        :param int      queue_size:     the max amount of events waiting to be handled
+        :param int      batch_size:     the max amount of events to pass to the handler at once
+        :param float    batch_delay:    seconds to wait for a batch to fill up
+        :param int      workers:        the amount of batches to handle concurrently
+        :param int      dedup_size:     the amount of recent events to remember to drop redeliveries
+        :param float    enqueue_timeout: seconds to wait for room in the queue before answering 503
+        :param int      retry_after:    the Retry-After to send with a 503
+        :param float    drain_timeout:  seconds to wait for the queued events to be handled when stopping
+        :param callable on_error:       called with the batch and the exception when the handler raised,
+                                         a coroutine function or a function (which is run in the default executor)
+        :param str      json_codec:     see blocktrail.codec
+        """
+        self.handler = handler
+        self.token = token
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.path = path
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.workers = workers
+        self.enqueue_timeout = enqueue_timeout
+        self.retry_after = retry_after
+        self.drain_timeout = drain_timeout
+        self.on_error = on_error
+        self.codec = get_codec(json_codec)
+
+        self.dedup = Deduplicator(dedup_size)
+        self.queue = None
+        self.runner = None
+        self.tasks = []
+
+        self.counters = dict.fromkeys(['received', 'accepted', 'duplicates', 'rejected', 'invalid', 'backpressure',
+                                       'handled', 'failed', 'batches'], 0)
+        self.latency = Histogram(DEFAULT_BUCKETS)
+
+    def is_authentic(self, request, body):
+        """
+        :param aiohttp.web.Request  request:
+        :param bytes                body:
+        :rtype: bool
+        """
+        if self.token is not None:
+            if not hmac.compare_digest(request.query.get('token', "").encode("utf-8"), self.token.encode("utf-8")):
+                return False
+
+        if self.api_secret is not None:
+            authorization = request.headers.get('Authorization')
+            if not authorization:
+                return False
+
+            try:
+                params = parse_authorization_header(authorization)[1]
+                headers = params['headers'].split(" ")
+            except (ValueError, KeyError, IndexError):
+                return False
+
+            # depending on the httpsig version the keys are lowercased
+            key_id = params.get('keyId', params.get('keyid'))
+            if key_id != self.api_key or 'content-md5' not in [header.lower() for header in headers]:
+                return False
+
+            # the MD5 is what ties the signature to the body
+            if request.headers.get('Content-MD5') != hashlib.md5(body).hexdigest():
+                return False
+
+            try:
+                auth = HMACSignatureAuth(self.api_key, self.api_secret, headers)
+                expected = auth.authorization(request.method, request.path_qs, request.headers)
+            except KeyError:
+                return False
+
+            if not hmac.compare_digest(expected.encode("utf-8"), authorization.encode("utf-8")):
+                return False
+
+        return True
+
+    async def handle(self, request):
+        """
+        the aiohttp request handler
+        """
+        self.counters['received'] += 1
+        received = monotonic()
+
+        body = await request.read()
+
+        if not self.is_authentic(request, body):
+            self.counters['rejected'] += 1
+            return web.Response(status=401)
+
+        try:
+            event = WebhookEvent(self.codec.loads(body), received=received)
+        except (ValueError, TypeError, AttributeError):
+            self.counters['invalid'] += 1
+            return web.Response(status=400)
+
+        if self.dedup.seen(event.key):
+            # acknowledge it, or it'll be delivered yet again
+            self.counters['duplicates'] += 1
+            return web.Response(status=200)
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self.queue.put(event), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.counters['backpressure'] += 1
+                self.dedup.forget(event.key)
+                return web.Response(status=503, headers={'Retry-After': str(self.retry_after)})
+
+        self.counters['accepted'] += 1
+        return web.Response(status=200)
+
+    async def work(self):
+        loop = asyncio.get_event_loop()
+
+        while True:
+            batch = [await self.queue.get()]
+
+            # give the batch a moment to fill up, unless it's already full
+            if self.batch_delay and self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_delay)
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await self.call(loop, self.handler, batch)
+
+                self.counters['handled'] += len(batch)
+            except Exception as e:
+                # the events were acknowledged already, they won't be delivered again
+                self.counters['failed'] += len(batch)
+                logger.exception("webhook handler failed for a batch of %d events", len(batch))
+
+                if self.on_error is not None:
+                    try:
+                        await self.call(loop, self.on_error, batch, e)
+                    except Exception:
+                        logger.exception("webhook on_error failed")
+            finally:
+                self.counters['batches'] += 1
+
+                now = monotonic()
+                for event in batch:
+                    self.latency.observe(now - event.received)
+                    self.queue.task_done()
+
+    async def call(self, loop, fn, *args):
+        if asyncio.iscoroutinefunction(fn):
+            return await fn(*args)
+        else:
+            return await loop.run_in_executor(None, fn, *args)
+
+    def app(self):
+        """
+        the workers are started and stopped with the application, so it can be mounted in an existing application
+         (eg; `parent.add_subapp("/hooks", receiver.app())`)
+
+        :rtype: aiohttp.web.Application
+        """
+        app = web.Application()
+        app.router.add_post(self.path, self.handle)
+        app.on_startup.append(self.start_workers)
+        app.on_cleanup.append(self.stop_workers)
+
+        return app
+
+    async def start_workers(self, app=None):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.tasks = [asyncio.ensure_future(self.work()) for i in range(self.workers)]
+
+    async def stop_workers(self, app=None):
+        """
+        handle the events that are queued, for at most :drain_timeout seconds, and stop the workers
+        """
+        try:
+            await asyncio.wait_for(self.queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def start(self, host="0.0.0.0", port=8080):
+        """
+        start the server and the workers
+        """
+        self.runner = web.AppRunner(self.app())
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+
+    @property
+    def port(self):
+        """
+        the port the server is listening on, useful when started with port=0
+        """
+        return self.runner.addresses[0][1]
+
+    async def stop(self, timeout=None):
+        """
+        stop accepting events, handle the ones that are queued and stop the workers
+
+        :param float    timeout:        seconds to wait for the queue to be handled, :drain_timeout by default
+        """
+        if timeout is not None:
+            self.drain_timeout = timeout
+
+        # stops the server first, then the workers through the on_cleanup of the application
+        await self.runner.cleanup()
+
+    def stats(self):
+        """
+        :rtype: dict
+        """
+        stats = dict(self.counters)
+        stats['queued'] = self.queue.qsize() if self.queue is not None else 0
+        stats['latency'] = {
+            'count': self.latency.count,
+            'mean': self.latency.sum / self.latency.count if self.latency.count else 0.0,
+        }
+
+        return stats
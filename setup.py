@@ -27,8 +27,13 @@ setup(
         'httpsig >= 1.1.0',
         'pycrypto >= 2.6.1',
         'requests >= 2.4.3',
-        'future >= 0.14.3',
         'six >= 1.9.0',
+        'futures >= 3.0.0; python_version < "3"',
     ],
+    extras_require={
+        'async': ['aiohttp >= 3.0'],
+        'numpy': ['numpy'],
+        'fast': ['orjson >= 3.0; python_version >= "3.6"', 'ujson >= 1.35'],
+    },
     test_suite="tests.get_tests",
 )
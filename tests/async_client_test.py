@@ -0,0 +1,85 @@
+import unittest
+
+try:
+    import asyncio
+    from blocktrail.async_client import AsyncAPIClient
+except (ImportError, SyntaxError):
+    AsyncAPIClient = None
+
+import blocktrail
+from tests.mock_server import MockServer
+
+
+@unittest.skipIf(AsyncAPIClient is None, "requires python 3.5+ and aiohttp")
+class AsyncApiClientTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.server = MockServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def setup_api_client(self, **kwargs):
+        return AsyncAPIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url, **kwargs)
+
+    def run_with_client(self, client, coro):
+        try:
+            return self.loop.run_until_complete(coro)
+        finally:
+            self.loop.run_until_complete(client.close())
+
+    def test_get(self):
+        self.server.route('GET', '/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/transactions', {'total': 1, 'data': [{'hash': "abc"}]})
+        client = self.setup_api_client()
+
+        result = self.run_with_client(client, client.address_transactions("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", limit=23))
+        assert result['data'][0]['hash'] == "abc"
+
+        request = self.server.requests[0]
+        assert request.params == {'api_key': "MY_APIKEY", 'page': "1", 'limit': "23", 'sort_dir': "asc"}
+        assert request.headers['Content-MD5'] == blocktrail.connection.RestClient.content_md5("")
+
+    def test_many_in_flight(self):
+        self.server.route('GET', '/price', {'USD': 250.0})
+        client = self.setup_api_client(pool_maxsize=10)
+
+        results = self.run_with_client(client, asyncio.gather(*[client.price() for i in range(200)]))
+        assert len(results) == 200
+        assert all(result['USD'] == 250.0 for result in results)
+        assert self.server.connections <= 10
+
+    def test_hmac(self):
+        self.server.route('POST', '/webhook', lambda request: (200, request.json(), {}))
+        self.server.route('DELETE', '/webhook/my-webhook', {'result': True})
+        client = self.setup_api_client()
+
+        result = self.run_with_client(client, client.setup_webhook("https://example.com/hook", "my-webhook"))
+        assert result == {'url': "https://example.com/hook", 'identifier': "my-webhook"}
+
+        result = self.run_with_client(client, client.delete_webhook("my-webhook"))
+        assert result == {'result': True}
+
+        for request in self.server.requests:
+            assert request.signature_is_valid("MY_APIKEY", "MY_APISECRET")
+            assert not request.signature_is_valid("MY_APIKEY", "FAILSECRET")
+
+    def test_errors(self):
+        self.server.route('GET', '/transaction/abc', {'msg': "not found", 'code': 404}, status=404)
+        self.server.route('GET', '/webhook/abc', {'msg': "invalid", 'code': 45}, status=400)
+        client = self.setup_api_client()
+
+        with self.assertRaises(blocktrail.exceptions.ObjectNotFound):
+            self.loop.run_until_complete(client.transaction("abc"))
+
+        with self.assertRaises(blocktrail.exceptions.EndpointSpecificError):
+            self.loop.run_until_complete(client.webhook("abc"))
+
+        with self.assertRaises(blocktrail.exceptions.MissingEndpoint):
+            self.run_with_client(client, client.price())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import threading
+import blocktrail
+
+from tests.mock_server import MockServer
+
+
+class BatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_transactions(self):
+        for i in range(10):
+            self.server.route('GET', '/transaction/%064x' % i, {'hash': "%064x" % i})
+        self.server.route('GET', '/transaction/%064x' % 10, {'msg': "not found", 'code': 404}, status=404)
+
+        txhashes = ["%064x" % i for i in reversed(range(11))] + ["%064x" % 1, "%064x" % 2]
+        result = self.client.transactions(txhashes, max_workers=4)
+
+        assert list(result.keys()) == ["%064x" % i for i in reversed(range(11))]
+        assert isinstance(result["%064x" % 10], blocktrail.exceptions.ObjectNotFound)
+        for i in range(10):
+            assert result["%064x" % i]['hash'] == "%064x" % i
+
+        assert len(self.server.requests) == 11
+
+    def test_concurrency(self):
+        barrier = threading.Barrier(4, timeout=5)
+
+        def route(request):
+            # only served when 4 blocks are requested concurrently
+            barrier.wait()
+            return 200, {'height': int(request.path.split("/")[-1])}, {}
+
+        for height in range(8):
+            self.server.route('GET', '/block/%d' % height, route)
+
+        result = self.client.blocks(range(8), max_workers=4)
+        assert [block['height'] for block in result.values()] == list(range(8))
+
+        assert self.client.addresses([]) == {}
+
+
+if __name__ == "__main__":
+    unittest.main()
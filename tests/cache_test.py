@@ -0,0 +1,162 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import time
+import blocktrail
+import requests
+
+from blocktrail.cache import CachePolicy, LRUCache, SQLiteCache, TieredCache, FOREVER
+from tests.mock_server import MockServer
+
+
+class FakeResponse(object):
+    def __init__(self, content):
+        self.content = content
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.server.route('GET', '/block/200000', {'hash': "000000000000034a7dedef4a161fa058a2d67a173a90155f3a2fe6fc132e0ebf", 'confirmations': 1000})
+        self.server.route('GET', '/transaction/abc', {'hash': "abc", 'confirmations': 2})
+        self.server.route('GET', '/block/latest', {'hash': "abc", 'confirmations': 1})
+        self.server.route('GET', '/webhook/my-webhook', {'identifier': "my-webhook"})
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_lru_eviction(self):
+        cache = LRUCache(max_entries=2, max_bytes=1000)
+
+        cache.set("a", FakeResponse(b"1"), FOREVER)
+        cache.set("b", FakeResponse(b"2"), FOREVER)
+        assert cache.get("a").content == b"1"
+
+        # b is the least recently used
+        cache.set("c", FakeResponse(b"3"), FOREVER)
+        assert cache.get("b") is None
+        assert cache.get("a") and cache.get("c")
+
+        # a is evicted to stay within max_entries
+        cache.set("d", FakeResponse(b"4" * 900), FOREVER)
+        assert cache.stats() == {'entries': 2, 'bytes': 903, 'hits': 3, 'misses': 1, 'evictions': 2, 'expirations': 0}
+
+        # c and d are evicted to stay within max_bytes
+        cache.set("e", FakeResponse(b"5" * 500), FOREVER)
+        assert cache.get("c") is None and cache.get("d") is None
+        assert cache.stats()['evictions'] == 4
+
+        # too big to cache at all
+        cache.set("f", FakeResponse(b"6" * 1000), FOREVER)
+        assert cache.get("f") is None
+
+    def test_lru_expiry(self):
+        cache = LRUCache()
+
+        cache.set("a", FakeResponse(b"1"), 0.05)
+        assert cache.get("a")
+        time.sleep(0.1)
+        assert cache.get("a") is None
+        assert cache.stats()['expirations'] == 1
+
+    def test_client(self):
+        cache = LRUCache()
+        client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url,
+                                      cache=cache, cache_policy=CachePolicy(min_confirmations=6, short_ttl=60))
+
+        for i in range(3):
+            assert client.block(200000)['confirmations'] == 1000
+            assert client.transaction("abc")['hash'] == "abc"
+            assert client.block_latest()['hash'] == "abc"
+            assert client.webhook("my-webhook")['identifier'] == "my-webhook"
+
+        client.close()
+
+        paths = [request.path for request in self.server.requests]
+        assert paths.count('/block/200000') == 1
+        assert paths.count('/transaction/abc') == 1
+        assert paths.count('/block/latest') == 1
+        assert paths.count('/webhook/my-webhook') == 3
+
+        assert cache.stats()['hits'] == 6
+
+    def test_decoded_once(self):
+        decoded = []
+
+        class CountingCodec(object):
+            def dumps(self, data):
+                return json.dumps(data).encode("utf-8")
+
+            def loads(self, content):
+                decoded.append(content)
+                return json.loads(content.decode("utf-8"))
+
+        client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url,
+                                      cache=LRUCache(), json_codec=CountingCodec())
+
+        response_json = requests.Response.json
+        requests.Response.json = lambda response, **kwargs: decoded.append('response.json') or response_json(response, **kwargs)
+        try:
+            # the cache policy and the client share a single decode, a cache hit is decoded again so it's a fresh dict
+            block = client.block(200000)
+            assert len(decoded) == 1
+            block['confirmations'] = 0
+            assert client.block(200000)['confirmations'] == 1000
+            assert len(decoded) == 2
+            assert 'response.json' not in decoded
+        finally:
+            requests.Response.json = response_json
+            client.close()
+
+    def test_persistent(self):
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, "cache.sqlite")
+        try:
+            for i in range(2):
+                # a fresh client and cache, like after a restart
+                cache = TieredCache(LRUCache(), SQLiteCache(path))
+                client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url, cache=cache)
+
+                block = client.block(200000)
+                assert block['hash'] == "000000000000034a7dedef4a161fa058a2d67a173a90155f3a2fe6fc132e0ebf"
+                assert client.transaction("abc")['confirmations'] == 2
+
+                client.close()
+                cache.persistent.close()
+
+            paths = [request.path for request in self.server.requests]
+            assert paths.count('/block/200000') == 1
+            assert paths.count('/transaction/abc') == 2
+
+            assert cache.stats()['persistent']['entries'] == 1
+            assert cache.stats()['persistent']['hits'] == 1
+
+            # the file can be shared, so it shouldn't hold the api_key
+            with open(path, 'rb') as f:
+                assert b"MY_APIKEY" not in f.read()
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_policy(self):
+        policy = CachePolicy(min_confirmations=6, short_ttl=5, default_ttl=0)
+
+        def ttl(endpoint_url, data):
+            response = requests.Response()
+            response._content = json.dumps(data).encode("utf-8")
+            return policy.ttl(endpoint_url, response)
+
+        assert ttl("/block/200000", {'confirmations': 6}) == FOREVER
+        assert ttl("/transaction/abc", {'confirmations': 5}) == 5
+        assert ttl("/block/200000/transactions", {'data': [{'confirmations': 100}, {'confirmations': 100}]}) == FOREVER
+        assert ttl("/block/200000/transactions", {'data': []}) == 5
+        assert ttl("/price", {'USD': 1}) == 5
+        assert ttl("/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/unconfirmed-transactions", {}) == 5
+        assert ttl("/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", {}) == 0
+        assert ttl("/webhook/abc/events", {}) == 0
+        assert ttl("/webhooks", {}) == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
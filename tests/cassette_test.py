@@ -0,0 +1,71 @@
+import unittest
+import os
+import shutil
+import tempfile
+import blocktrail
+
+from blocktrail.cassette import Cassette
+from tests.mock_server import MockServer
+
+
+class CassetteTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "cassette.json.gz")
+
+        self.server = MockServer().start()
+        self.server.route('GET', '/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp', {'address': "1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp"})
+        self.server.route('GET', '/transaction/%064x' % 0, {'msg': "not found", 'code': 404}, status=404)
+        self.server.route('POST', '/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/verify',
+                          lambda request: (200, {'result': request.json()['signature'] == "good"}, {}))
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.dir)
+
+    def setup_api_client(self, cassette):
+        return blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url, cassette=cassette)
+
+    def exercise(self, client):
+        assert client.address("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp")['address'] == "1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp"
+        assert client.verify_address("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", "good")['result']
+        assert not client.verify_address("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", "bad")['result']
+
+        with self.assertRaises(blocktrail.exceptions.ObjectNotFound):
+            client.transaction("%064x" % 0)
+
+    def test_record_replay(self):
+        with self.setup_api_client(Cassette(self.path, mode=Cassette.RECORD)) as client:
+            self.exercise(client)
+
+        assert len(self.server.requests) == 4
+        self.server.stop()
+
+        # the server is gone, everything comes from the cassette
+        cassette = Cassette(self.path, mode=Cassette.REPLAY)
+        with self.setup_api_client(cassette) as client:
+            self.exercise(client)
+
+            with self.assertRaises(blocktrail.exceptions.CassetteMiss):
+                client.address("1LmhTfAPjxAyH8MrfRSGKmvBBVjZUaV4C3")
+
+        assert cassette.stats() == {'interactions': 4, 'hits': 4, 'misses': 1, 'recorded': 0}
+
+    def test_auto(self):
+        with self.setup_api_client(Cassette(self.path, mode=Cassette.AUTO)) as client:
+            client.address("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp")
+
+        cassette = Cassette(self.path, mode=Cassette.AUTO)
+        with self.setup_api_client(cassette) as client:
+            self.exercise(client)
+
+        # only what wasn't recorded yet hit the server
+        assert len(self.server.requests) == 4
+        assert cassette.stats()['recorded'] == 3
+        assert Cassette(self.path).stats()['interactions'] == 4
+
+    def test_request_key(self):
+        assert Cassette.request_key('get', "http://localhost/v1/BTC/price?api_key=MY_APIKEY&b=2&a=1") == \
+            Cassette.request_key('GET', "http://localhost/v1/BTC/price?a=1&b=2&api_key=OTHER_APIKEY")
+        assert Cassette.request_key('POST', "http://localhost/v1/BTC/webhook", b'{"a": 1}') != \
+            Cassette.request_key('POST', "http://localhost/v1/BTC/webhook", b'{"a": 2}')
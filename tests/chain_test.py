@@ -0,0 +1,175 @@
+import unittest
+
+import blocktrail
+from blocktrail.chain import BlockIndex, ChainEvent, ChainFollower
+from blocktrail.exceptions import ReorgTooDeep
+
+from tests.mock_server import MockServer, paginated
+
+
+def block_hash(height, branch=0):
+    return "%08x%056x" % (branch, height)
+
+
+class FakeChain(object):
+    """
+    routes serving a chain of blocks, by height, by hash and the latest
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.blocks = []
+
+    def extend(self, height, branch=0):
+        """
+        add blocks on :branch up to and including :height
+        """
+        for h in range(len(self.blocks), height + 1):
+            self.blocks.append({
+                'hash': block_hash(h, branch),
+                'height': h,
+                'prev_block': self.blocks[-1]['hash'] if self.blocks else None,
+            })
+
+        for block in self.blocks:
+            self.server.route('GET', '/block/%d' % block['height'], block)
+            self.server.route('GET', '/block/%s' % block['hash'], block)
+        self.server.route('GET', '/block/latest', self.blocks[-1])
+
+
+class ChainFollowerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url)
+        self.chain = FakeChain(self.server)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def events(self, events):
+        return [(event.type, event.height, event.hash) for event in events]
+
+    def test_index(self):
+        index = BlockIndex(max_blocks=3)
+        assert index.tip is None and index.get(0) is None
+
+        for height in range(10, 15):
+            index.append(height, block_hash(height))
+
+        assert len(index) == 3 and index.start == 12 and index.tip == 14
+        assert index.get(11) is None
+        assert index.get(13) == block_hash(13)
+
+        index.truncate(14)
+        assert index.tip == 13
+        self.assertRaises(ValueError, index.append, 15, block_hash(15))
+
+    def test_follow(self):
+        self.chain.extend(20)
+
+        follower = ChainFollower(self.client, start_height=15, window=2)
+        assert [event.height for event in follower.poll()] == [15, 16, 17, 18, 19, 20]
+        assert follower.checkpoint == (20, block_hash(20))
+
+        # nothing new costs a single request
+        del self.server.requests[:]
+        assert follower.poll() == []
+        assert [request.path for request in self.server.requests] == ['/block/latest']
+
+        self.chain.extend(23)
+        assert self.events(follower.poll()) == [(ChainEvent.BLOCK, height, block_hash(height)) for height in (21, 22, 23)]
+
+        # continue from a checkpoint
+        follower = ChainFollower(self.client, checkpoint=follower.checkpoint)
+        self.chain.extend(24)
+        assert self.events(follower.poll()) == [(ChainEvent.BLOCK, 24, block_hash(24))]
+
+    def test_reorg(self):
+        self.chain.extend(20)
+        follower = ChainFollower(self.client, start_height=10, max_reorg_depth=10)
+        follower.poll()
+
+        # blocks 18 to 20 are replaced by another branch, which is one block longer
+        del self.chain.blocks[18:]
+        self.chain.extend(21, branch=1)
+
+        assert self.events(follower.poll()) == [
+            (ChainEvent.ROLLBACK, 20, block_hash(20)),
+            (ChainEvent.ROLLBACK, 19, block_hash(19)),
+            (ChainEvent.ROLLBACK, 18, block_hash(18)),
+            (ChainEvent.BLOCK, 18, block_hash(18, 1)),
+            (ChainEvent.BLOCK, 19, block_hash(19, 1)),
+            (ChainEvent.BLOCK, 20, block_hash(20, 1)),
+            (ChainEvent.BLOCK, 21, block_hash(21, 1)),
+        ]
+        assert follower.checkpoint == (21, block_hash(21, 1))
+
+        # a reorg to a branch of the same height
+        del self.chain.blocks[21:]
+        self.chain.extend(21, branch=2)
+        assert self.events(follower.poll()) == [
+            (ChainEvent.ROLLBACK, 21, block_hash(21, 1)),
+            (ChainEvent.BLOCK, 21, block_hash(21, 2)),
+        ]
+
+        # deeper than the follower knows
+        del self.chain.blocks[5:]
+        self.chain.extend(22, branch=3)
+        self.assertRaises(ReorgTooDeep, follower.poll)
+
+    def test_reorg_while_catching_up(self):
+        self.chain.extend(20)
+        blocks = list(self.chain.blocks)
+
+        # the latest block is on another branch, while the blocks by height are still those of the old one
+        del self.chain.blocks[18:]
+        self.chain.extend(20, branch=1)
+        for block in blocks:
+            self.server.route('GET', '/block/%d' % block['height'], block)
+
+        follower = ChainFollower(self.client, start_height=15)
+        assert self.events(follower.poll()) == [(ChainEvent.BLOCK, height, block_hash(height)) for height in range(15, 20)] + [
+            (ChainEvent.ROLLBACK, 19, block_hash(19)),
+            (ChainEvent.ROLLBACK, 18, block_hash(18)),
+            (ChainEvent.BLOCK, 18, block_hash(18, 1)),
+            (ChainEvent.BLOCK, 19, block_hash(19, 1)),
+            (ChainEvent.BLOCK, 20, block_hash(20, 1)),
+        ]
+        assert follower.checkpoint == (20, block_hash(20, 1))
+
+    def test_failure_in_window(self):
+        self.chain.extend(100)
+        follower = ChainFollower(self.client, start_height=100)
+        follower.poll()
+
+        self.chain.extend(110)
+        self.server.route('GET', '/block/105', {'msg': "Internal Server Error", 'code': 500}, status=500)
+        self.assertRaises(blocktrail.exceptions.GenericServerError, follower.poll)
+        assert follower.checkpoint == (100, block_hash(100))
+
+        self.server.route('GET', '/block/105', self.chain.blocks[105])
+        assert [event.height for event in follower.poll()] == list(range(101, 111))
+
+        # the same when walking back during a reorg
+        del self.chain.blocks[108:]
+        self.chain.extend(112, branch=1)
+        self.server.route('GET', '/block/%s' % block_hash(109, 1), {'msg': "Internal Server Error", 'code': 500}, status=500)
+        self.assertRaises(blocktrail.exceptions.GenericServerError, follower.poll)
+        assert follower.checkpoint == (110, block_hash(110))
+
+        self.server.route('GET', '/block/%s' % block_hash(109, 1), self.chain.blocks[109])
+        assert self.events(follower.poll())[:4] == [
+            (ChainEvent.ROLLBACK, 110, block_hash(110)),
+            (ChainEvent.ROLLBACK, 109, block_hash(109)),
+            (ChainEvent.ROLLBACK, 108, block_hash(108)),
+            (ChainEvent.BLOCK, 108, block_hash(108, 1)),
+        ]
+        assert follower.checkpoint == (112, block_hash(112, 1))
+
+    def test_transactions(self):
+        self.chain.extend(3)
+        self.server.route('GET', '/block/%s/transactions' % block_hash(3), paginated([{'hash': "%064x" % i} for i in range(5)]))
+
+        event = ChainFollower(self.client).poll()[0]
+        assert [tx['hash'] for tx in event.transactions(limit=2)] == ["%064x" % i for i in range(5)]
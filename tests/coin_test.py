@@ -0,0 +1,41 @@
+import unittest
+import random
+from decimal import Decimal
+
+import blocktrail
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class CoinTestCase(unittest.TestCase):
+    def test_to_satoshi_many(self):
+        assert blocktrail.to_satoshi_many([0.00000001, 1.23456789, "1.23456789", Decimal("0.1"), 3, -0.5]) == \
+            [1, 123456789, 123456789, 10000000, 300000000, -50000000]
+        assert blocktrail.to_satoshi_many([20999999.99999999, "20999999.99999999"]) == [2099999999999999, 2099999999999999]
+
+    def test_to_btc_many(self):
+        assert blocktrail.to_btc_many([123456789, 0, -1, 2100000000000000]) == \
+            ["1.23456789", "0.00000000", "-0.00000001", "21000000.00000000"]
+
+        # exact where going through a float is not
+        assert blocktrail.to_btc_many([10 ** 17 + 1]) == ["1000000000.00000001"]
+
+    def test_same_as_scalar(self):
+        rnd = random.Random(0)
+        satoshis = [rnd.randint(0, 10 ** 12) for i in range(1000)]
+        btcs = [satoshi / 1e8 for satoshi in satoshis]
+
+        assert blocktrail.to_btc_many(satoshis) == [blocktrail.to_btc(satoshi) for satoshi in satoshis]
+        assert blocktrail.to_satoshi_many(btcs) == [blocktrail.to_satoshi(btc) for btc in btcs]
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        btcs = numpy.array([0.00000001, 1.23456789, 20999999.99999999, -0.5])
+        satoshis = blocktrail.to_satoshi_many(btcs)
+
+        assert satoshis.dtype == numpy.int64
+        assert satoshis.tolist() == [1, 123456789, 2099999999999999, -50000000]
+        assert blocktrail.to_btc_many(satoshis) == ["0.00000001", "1.23456789", "20999999.99999999", "-0.50000000"]
@@ -0,0 +1,55 @@
+import unittest
+import blocktrail
+
+from blocktrail import columnar, models
+from tests.mock_server import MockServer, paginated
+
+
+def transaction(i):
+    return {
+        'hash': "%064x" % i,
+        'time': "2014-05-14T19:34:%02d+0000" % (i % 60),
+        'confirmations': 1000 - i if i % 10 else 0,
+        'block_height': 300000 + i if i % 10 else None,
+        'estimated_value': i * 100000,
+        'total_fee': 10000,
+    }
+
+
+class ColumnarTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_parse_time(self):
+        assert columnar.parse_time("2014-05-14T19:34:12+0000") == 1400096052
+        assert columnar.parse_time("2014-05-14T21:34:12+02:00") == 1400096052
+
+    def test_to_arrays(self):
+        self.server.route('GET', '/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/transactions', paginated([transaction(i) for i in range(450)]))
+
+        arrays = columnar.to_arrays(self.client.iter_address_transactions("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp"), chunk_size=100)
+
+        assert len(arrays['value']) == 450
+        assert sum(arrays['value']) == sum(i * 100000 for i in range(450))
+        assert sum(arrays['fee']) == 450 * 10000
+        assert list(arrays['block_height'][:2]) == [-1, 300001]
+        assert arrays['time'][12] == 1400096052
+
+    def test_without_numpy(self):
+        numpy, columnar.numpy = columnar.numpy, None
+        try:
+            columns = columnar.Columns()
+            columns.extend([transaction(i) for i in range(10)])
+            columns.extend([models.Transaction.from_dict(transaction(i)) for i in range(10, 20)])
+
+            assert len(columns) == 20
+            arrays = columns.to_arrays()
+            assert arrays['value'].typecode == columnar.INT64
+            assert list(arrays['value']) == [i * 100000 for i in range(20)]
+        finally:
+            columnar.numpy = numpy
@@ -0,0 +1,176 @@
+import gzip
+import hashlib
+import io
+import json
+import unittest
+import threading
+import time
+import blocktrail
+import blocktrail.metrics
+
+from blocktrail.cache import LRUCache
+from tests.mock_server import MockServer, conditional
+
+
+class ConnectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.server.route('GET', '/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp', {'address': "1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp"})
+        self.server.route('GET', '/price', {'USD': 250.0})
+
+    def tearDown(self):
+        self.server.stop()
+
+    def setup_api_client(self, **kwargs):
+        return blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url, **kwargs)
+
+    def test_keep_alive(self):
+        with self.setup_api_client() as client:
+            for i in range(10):
+                assert client.address("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp")['address'] == "1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp"
+                assert client.price()['USD'] == 250.0
+
+        assert len(self.server.requests) == 20
+        assert self.server.connections == 1
+
+    def test_shared_between_threads(self):
+        client = self.setup_api_client(pool_maxsize=4)
+        results = []
+
+        def worker():
+            for i in range(5):
+                results.append(client.price())
+
+        threads = [threading.Thread(target=worker) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        client.close()
+
+        assert len(results) == 20
+        assert self.server.connections <= 4
+
+    def test_hmac(self):
+        self.server.route('POST', '/webhook', lambda request: (200, request.json(), {}))
+        self.server.route('DELETE', '/webhook/my-webhook', {'result': True})
+
+        with self.setup_api_client() as client:
+            assert client.setup_webhook("https://example.com/hook", "my-webhook")['identifier'] == "my-webhook"
+            assert client.delete_webhook("my-webhook")['result']
+
+        for request in self.server.requests:
+            assert request.signature_is_valid("MY_APIKEY", "MY_APISECRET")
+
+    def test_json_codecs(self):
+        self.server.route('POST', '/webhook', lambda request: (200, request.json(), {}))
+
+        for json_codec in ('json', 'auto'):
+            with self.setup_api_client(json_codec=json_codec) as client:
+                webhook = client.setup_webhook(u"https://example.com/hook?q=\u00e9", "my-webhook")
+                assert webhook['url'] == u"https://example.com/hook?q=\u00e9"
+                assert client.price() == {'USD': 250.0}
+
+        # the Content-MD5 is over the exact bytes that were sent, whatever the codec produced
+        for request in self.server.requests:
+            if request.body:
+                assert request.headers['Content-MD5'] == hashlib.md5(request.body).hexdigest()
+
+    def test_unknown_json_codec(self):
+        self.assertRaises(ValueError, self.setup_api_client, json_codec='simplejson')
+        self.assertRaises(ValueError, self.setup_api_client, json_codec=object())
+
+    def test_conditional_get(self):
+        price = {'USD': 250.0}
+        route = conditional(lambda request: price, lambda data: '"%s"' % data['USD'])
+        statuses = []
+
+        def record(request):
+            result = route(request)
+            statuses.append(result[0])
+            return result
+
+        self.server.route('GET', '/price', record)
+
+        # with and without the instrumented path
+        for hooks in (None, [blocktrail.metrics.Metrics()]):
+            price = {'USD': 250.0}
+            del self.server.requests[:]
+            del statuses[:]
+
+            with self.setup_api_client(validators=LRUCache(), hooks=hooks) as client:
+                assert client.price() == {'USD': 250.0}
+                assert client.price() == {'USD': 250.0}
+
+                price = {'USD': 260.0}
+                assert client.price() == {'USD': 260.0}
+                assert client.price() == {'USD': 260.0}
+
+            assert [request.headers.get('If-None-Match') for request in self.server.requests] == [None, '"250.0"', '"250.0"', '"260.0"']
+            assert statuses == [200, 304, 200, 304]
+
+    def test_compress(self):
+        self.server.route('POST', '/webhook/my-webhook/events/batch', {'result': True})
+        batch_data = [{'address': "1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", 'confirmations': 6}] * 100
+
+        with self.setup_api_client(compress_min_size=1024) as client:
+            assert client.batch_subscribe_address_transactions("my-webhook", batch_data[:1])['result']
+            assert client.batch_subscribe_address_transactions("my-webhook", batch_data)['result']
+
+        small, large = self.server.requests
+        assert 'Content-Encoding' not in small.headers
+        assert large.headers['Content-Encoding'] == 'gzip'
+
+        body = gzip.GzipFile(fileobj=io.BytesIO(large.body)).read()
+        assert len(large.body) < len(body) / 10
+        assert json.loads(body.decode("utf-8"))[0]['event_type'] == 'address-transactions'
+
+        # the Content-MD5 is over the bytes on the wire and the signature is still valid
+        for request in self.server.requests:
+            assert request.headers['Content-MD5'] == hashlib.md5(request.body).hexdigest()
+            assert request.signature_is_valid("MY_APIKEY", "MY_APISECRET")
+
+    def test_coalesce(self):
+        release = threading.Event()
+
+        def route(request):
+            release.wait(5)
+            if request.path == '/transaction/abc':
+                return 404, {'msg': "not found", 'code': 404}, {}
+            return 200, {'USD': 250.0}, {}
+
+        self.server.route('GET', '/price', route)
+        self.server.route('GET', '/transaction/abc', route)
+
+        client = self.setup_api_client(coalesce=True, pool_maxsize=20)
+        results = []
+
+        def worker(fn):
+            try:
+                results.append(fn())
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=worker, args=(client.price, )) for i in range(10)] + \
+                  [threading.Thread(target=worker, args=(lambda: client.transaction("abc"), )) for i in range(10)]
+        for thread in threads:
+            thread.start()
+
+        # release the responses once all threads are waiting
+        deadline = time.time() + 5
+        while client.client.single_flight.stats()['calls_shared'] < 18 and time.time() < deadline:
+            time.sleep(0.01)
+        release.set()
+
+        for thread in threads:
+            thread.join()
+        client.close()
+
+        assert len(self.server.requests) == 2
+        assert len([result for result in results if result == {'USD': 250.0}]) == 10
+        assert len([result for result in results if isinstance(result, blocktrail.exceptions.ObjectNotFound)]) == 10
+
+
+if __name__ == "__main__":
+    unittest.main()
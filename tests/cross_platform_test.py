@@ -1,9 +1,13 @@
 import unittest
+import datetime
 import hashlib
 import httpsig.sign as sign
 from httpsig.utils import parse_authorization_header
 from requests.models import RequestEncodingMixin
 
+from blocktrail.connection import RestClient
+from blocktrail.signing import HMACSignatureAuth
+
 
 class CrossPlatformTestCase(unittest.TestCase):
     def test_content_md5(self):
@@ -29,6 +33,40 @@ class CrossPlatformTestCase(unittest.TestCase):
         self.assertEqual(params['algorithm'], 'hmac-sha256')
         self.assertEqual(params['signature'], 'SFlytCGpsqb/9qYaKCQklGDvwgmrwfIERFnwt+yqPJw=')
 
+    def test_hmac_fast_path(self):
+        auth = HMACSignatureAuth(key_id='pda', secret='secret', headers=['(request-target)', 'Date'])
+        signed = auth.sign({'Date': 'today', 'accept': 'llamas'}, method='GET', path='/path?query=123')
+
+        auth = parse_authorization_header(signed['Authorization'])
+        params = auth[1]
+        self.assertEqual(params['keyId'], 'pda')
+        self.assertEqual(params['algorithm'], 'hmac-sha256')
+        self.assertEqual(params['signature'], 'SFlytCGpsqb/9qYaKCQklGDvwgmrwfIERFnwt+yqPJw=')
+
+    def test_fast_path_identical(self):
+        fast = RestClient("https://api.blocktrail.com/v1/BTC", "MY_APIKEY", "MY_APISECRET", fast_signing=True)
+        slow = RestClient("https://api.blocktrail.com/v1/BTC", "MY_APIKEY", "MY_APISECRET", fast_signing=False)
+
+        requests = [
+            ('GET', "/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", None, {'page': 2}),
+            ('POST', "/webhook", '{"url": "https://example.com/hook"}', None),
+            ('DELETE', "/webhook/my-webhook", 'null', None),
+        ]
+
+        for method, endpoint_url, data, params in requests:
+            fast_params, fast_headers = fast.prepare(method, endpoint_url, data=data, params=params)
+            slow_params, slow_headers = slow.prepare(method, endpoint_url, data=data, params=params)
+
+            # the Date can differ when the second ticks over in between
+            fast_headers['Date'] = slow_headers['Date'] = RestClient.httpdate(datetime.datetime(2015, 1, 1))
+
+            self.assertEqual(fast_params, slow_params)
+            self.assertEqual(fast_headers, slow_headers)
+
+            path = "/v1/BTC" + endpoint_url + "?query=123"
+            self.assertEqual(fast.sign(dict(fast_headers), method, path)['Authorization'],
+                             slow.sign(dict(slow_headers), method, path)['authorization'])
+
 
 if __name__ == "__main__":
     unittest.main()
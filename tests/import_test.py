@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+# modules that should only be imported on the first request, or when a feature that needs them is used
+HEAVY_MODULES = ['requests', 'urllib3', 'httpsig', 'Crypto', 'future', 'concurrent.futures', 'email.utils', 'numpy', 'aiohttp']
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_lazy_imports(self):
+        # in a fresh interpreter, since this one already imported everything
+        code = "import sys, blocktrail; blocktrail.APIClient('MY_APIKEY', 'MY_APISECRET'); " \
+               "print(','.join(module for module in %r if module in sys.modules))" % (HEAVY_MODULES, )
+
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=root)
+
+        assert output.decode("utf-8").strip() == ""
@@ -0,0 +1,92 @@
+import unittest
+import blocktrail
+
+from blocktrail.cache import LRUCache
+from blocktrail.metrics import EndpointTemplates, Metrics
+from blocktrail.retry import RetryPolicy
+from tests.mock_server import MockServer
+
+
+class RecordingHook(object):
+    def __init__(self):
+        self.before = []
+        self.after = []
+
+    def before_request(self, info):
+        self.before.append(info.endpoint)
+
+    def after_request(self, info):
+        self.after.append((info.endpoint, info.status, info.cached))
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.server.route('GET', '/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/transactions', {'data': [], 'total': 0})
+        self.server.route('GET', '/address/1LmhTfAPjxAyH8MrfRSGKmvBBVjZUaV4C3/transactions', {'data': [], 'total': 0})
+        self.server.route('GET', '/block/latest', {'height': 300000, 'confirmations': 1})
+        self.server.route('POST', '/webhook', lambda request: (200, request.json(), {}))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_endpoint_templates(self):
+        templates = EndpointTemplates()
+
+        assert templates.match("/block/latest") == "/block/latest"
+        assert templates.match("/block/300000") == "/block/{block}"
+        assert templates.match("/webhook/my-webhook/events/batch") == "/webhook/{identifier}/events/batch"
+        assert templates.match("/something/else") == "other"
+
+    def test_metrics(self):
+        metrics = Metrics()
+        hook = RecordingHook()
+
+        with blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url, hooks=[metrics, hook],
+                                  cache=LRUCache(), retry_policy=RetryPolicy(backoff=0.001)) as client:
+            client.address_transactions("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp")
+            client.address_transactions("1LmhTfAPjxAyH8MrfRSGKmvBBVjZUaV4C3")
+            client.block_latest()
+            client.block_latest()
+            client.setup_webhook("https://example.com/hook", "my-webhook")
+
+            with self.assertRaises(blocktrail.exceptions.MissingEndpoint):
+                client.price()
+
+        snapshot = metrics.snapshot()
+        assert snapshot['requests_total'] == {
+            ("/address/{address}/transactions", 'GET', '200'): 2,
+            ("/block/latest", 'GET', '200'): 1,
+            ("/webhook", 'POST', '200'): 1,
+            ("/price", 'GET', '404'): 1,
+        }
+        assert snapshot['cache_hits_total'] == {("/block/latest", ): 1}
+        assert snapshot['decode_duration_seconds'][("/address/{address}/transactions", )]['count'] == 2
+        assert snapshot['bytes_sent_total'][("/webhook", )] > 0
+        assert snapshot['in_flight'] == 0
+
+        assert hook.before == ["/address/{address}/transactions"] * 2 + ["/block/latest"] * 2 + ["/webhook", "/price"]
+        assert hook.after[3] == ("/block/latest", None, True)
+
+        exported = metrics.to_prometheus()
+        assert 'blocktrail_requests_total{endpoint="/price",method="GET",status="404"} 1' in exported
+        assert 'blocktrail_request_duration_seconds_count{endpoint="/block/latest"} 1' in exported
+        assert 'blocktrail_request_duration_seconds_bucket{endpoint="/block/latest",le="+Inf"} 1' in exported
+
+    def test_retries(self):
+        attempts = []
+
+        def route(request):
+            attempts.append(request)
+            return (503, {}, {}) if len(attempts) < 3 else (200, {'USD': 250.0}, {})
+
+        self.server.route('GET', '/price', route)
+        metrics = Metrics()
+
+        with blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url, hooks=[metrics],
+                                  retry_policy=RetryPolicy(backoff=0.001)) as client:
+            assert client.price()['USD'] == 250.0
+
+        snapshot = metrics.snapshot()
+        assert snapshot['requests_total'] == {("/price", 'GET', '503'): 2, ("/price", 'GET', '200'): 1}
+        assert snapshot['retries_total'] == {("/price", ): 2}
@@ -0,0 +1,189 @@
+"""
+local stub of the BlockTrail API, used by the tests that should not depend on the live API
+"""
+import json
+import threading
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+from six.moves.urllib.parse import urlparse, parse_qsl
+
+from httpsig.sign import HeaderSigner
+from httpsig.utils import CaseInsensitiveDict, parse_authorization_header
+
+
+API_PREFIX = "/v1/BTC"
+
+
+class MockRequest(object):
+    def __init__(self, method, target, path, params, headers, body):
+        self.method = method
+        self.target = target
+        self.path = path
+        self.params = params
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+    def signature_is_valid(self, api_key, api_secret):
+        """
+        check the HTTP-Signature the same way the API does
+        """
+        headers = CaseInsensitiveDict(self.headers)
+        if 'authorization' not in headers:
+            return False
+
+        params = parse_authorization_header(headers['authorization'])[1]
+        if params['keyId'] != api_key:
+            return False
+
+        signer = HeaderSigner(key_id=api_key, secret=api_secret, algorithm=params['algorithm'], headers=params['headers'].split(" "))
+        expected = signer.sign(headers, method=self.method, path=self.target)['authorization']
+
+        return expected == headers['authorization']
+
+
+def paginated(records, on_page=None):
+    """
+    route serving :records the way the API paginates them
+
+    :param list     records:        all records
+    :param callable on_page:        called with the page number before a page is served
+    """
+    def route(request):
+        page = int(request.params.get('page', 1))
+        limit = int(request.params.get('limit', 20))
+
+        if on_page is not None:
+            on_page(page)
+
+        data = records[(page - 1) * limit:page * limit]
+        return 200, {'data': data, 'current_page': page, 'per_page': limit, 'total': len(records)}, {}
+
+    return route
+
+
+def conditional(data, etag):
+    """
+    route serving :data with an ETag, answering 304 Not Modified when the request has a matching If-None-Match
+
+    :param dict     data:           the JSON body, or a callable taking the MockRequest and returning it
+    :param callable etag:           function taking the data and returning its ETag
+    """
+    def route(request):
+        body = data(request) if callable(data) else data
+        tag = etag(body)
+
+        if dict((name.lower(), value) for name, value in request.headers.items()).get('if-none-match') == tag:
+            return 304, b"", {'ETag': tag}
+
+        return 200, body, {'ETag': tag}
+
+    return route
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle_request(self):
+        url = urlparse(self.path)
+        path = url.path
+        if path.startswith(API_PREFIX):
+            path = path[len(API_PREFIX):]
+
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b""
+
+        request = MockRequest(self.command, self.path, path, dict(parse_qsl(url.query)), dict(self.headers.items()), body)
+        if self.server.record:
+            with self.server.lock:
+                self.server.requests.append(request)
+
+        route = self.server.routes.get((self.command, path))
+        if route is None:
+            status, reason, data, headers = 404, "Endpoint Not Found", {'msg': "Endpoint Not Found", 'code': 404}, {}
+        elif callable(route):
+            status, data, headers = route(request)
+            reason = None
+        else:
+            status, data, headers = route
+            reason = None
+
+        content = data if isinstance(data, bytes) else json.dumps(data).encode("utf-8")
+
+        self.send_response(status, reason)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class MockServer(object):
+    """
+    a threaded HTTP server answering with canned responses per (method, path)
+    """
+
+    def __init__(self, record=True):
+        """
+        :param bool     record:     keep all requests in :requests, disable for long running benchmarks
+        """
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), MockRequestHandler)
+        self.httpd.record = record
+        self.httpd.lock = threading.Lock()
+        self.httpd.routes = {}
+        self.httpd.requests = []
+        self.httpd.connections = 0
+        self.thread = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d%s" % (self.httpd.server_address[1], API_PREFIX)
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def connections(self):
+        return self.httpd.connections
+
+    def route(self, method, path, data=None, status=200, headers=None):
+        """
+        :param str              method:     the HTTP method to answer
+        :param str              path:       the path, relative to the API prefix
+        :param dict|callable    data:       the JSON body, or a callable taking a MockRequest and returning (status, data, headers)
+        """
+        if callable(data):
+            self.httpd.routes[(method, path)] = data
+        else:
+            self.httpd.routes[(method, path)] = (status, data, headers or {})
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05})
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,88 @@
+import unittest
+import blocktrail
+
+from blocktrail import models
+from tests.mock_server import MockServer, paginated
+
+
+TRANSACTION = {
+    'hash': "c326105f7fbfa4e8fe971569ef8858f47ee7e4aa5e8e7c458be8002be3d86aad",
+    'time': "2014-05-14T19:34:12+0000",
+    'confirmations': 12,
+    'block_height': 300000,
+    'block_hash': "000000000000000082ccf8f1557c5d40b21edabb18d2d691cfbf87118bac7254",
+    'is_coinbase': False,
+    'estimated_value': 4000000,
+    'total_input_value': 5010000,
+    'total_output_value': 5000000,
+    'total_fee': 10000,
+    'estimated_change': 1000000,
+    'estimated_change_address': "1LmhTfAPjxAyH8MrfRSGKmvBBVjZUaV4C3",
+    'inputs': [{'index': 0, 'output_hash': "3b4d0f4cc2f3bbd21de8fc0f9a2a1e4b5a3f31f5eeb03e8fa1f5a6c2bf70cc12", 'output_index': 1,
+                'value': 5010000, 'address': "1LmhTfAPjxAyH8MrfRSGKmvBBVjZUaV4C3", 'type': "pubkeyhash", 'multisig': None,
+                'script_signature': "3045022100..."}],
+    'outputs': [{'index': 0, 'value': 4000000, 'address': "1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", 'type': "pubkeyhash",
+                 'multisig': None, 'script': "OP_DUP OP_HASH160 ...", 'script_hex': "76a914...88ac", 'spent_hash': None,
+                 'spent_index': 0},
+                {'index': 1, 'value': 1000000, 'address': "1LmhTfAPjxAyH8MrfRSGKmvBBVjZUaV4C3", 'type': "pubkeyhash",
+                 'multisig': None, 'script': "OP_DUP OP_HASH160 ...", 'script_hex': "76a914...88ac", 'spent_hash': None,
+                 'spent_index': 0}],
+}
+
+
+class ModelsTestCase(unittest.TestCase):
+    def test_transaction(self):
+        tx = models.Transaction.from_dict(TRANSACTION)
+
+        assert tx.hash == TRANSACTION['hash']
+        assert tx.total_fee == 10000
+
+        # nested records are only parsed when they're accessed
+        assert isinstance(tx._inputs[0], dict)
+        assert isinstance(tx.inputs[0], models.TxInput)
+        assert tx.inputs[0].value == 5010000
+        assert [txout.value for txout in tx.outputs] == [4000000, 1000000]
+
+        assert tx.raw == TRANSACTION
+        assert not hasattr(tx, '__dict__')
+
+    def test_raw(self):
+        data = {'address': "1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", 'balance': "12345", 'first_seen': "2012-04-24T07:47:49+0000"}
+        address = models.Address.from_dict(data)
+
+        assert address.balance == 12345
+        assert address.received is None
+
+        # unknown fields are kept and missing ones aren't added
+        assert address.raw == {'address': "1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", 'balance': 12345, 'first_seen': "2012-04-24T07:47:49+0000"}
+
+        with self.assertRaises(AttributeError):
+            address.first_seen = "now"
+
+
+class TypedClientTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url, typed=True)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_typed(self):
+        self.server.route('GET', '/transaction/%s' % TRANSACTION['hash'], TRANSACTION)
+        self.server.route('GET', '/block/300000/transactions', paginated([TRANSACTION] * 5))
+        self.server.route('GET', '/price', {'USD': 250.0})
+
+        tx = self.client.transaction(TRANSACTION['hash'])
+        assert isinstance(tx, models.Transaction)
+        assert tx.raw == TRANSACTION
+
+        page = self.client.block_transactions(300000, limit=2)
+        assert page['total'] == 5
+        assert all(isinstance(tx, models.Transaction) for tx in page['data'])
+
+        assert len(list(self.client.iter_block_transactions(300000, limit=2))) == 5
+
+        # endpoints without a model still return dicts
+        assert self.client.price() == {'USD': 250.0}
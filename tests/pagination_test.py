@@ -0,0 +1,84 @@
+import unittest
+import threading
+import blocktrail
+
+from blocktrail.pagination import fan_out_pages
+from tests.mock_server import MockServer, paginated
+
+
+class PaginationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_iter_records(self):
+        txs = [{'hash': "%064x" % i} for i in range(45)]
+        self.server.route('GET', '/address/1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp/transactions', paginated(txs))
+
+        assert list(self.client.iter_address_transactions("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", limit=10)) == txs
+        assert [int(request.params['page']) for request in self.server.requests] == [1, 2, 3, 4, 5]
+
+        assert list(self.client.iter_address_transactions("1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp", limit=15, prefetch=False)) == txs
+        assert len(self.server.requests) == 5 + 3
+
+    def test_iter_exact_pages(self):
+        blocks = [{'height': i} for i in range(40)]
+        self.server.route('GET', '/all-blocks', paginated(blocks))
+
+        assert list(self.client.iter_all_blocks(limit=20)) == blocks
+        assert len(self.server.requests) == 2
+
+        self.server.route('GET', '/webhooks', paginated([]))
+        assert list(self.client.iter_all_webhooks()) == []
+
+    def test_prefetch(self):
+        txs = [{'hash': "%064x" % i} for i in range(30)]
+        fetched = {1: threading.Event(), 2: threading.Event(), 3: threading.Event()}
+        self.server.route('GET', '/block/200000/transactions', paginated(txs, on_page=lambda page: fetched[page].set()))
+
+        records = self.client.iter_block_transactions(200000, limit=10)
+
+        # while the first record of page 1 is being consumed page 2 is already being fetched, but page 3 isn't
+        assert next(records) == txs[0]
+        assert fetched[2].wait(5)
+        assert not fetched[3].is_set()
+
+        assert list(records) == txs[1:]
+
+    def test_fan_out(self):
+        txs = [{'hash': "%064x" % i} for i in range(95)]
+        barrier = threading.Barrier(3, timeout=5)
+
+        def on_page(page):
+            # pages 2, 3 and 4 are only served when they're requested concurrently
+            if 2 <= page <= 4:
+                barrier.wait()
+
+        self.server.route('GET', '/block/200000/transactions', paginated(txs, on_page=on_page))
+
+        assert list(self.client.iter_block_transactions(200000, limit=10, max_workers=3)) == txs
+        assert len(self.server.requests) == 10
+
+        barrier.reset()
+        records = list(self.client.iter_block_transactions(200000, limit=10, max_workers=3, ordered=False))
+        assert sorted(records, key=lambda tx: tx['hash']) == txs
+
+    def test_fan_out_without_total(self):
+        records = list(range(21))
+        requested = []
+
+        def fetch_page(page):
+            requested.append(page)
+            return {'data': records[(page - 1) * 10:page * 10]}
+
+        pages = list(fan_out_pages(fetch_page, 10, max_workers=4))
+        assert [record for page in pages for record in page['data']] == records
+        assert requested == [1, 2, 3]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import blocktrail
+from blocktrail.chain import ChainEvent
+from blocktrail.portfolio import Portfolio
+
+from tests.mock_server import MockServer
+
+
+class PortfolioTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url)
+
+        self.addresses = ["address%02d" % i for i in range(20)]
+        for i, address in enumerate(self.addresses):
+            self.route(address, balance=i * 100000000)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def route(self, address, balance, unconfirmed_received=0, unconfirmed_sent=0, unconfirmed_transactions=0):
+        self.server.route('GET', '/address/%s' % address, {
+            'address': address,
+            'balance': balance,
+            'unconfirmed_received': unconfirmed_received,
+            'unconfirmed_sent': unconfirmed_sent,
+            'unconfirmed_transactions': unconfirmed_transactions,
+        })
+
+    def fetched(self):
+        addresses = sorted(request.path.split("/")[-1] for request in self.server.requests)
+        del self.server.requests[:]
+        return addresses
+
+    def test_refresh(self):
+        portfolio = Portfolio(self.client, self.addresses, max_workers=4)
+        portfolio.add(["unused"])
+        self.server.route('GET', '/address/unused', {'msg': "not found", 'code': 404}, status=404)
+
+        result = portfolio.refresh()
+        assert result['fetched'] == 21 and not result['failed']
+        assert portfolio.totals() == {'addresses': 21, 'balance': 190 * 100000000, 'unconfirmed': 0, 'dirty': 0}
+        assert portfolio.get("unused").balance == 0
+        assert len(self.fetched()) == 21
+
+        # nothing changed, nothing is fetched
+        assert portfolio.refresh()['fetched'] == 0
+        assert self.fetched() == []
+
+        # a webhook event only refreshes the tracked addresses of its transaction
+        self.route("address01", balance=100000000, unconfirmed_received=5000, unconfirmed_transactions=1)
+        assert portfolio.on_webhook_event({'event_type': "address-transactions", 'addresses': {"address01": 5000, "elsewhere": -5000}}) == 1
+        result = portfolio.refresh()
+        assert result['changed'] == ["address01"]
+        assert self.fetched() == ["address01"]
+        assert portfolio.totals()['unconfirmed'] == 5000
+
+        # a block confirms it, and the block's transactions touch address02
+        self.route("address01", balance=100005000)
+        self.route("address02", balance=100000000)
+        transactions = [{'inputs': [{'address': "address02"}], 'outputs': [{'address': "elsewhere"}]}]
+        portfolio.on_block({'height': 1}, transactions=transactions)
+        result = portfolio.refresh()
+        assert sorted(result['changed']) == ["address01", "address02"]
+        assert self.fetched() == ["address01", "address02"]
+        assert portfolio.totals()['balance'] == 190 * 100000000 + 5000 - 100000000
+        assert portfolio.totals()['unconfirmed'] == 0
+
+        # a rollback can change anything
+        portfolio.on_block(ChainEvent(ChainEvent.ROLLBACK, 1, "00" * 32))
+        assert portfolio.refresh()['fetched'] == 21
+
+        portfolio.remove(["address19"])
+        assert portfolio.totals()['balance'] == 190 * 100000000 + 5000 - 100000000 - 19 * 100000000
+
+    def test_failed(self):
+        self.server.route('GET', '/address/address03', {'msg': "oops", 'code': 500}, status=500)
+
+        portfolio = Portfolio(self.client, self.addresses)
+        result = portfolio.refresh()
+        assert result['failed'] == ["address03"]
+        assert portfolio.totals()['dirty'] == 1
+
+        self.route("address03", balance=300000000)
+        assert portfolio.refresh()['fetched'] == 1
+        assert portfolio.totals()['balance'] == 190 * 100000000
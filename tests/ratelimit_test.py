@@ -0,0 +1,100 @@
+import unittest
+import threading
+import time
+import blocktrail
+
+from blocktrail.ratelimit import TokenBucket, AdaptiveRateLimiter
+from tests.mock_server import MockServer
+
+
+class RateLimitTestCase(unittest.TestCase):
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=50, burst=5)
+
+        delays = [bucket.reserve() for i in range(10)]
+
+        # the burst goes through at once, after that requests are spaced at the rate
+        assert delays[:5] == [0.0] * 5
+        for i in range(5, 10):
+            self.assertAlmostEqual(delays[i], (i - 4) / 50.0, delta=0.01)
+
+    def test_shared_between_threads(self):
+        bucket = TokenBucket(rate=100, burst=1)
+
+        def worker():
+            for i in range(5):
+                bucket.acquire()
+
+        start = time.time()
+        threads = [threading.Thread(target=worker) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 20 requests at 100/s with a burst of 1
+        assert time.time() - start >= 0.18
+
+    def test_adaptive(self):
+        limiter = AdaptiveRateLimiter(max_rate=100, min_rate=10, increase_step=10, increase_interval=0)
+
+        limiter.on_response(429, retry_after=0.5)
+        assert limiter.rate == 50
+        assert limiter.reserve() >= 0.5
+
+        # a burst of 429s for requests that were in flight together only backs off once
+        limiter.on_response(429)
+        assert limiter.rate == 50
+
+        limiter.on_response(200)
+        assert limiter.rate == 60
+
+        for i in range(10):
+            limiter.on_response(200)
+        assert limiter.rate == 100
+        assert limiter.stats()['rate_limited'] == 2
+
+    def test_burst_of_429s(self):
+        limiter = AdaptiveRateLimiter(max_rate=100, cooldown=0.5)
+
+        # 429s for requests that were in flight, 10 ms apart
+        for i in range(20):
+            limiter.on_response(429)
+            time.sleep(0.01)
+        assert limiter.rate == 50
+
+        # after the cooldown a 429 backs off again
+        time.sleep(0.5)
+        limiter.on_response(429)
+        assert limiter.rate == 25
+
+    def test_rate_limited_response(self):
+        server = MockServer().start()
+        server.route('GET', '/price', {'msg': "Too Many Requests", 'code': 429}, status=429, headers={'Retry-After': "2"})
+        server.route('GET', '/block/latest', {'msg': "Too Many Requests", 'code': 429}, status=429,
+                     headers={'Retry-After': "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+        limiter = AdaptiveRateLimiter(max_rate=100)
+        client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=server.url, rate_limiter=limiter)
+
+        try:
+            # a date in the past means no waiting
+            with self.assertRaises(blocktrail.exceptions.RateLimited) as cm:
+                client.block_latest()
+            assert cm.exception.retry_after == 0.0
+            assert limiter.rate == 50
+
+            with self.assertRaises(blocktrail.exceptions.RateLimited) as cm:
+                client.price()
+            assert cm.exception.retry_after == 2.0
+            assert cm.exception.code == 429
+            assert isinstance(cm.exception, blocktrail.exceptions.GenericHTTPError)
+
+            assert limiter.reserve() > 1.5
+        finally:
+            client.close()
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
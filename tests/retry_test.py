@@ -0,0 +1,144 @@
+import unittest
+import socket
+import threading
+import blocktrail
+import requests
+
+from blocktrail.retry import RetryPolicy
+from tests.mock_server import MockServer
+
+
+def flaky(failures, status=500, data=None):
+    """
+    route that fails :failures times before it succeeds
+    """
+    calls = []
+
+    def route(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return status, {'msg': "Internal Server Error", 'code': status}, {}
+        return 200, data or {'result': True}, {}
+
+    return route
+
+
+class RetryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def setup_api_client(self, retry_policy, api_endpoint=None):
+        return blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=api_endpoint or self.server.url, retry_policy=retry_policy)
+
+    def test_retry_get(self):
+        self.server.route('GET', '/price', flaky(2, data={'USD': 250.0}))
+        policy = RetryPolicy(backoff=0.01)
+
+        with self.setup_api_client(policy) as client:
+            assert client.price() == {'USD': 250.0}
+
+        assert len(self.server.requests) == 3
+        assert policy.stats() == {'attempts': 3, 'retries': 2, 'gave_up': 0, 'retries_by_reason': {'GenericServerError': 2}}
+
+    def test_give_up(self):
+        self.server.route('GET', '/price', flaky(10, status=503))
+        policy = RetryPolicy(max_attempts=3, backoff=0.01)
+
+        with self.setup_api_client(policy) as client:
+            with self.assertRaises(blocktrail.exceptions.GenericHTTPError):
+                client.price()
+
+        assert len(self.server.requests) == 3
+        assert policy.stats()['gave_up'] == 1
+
+        # not retried when it would exceed the time budget
+        policy = RetryPolicy(backoff=1, jitter=False, timeout=0.5)
+        with self.setup_api_client(policy) as client:
+            with self.assertRaises(blocktrail.exceptions.GenericHTTPError):
+                client.price()
+
+        assert len(self.server.requests) == 4
+
+    def test_idempotency(self):
+        self.server.route('POST', '/webhook', flaky(1))
+        self.server.route('POST', '/address/16dwJmR4mX5RguGrocMfN9Q9FR2kZcLw2z/verify', flaky(1))
+        self.server.route('GET', '/transaction/abc', {'msg': "not found", 'code': 404}, status=404)
+        policy = RetryPolicy(backoff=0.01)
+
+        with self.setup_api_client(policy) as client:
+            # creating a webhook is not idempotent
+            with self.assertRaises(blocktrail.exceptions.GenericServerError):
+                client.setup_webhook("https://example.com/hook", "my-webhook")
+            assert len(self.server.requests) == 1
+
+            # verifying an address is, and every attempt is signed again
+            assert client.verify_address("16dwJmR4mX5RguGrocMfN9Q9FR2kZcLw2z", "signature")
+            assert len(self.server.requests) == 3
+            assert all(request.signature_is_valid("MY_APIKEY", "MY_APISECRET") for request in self.server.requests)
+
+            # a 404 is not transient
+            with self.assertRaises(blocktrail.exceptions.ObjectNotFound):
+                client.transaction("abc")
+            assert len(self.server.requests) == 4
+
+    def test_connection_error(self):
+        # grab a port that nothing listens on
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        policy = RetryPolicy(max_attempts=3, backoff=0.01)
+        with self.setup_api_client(policy, api_endpoint="http://127.0.0.1:%d/v1/BTC" % port) as client:
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                client.price()
+
+        assert policy.stats()['attempts'] == 3
+        assert policy.stats()['retries_by_reason'] == {'ConnectionError': 2}
+
+    def test_truncated_body(self):
+        # a server that resets the connection halfway through the chunked body, the first 2 times
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        sock.listen(5)
+        port = sock.getsockname()[1]
+
+        def serve():
+            for i in range(3):
+                conn = sock.accept()[0]
+                conn.recv(65536)
+                body = b'{"USD": 250.0}'
+                conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n")
+                if i < 2:
+                    conn.sendall(b"%x\r\n%s" % (len(body), body[:5]))
+                else:
+                    conn.sendall(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+                conn.close()
+
+        thread = threading.Thread(target=serve)
+        thread.daemon = True
+        thread.start()
+
+        policy = RetryPolicy(max_attempts=3, backoff=0.01)
+        try:
+            with self.setup_api_client(policy, api_endpoint="http://127.0.0.1:%d/v1/BTC" % port) as client:
+                assert client.price() == {'USD': 250.0}
+        finally:
+            thread.join(5)
+            sock.close()
+
+        assert policy.stats()['retries_by_reason'] == {'ChunkedEncodingError': 2}
+
+    def test_rate_limited(self):
+        policy = RetryPolicy(backoff=0.01)
+        error = blocktrail.exceptions.RateLimited("slow down", code=429, retry_after=3)
+
+        assert policy.delay(1, error) == 3
+        assert policy.delay(1) <= 0.01
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import blocktrail
+from blocktrail.subscriptions import Journal, SubscriptionManager
+
+from tests.mock_server import MockServer, paginated
+
+
+class FakeWebhook(object):
+    """
+    routes of a webhook that keep its subscriptions
+    """
+
+    def __init__(self, server, identifier, addresses):
+        self.server = server
+        self.identifier = identifier
+        self.lock = threading.Lock()
+        self.events = [{'event_type': 'block', 'address': None, 'confirmations': None}]
+        self.batches = []
+
+        self.route_events()
+        server.route('POST', '/webhook/%s/events/batch' % identifier, self.batch_subscribe)
+        for address in addresses:
+            server.route('DELETE', '/webhook/%s/address-transactions/%s' % (identifier, address), self.unsubscribe)
+
+    def route_events(self):
+        self.server.route('GET', '/webhook/%s/events' % self.identifier, paginated(self.events))
+
+    def batch_subscribe(self, request):
+        records = request.json()
+        with self.lock:
+            self.batches.append(records)
+            for record in records:
+                self.events.append({'event_type': record['event_type'], 'address': record['address'],
+                                    'confirmations': record.get('confirmations', 6)})
+        return 200, True, {}
+
+    def unsubscribe(self, request):
+        address = request.path.split("/")[-1]
+        with self.lock:
+            self.events[:] = [event for event in self.events if event['address'] != address]
+        return 200, True, {}
+
+    def subscriptions(self):
+        return dict((event['address'], event['confirmations']) for event in self.events if event['event_type'] == 'address-transactions')
+
+
+class SubscriptionManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer().start()
+        self.client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=self.server.url)
+        self.tmp = tempfile.mkdtemp()
+        self.addresses = ["address%03d" % i for i in range(50)]
+        self.webhook = FakeWebhook(self.server, "my-webhook", self.addresses)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        shutil.rmtree(self.tmp)
+
+    def test_batch_subscribe_copies_records(self):
+        records = [{'address': self.addresses[0], 'confirmations': 1}]
+        self.client.batch_subscribe_address_transactions("my-webhook", records)
+
+        assert records == [{'address': self.addresses[0], 'confirmations': 1}]
+        assert self.webhook.batches[0][0]['event_type'] == 'address-transactions'
+
+    def test_sync(self):
+        journal = os.path.join(self.tmp, "journal")
+        manager = SubscriptionManager(self.client, "my-webhook", journal=journal, chunk_size=8, max_workers=4)
+
+        result = manager.sync(self.addresses[:40])
+        assert result['added'] == 40 and result['removed'] == 0 and not result['failed']
+        assert self.webhook.subscriptions() == dict.fromkeys(self.addresses[:40], 6)
+        assert max(len(records) for records in self.webhook.batches) == 8
+
+        # the journal knows what's subscribed, only the changes are sent
+        del self.server.requests[:]
+        desired = dict.fromkeys(self.addresses[5:45], 6)
+        desired[self.addresses[10]] = 1
+        result = manager.sync(desired)
+
+        assert result['added'] == 6 and result['removed'] == 6 and not result['failed']
+        assert self.webhook.subscriptions() == desired
+        assert not any(request.method == 'GET' for request in self.server.requests)
+        assert len(self.server.requests) == 5 + 1 + 1
+
+        # nothing changed, nothing is sent
+        del self.server.requests[:]
+        result = manager.sync(desired)
+        assert len(result['diff']) == 0
+        assert len(self.server.requests) == 0
+
+        # a new manager continues from the journal, a refresh lists the subscriptions again
+        manager = SubscriptionManager(self.client, "my-webhook", journal=journal)
+        assert manager.current() == desired
+        self.webhook.events.append({'event_type': 'address-transactions', 'address': self.addresses[49], 'confirmations': 6})
+        assert manager.sync(desired, dry_run=True)['diff'].remove == []
+        assert manager.sync(desired, refresh=True)['diff'].remove == [self.addresses[49]]
+        assert self.webhook.subscriptions() == desired
+
+    def test_torn_journal(self):
+        path = os.path.join(self.tmp, "journal")
+        Journal(path).append(add={'A': 6, 'B': 6})
+
+        # killed while writing the next entry
+        with open(path, 'a') as f:
+            f.write('{"add": {"X": ')
+
+        journal = Journal(path)
+        assert journal.load() == {'A': 6, 'B': 6}
+        journal.append(add={'C': 1})
+        journal.append(remove=['A'])
+        assert Journal(path).load() == {'B': 6, 'C': 1}
+
+    def test_failed_chunk(self):
+        manager = SubscriptionManager(self.client, "my-webhook", chunk_size=10)
+        self.server.route('POST', '/webhook/my-webhook/events/batch', {'msg': "oops", 'code': 500}, status=500)
+
+        result = manager.sync(self.addresses[:15])
+        assert result['added'] == 0
+        assert sorted(result['failed']) == self.addresses[:15]
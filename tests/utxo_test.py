@@ -0,0 +1,102 @@
+import unittest
+
+import blocktrail
+from blocktrail.utxo import UTXOIndex, Output, InsufficientFunds, UNCONFIRMED
+
+from tests.mock_server import MockServer, paginated
+
+
+def txhash(i):
+    return "%064x" % i
+
+
+class UTXOIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.index = UTXOIndex(tip=1000)
+        # values 1..10 BTC, output i has i confirmations and the last one is unconfirmed
+        for i in range(1, 11):
+            self.index.add(Output(txhash(i), 0, i * 100000000, "address", height=1000 - i + 1 if i < 10 else UNCONFIRMED))
+
+    def values(self, outputs):
+        return [output.value // 100000000 for output in outputs]
+
+    def test_select(self):
+        # a single output, the smallest that covers the amount
+        assert self.values(self.index.select(350000000)) == [4]
+        assert self.values(self.index.select(900000000)) == [9]
+
+        # the largest outputs, the last swapped for the smallest that still covers the rest
+        assert self.values(self.index.select(1800000000)) == [10, 8]
+        assert self.values(self.index.select(2500000000)) == [10, 9, 6]
+
+        # with 6+ confirmations only 6..9 are eligible
+        assert self.values(self.index.select(350000000, min_confirmations=6)) == [6]
+        assert self.values(self.index.select(1600000000, min_confirmations=6)) == [9, 7]
+        self.assertRaises(InsufficientFunds, self.index.select, 3100000000, min_confirmations=6)
+
+        # reserved outputs are skipped
+        assert self.values(self.index.select(350000000, exclude={(txhash(4), 0)})) == [5]
+
+    def test_confirmations(self):
+        assert self.index.balance() == 55 * 100000000
+        assert self.index.balance(min_confirmations=6) == (6 + 7 + 8 + 9) * 100000000
+        assert self.values(self.index.iter_outputs(min_confirmations=8, order='confirmations')) == [9, 8]
+
+        self.index.set_tip(1002)
+        assert self.index.balance(min_confirmations=6) == (4 + 5 + 6 + 7 + 8 + 9) * 100000000
+
+    def test_apply_transaction(self):
+        tx = {
+            'hash': txhash(100),
+            'inputs': [{'output_hash': txhash(10), 'output_index': 0}, {'output_hash': txhash(9), 'output_index': 0}],
+            'outputs': [
+                {'index': 0, 'value': 1500000000, 'address': "elsewhere", 'script_hex': None, 'spent_hash': None},
+                {'index': 1, 'value': 350000000, 'address': "address", 'script_hex': None, 'spent_hash': None},
+            ],
+        }
+
+        spent, added = self.index.apply_transaction(tx)
+        assert self.values(spent) == [10, 9]
+        assert [output.outpoint for output in added] == [(txhash(100), 1)]
+        assert len(self.index) == 9
+        assert (txhash(10), 0) not in self.index
+        assert self.index.balance() == (55 - 19) * 100000000 + 350000000
+        assert self.index.select(350000000)[0].outpoint == (txhash(100), 1)
+
+        # an address stays tracked after all its outputs are spent
+        for outpoint in list(self.index.outputs):
+            self.index.spend(outpoint)
+        assert self.index.apply_transaction(dict(tx, hash=txhash(101), inputs=[]))[1][0].outpoint == (txhash(101), 1)
+
+    def test_duplicate_outpoint(self):
+        self.index.add_many([Output(txhash(20), 0, 500, "address", height=900), Output(txhash(20), 0, 700, "address", height=900)])
+        assert self.index.get((txhash(20), 0)).value == 700
+        assert len(self.index.by_value) == len(self.index.by_height) == len(self.index) == 11
+
+        self.index.spend((txhash(20), 0))
+        assert self.index.balance() == 55 * 100000000
+        assert len(self.index.select(100)) == 1
+
+    def test_load(self):
+        server = MockServer().start()
+        client = blocktrail.APIClient("MY_APIKEY", "MY_APISECRET", api_endpoint=server.url)
+        try:
+            server.route('GET', '/block/latest', {'hash': txhash(0), 'height': 500})
+            for a in range(3):
+                records = [{'hash': txhash(a * 1000 + i), 'index': 1, 'value': 1000 * (i + 1), 'address': "address%d" % a,
+                            'script_hex': "76a9", 'confirmations': i} for i in range(250)]
+                server.route('GET', '/address/address%d/unspent-outputs' % a, paginated(records))
+
+            index = UTXOIndex()
+            assert list(index.load(client, ["address0", "address1", "address2"]).values()) == [250, 250, 250]
+            assert index.tip == 500
+            assert len(index) == 750
+            assert index.get((txhash(1010), 1)).height == 500 - 10 + 1
+
+            # reloading an address replaces its outputs
+            server.route('GET', '/address/address1/unspent-outputs', paginated([]))
+            assert index.load_address(client, "address1") == 0
+            assert len(index) == 500
+        finally:
+            client.close()
+            server.stop()
@@ -0,0 +1,175 @@
+import unittest
+import json
+
+try:
+    import asyncio
+    import aiohttp
+    from aiohttp import web
+    from blocktrail.webhook_receiver import WebhookReceiver
+except (ImportError, SyntaxError):
+    WebhookReceiver = None
+
+from blocktrail.connection import RestClient
+
+
+def payload(txhash, confirmations=0):
+    return {
+        'network': "BTC",
+        'event_type': "address-transactions",
+        'webhook_identifier': "my-webhook",
+        'addresses': {"1dice8EMZmqKvrGE4Qc9bUFf9PX3xaYDp": 50000},
+        'data': {'hash': txhash, 'confirmations': confirmations},
+        'retry_count': 0,
+    }
+
+
+@unittest.skipIf(WebhookReceiver is None, "requires python 3.5+ and aiohttp")
+class WebhookReceiverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.batches = []
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    async def handler(self, events):
+        self.batches.append(events)
+
+    def run_receiver(self, receiver, deliver):
+        async def run():
+            await receiver.start(host="127.0.0.1", port=0)
+            url = "http://127.0.0.1:%d/webhook" % receiver.port
+
+            try:
+                async with aiohttp.ClientSession() as session:
+                    return await deliver(session, url)
+            finally:
+                await receiver.stop()
+
+        return self.loop.run_until_complete(run())
+
+    def test_batches_and_dedup(self):
+        receiver = WebhookReceiver(self.handler, token="secret", batch_size=10, batch_delay=0.05)
+
+        async def deliver(session, url):
+            async def post(body, token="secret"):
+                async with session.post(url, params={'token': token}, data=json.dumps(body)) as response:
+                    return response.status
+
+            statuses = await asyncio.gather(*[post(payload("%064x" % i)) for i in range(25)])
+            # redelivered, the same transaction with another confirmation, a wrong token and garbage
+            statuses += [await post(payload("%064x" % 0)), await post(payload("%064x" % 0, confirmations=1)),
+                         await post(payload("%064x" % 1), token="wrong"), await post("[")]
+
+            return statuses
+
+        statuses = self.run_receiver(receiver, deliver)
+
+        assert statuses == [200] * 27 + [401, 400]
+
+        events = [event for batch in self.batches for event in batch]
+        assert len(events) == 26
+        assert len(set(event.key for event in events)) == 26
+        assert max(len(batch) for batch in self.batches) <= 10
+        assert len(self.batches) < 26
+
+        stats = receiver.stats()
+        assert stats['accepted'] == stats['handled'] == 26
+        assert stats['duplicates'] == 1
+        assert stats['rejected'] == 1
+        assert stats['invalid'] == 1
+
+    def test_backpressure(self):
+        release = asyncio.Event()
+
+        async def slow_handler(events):
+            await release.wait()
+            self.batches.append(events)
+
+        receiver = WebhookReceiver(slow_handler, batch_size=1, batch_delay=0, queue_size=2, enqueue_timeout=0.01)
+
+        async def deliver(session, url):
+            statuses = []
+            for i in range(5):
+                async with session.post(url, data=json.dumps(payload("%064x" % i))) as response:
+                    statuses.append(response.status)
+
+            release.set()
+
+            # refused events are accepted when they're delivered again
+            async with session.post(url, data=json.dumps(payload("%064x" % 4))) as response:
+                statuses.append(response.status)
+
+            return statuses
+
+        statuses = self.run_receiver(receiver, deliver)
+
+        # one event is being handled, two are queued
+        assert statuses == [200, 200, 200, 503, 503, 200]
+        assert receiver.stats()['backpressure'] == 2
+        assert len(self.batches) == 4
+
+    def test_mounted_app(self):
+        receiver = WebhookReceiver(self.handler)
+
+        async def run():
+            parent = web.Application()
+            parent.add_subapp("/hooks", receiver.app())
+
+            runner = web.AppRunner(parent)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            url = "http://127.0.0.1:%d/hooks/webhook" % runner.addresses[0][1]
+
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(url, data=json.dumps(payload("%064x" % 0))) as response:
+                        return response.status
+            finally:
+                await runner.cleanup()
+
+        assert self.loop.run_until_complete(run()) == 200
+        assert len(self.batches) == 1
+        assert receiver.tasks == []
+
+    def test_handler_error(self):
+        failed = []
+
+        async def failing_handler(events):
+            raise ValueError("oops")
+
+        receiver = WebhookReceiver(failing_handler, on_error=lambda events, e: failed.append((events, e)))
+
+        async def deliver(session, url):
+            async with session.post(url, data=json.dumps(payload("%064x" % 0))) as response:
+                return response.status
+
+        with self.assertLogs('blocktrail.webhook_receiver', level='ERROR'):
+            assert self.run_receiver(receiver, deliver) == 200
+
+        assert receiver.stats()['failed'] == 1
+        assert len(failed) == 1
+        assert failed[0][0][0].data['hash'] == "%064x" % 0
+        assert isinstance(failed[0][1], ValueError)
+
+    def test_signature(self):
+        receiver = WebhookReceiver(self.handler, api_key="MY_APIKEY", api_secret="MY_APISECRET")
+        client = RestClient("http://127.0.0.1", "MY_APIKEY", "MY_APISECRET")
+
+        async def deliver(session, url):
+            body = json.dumps(payload("%064x" % 0)).encode("utf-8")
+
+            params, headers = client.prepare('POST', "/webhook", data=body, params={})
+            headers = client.sign(headers, 'POST', "/webhook")
+
+            async with session.post(url, data=body, headers=headers) as response:
+                signed = response.status
+            async with session.post(url, data=body.replace(b"BTC", b"LTC"), headers=headers) as response:
+                tampered = response.status
+
+            return signed, tampered
+
+        assert self.run_receiver(receiver, deliver) == (200, 401)